@@ -8,12 +8,30 @@ const NotificationPanel = () => {
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
-        fetchNotifications();
-        // Poll for new notifications every 30 seconds
-        const interval = setInterval(fetchNotifications, 30000);
-        return () => clearInterval(interval);
+        let source = null;
+        let closed = false;
+        // New notifications are pushed over SSE, starting after the newest one
+        // already fetched (the browser reconnects and resumes from the last
+        // event id automatically)
+        fetchNotifications().then((latestCursor) => {
+            if (closed) return;
+            const query = latestCursor != null ? `?after=${latestCursor}` : '';
+            source = new EventSource(`${API_BASE}/api/notifications/stream${query}`);
+            source.addEventListener('notification', (event) => {
+                const n = JSON.parse(event.data);
+                setNotifications(prev => [
+                    { ...n, timestamp: new Date(n.timestamp), agent: 'jarvis' },
+                    ...prev.filter(p => p.id !== n.id)
+                ]);
+            });
+        });
+        return () => {
+            closed = true;
+            if (source) source.close();
+        };
     }, []);
 
+    // Returns the highest cursor fetched (0 for an empty log), or null if the fetch failed
     const fetchNotifications = async () => {
         try {
             const response = await fetch(`${API_BASE}/api/notifications`);
@@ -24,6 +42,7 @@ const NotificationPanel = () => {
                     timestamp: new Date(n.timestamp),
                     agent: 'jarvis'
                 })));
+                return data.reduce((max, n) => Math.max(max, n.cursor ?? 0), 0);
             }
         } catch (error) {
             console.error('Failed to fetch notifications:', error);
@@ -89,9 +108,11 @@ const NotificationPanel = () => {
     };
 
     const markAsRead = (id) => {
-        setNotifications(notifications.map(n =>
+        setNotifications(prev => prev.map(n =>
             n.id === id ? { ...n, read: true } : n
         ));
+        fetch(`${API_BASE}/api/notifications/${id}/read`, { method: 'POST' })
+            .catch(error => console.error('Failed to mark notification as read:', error));
     };
 
     const unreadCount = notifications.filter(n => !n.read).length;
@@ -84,32 +84,10 @@ const MeetingsPage = () => {
         setAtlasLoading(true);
         setAtlasInsight('');
 
-        const prompt = `I have an upcoming meeting with my client. Please help me prepare by providing key insights, talking points, and any important considerations.
-
-Meeting Details:
-- Client: ${selectedMeeting.client_name}
-- Email: ${selectedMeeting.client_email}
-- Subject: ${selectedMeeting.subject}
-- Date: ${selectedMeeting.date}
-- Time: ${selectedMeeting.start_time} – ${selectedMeeting.end_time}
-
-Meeting Notes & Agenda:
-${selectedMeeting.content}
-
-Based on the above, please provide:
-1. Key preparation points for this meeting
-2. Important questions to ask the client
-3. Any risks or sensitive topics to be mindful of
-4. Recommended next steps to propose`;
-
         try {
-            const res = await fetch(`${API_BASE}/api/chat`, {
+            // Server combines the client's cached context pack with the meeting details
+            const res = await fetch(`${API_BASE}/api/meetings/${selectedMeeting.id}/insights`, {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    message: prompt,
-                    agent: 'atlas',
-                }),
             });
             if (res.ok) {
                 const data = await res.json();
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Import-time regression check for Jarvis entry points.
+
+Imports each module in a fresh interpreter with `python -X importtime`,
+reports the cumulative import time and the slowest dependencies, and fails
+if a module goes over its budget or pulls in a module that should only be
+loaded on first use (LLM clients, Chroma, pydub, the APScheduler job store).
+
+Usage:
+    python scripts/bench_import_time.py [--runs 3] [--top 10] [--module jarvis.api]
+
+Budgets are medians in milliseconds and can be overridden per run, e.g.
+`--budget jarvis.api=4000`. Exits non-zero on a regression.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# module -> import-time budget (ms, median of --runs)
+BUDGETS_MS = {
+    "jarvis.api": 5000,
+    "jarvis.tools.calendar_server": 1500,
+}
+
+# Modules that must not be imported just by importing the entry point
+DEFERRED = {
+    "jarvis.api": [
+        "chromadb",
+        "langchain_chroma",
+        "langchain_ibm",
+        "pydub",
+        "openai",
+        "tavily",
+        "sqlalchemy",
+    ],
+    "jarvis.tools.calendar_server": [
+        "langchain",
+        "langchain_core",
+        "jarvis.deepagent",
+    ],
+}
+
+
+def _import_profile(module: str) -> dict:
+    """Import `module` in a fresh interpreter; {module: (self_us, cumulative_us)}."""
+    # A throwaway data dir keeps the run from touching real stores
+    env = {**os.environ, "JARVIS_DATA_DIR": os.environ.get("JARVIS_DATA_DIR") or tempfile.mkdtemp()}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        tail = "\n".join(result.stderr.splitlines()[-5:])
+        raise RuntimeError(f"import {module} failed:\n{tail}")
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if self_us.isdigit():
+            profile[name] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def bench(module: str, runs: int, top: int, budget_ms: float) -> bool:
+    profiles = [_import_profile(module) for _ in range(runs)]
+    totals = [p[module][1] / 1000 for p in profiles]
+    median = statistics.median(totals)
+
+    print(f"\n{module}: median {median:.0f} ms over {runs} run(s) (budget {budget_ms:.0f} ms)")
+    slowest = sorted(profiles[-1].items(), key=lambda item: item[1][1], reverse=True)
+    top_level = [(name, cum) for name, (_, cum) in slowest if "." not in name and name != module]
+    for name, cumulative_us in top_level[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    ok = median <= budget_ms
+    if not ok:
+        print(f"  FAIL: {median:.0f} ms is over the {budget_ms:.0f} ms budget")
+    loaded = [name for name in DEFERRED.get(module, []) if name in profiles[-1]]
+    if loaded:
+        ok = False
+        print(f"  FAIL: imported at startup but should load on first use: {', '.join(loaded)}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level dependencies to list")
+    parser.add_argument("--module", action="append", help="module to check (default: all budgeted modules)")
+    parser.add_argument("--budget", action="append", default=[], metavar="MODULE=MS")
+    args = parser.parse_args()
+
+    budgets = dict(BUDGETS_MS)
+    for item in args.budget:
+        name, _, ms = item.partition("=")
+        budgets[name] = float(ms)
+
+    ok = True
+    for module in args.module or list(BUDGETS_MS):
+        try:
+            ok &= bench(module, args.runs, args.top, budgets.get(module, float("inf")))
+        except RuntimeError as e:
+            print(f"\n{e}")
+            ok = False
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
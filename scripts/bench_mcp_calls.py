@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Measure per-tool-call overhead of the bundled MCP servers.
+
+Compares the ways Jarvis can reach a bundled MCP server:
+1. Session per call  - tools from MultiServerMCPClient.get_tools(); every call
+                       spawns and initializes a fresh server subprocess
+2. Persistent session - tools from jarvis.utils.mcp_sessions; one long-lived
+                       stdio session per server, reused by every call
+3. In-process        - MCP_TRANSPORT=inprocess; the FastMCP tools are called
+                       directly, with no transport or serialization
+
+Usage:
+    python scripts/bench_mcp_calls.py [--calls 20] [--server calendar]
+
+The default calendar `list_clients` call reads local files only, so the
+numbers are dominated by transport and process overhead.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from langchain_mcp_adapters.client import MultiServerMCPClient
+
+from jarvis.utils.mcp_sessions import get_mcp_manager
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "src" / "jarvis" / "tools"
+SERVERS = {
+    # server -> (script, tool, arguments)
+    "calendar": ("calendar_server.py", "list_clients", {}),
+    "market_feed": ("market_feed_server.py", "get_macro_indicators", {"indicator_type": "isa_allowance"}),
+}
+
+
+def _module(script: str) -> str:
+    return f"jarvis.tools.{Path(script).stem}"
+
+
+def _connection(script: str) -> dict:
+    return {
+        "transport": "stdio",
+        "command": sys.executable,
+        "args": [str(TOOLS_DIR / script)],
+        "env": dict(os.environ),
+    }
+
+
+async def _time_calls(tool, arguments: dict, calls: int) -> list:
+    timings = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        await tool.ainvoke(arguments)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list):
+    print(f"  {label:<20} median {statistics.median(timings):8.1f} ms   "
+          f"min {min(timings):8.1f} ms   max {max(timings):8.1f} ms")
+
+
+async def main(server: str, calls: int):
+    script, tool_name, arguments = SERVERS[server]
+    connection = _connection(script)
+    print(f"{server}.{tool_name} x {calls}")
+
+    per_call_tools = await MultiServerMCPClient({server: connection}).get_tools()
+    tool = next(t for t in per_call_tools if t.name == tool_name)
+    _report("session per call", await _time_calls(tool, arguments, calls))
+
+    manager = get_mcp_manager()
+    started = time.perf_counter()
+    tools = await manager.get_tools(server, connection)
+    print(f"  persistent session start: {(time.perf_counter() - started) * 1000:.1f} ms")
+    tool = next(t for t in tools if t.name == tool_name)
+    _report("persistent session", await _time_calls(tool, arguments, calls))
+
+    tools = await manager.get_tools(f"{server}_inprocess", {"transport": "inprocess", "module": _module(script)})
+    tool = next(t for t in tools if t.name == tool_name)
+    _report("in-process", await _time_calls(tool, arguments, calls))
+    await manager.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--server", choices=sorted(SERVERS), default="calendar")
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.server, args.calls))
@@ -4,30 +4,45 @@ Provides endpoints for chat, file upload, and notifications.
 """
 
 import os
+import json
+import time
 import shutil
+import tempfile
 import uuid
+import zipfile
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List
-from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Literal
+from contextlib import asynccontextmanager, contextmanager
 
 # Load environment variables BEFORE importing Jarvis modules
 from dotenv import load_dotenv, find_dotenv
 load_dotenv(find_dotenv(), override=True)
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, WebSocket, WebSocketDisconnect, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import asyncio
 
 # Import Jarvis modules AFTER loading .env
-from jarvis.deepagent import create_jarvis_agent, init_calendar_tools, init_market_feed_tools
+from jarvis.deepagent import create_jarvis_agent, warm_up_mcp_tools, get_mcp_warmup_status, close_mcp_tools
 from jarvis.config import WORKSPACE_DIR  # Use config.py for correct workspace path
-from jarvis.sub_agents.atlas import atlas_agent
-from jarvis.sub_agents.emma import emma_agent
-from jarvis.sub_agents.colin import colin_agent
-from jarvis.tools.scheduler import get_all_scheduled_jobs, add_cron_job, task_descriptions
+from jarvis.config import EMAIL_SEND_CONCURRENCY, EMAIL_BATCH_MAX_ITEMS, DRAFT_CLAIM_TIMEOUT_SECONDS, DRAFT_CLAIM_SWEEP_SECONDS, UPLOAD_MAX_FILE_BYTES, UPLOAD_MAX_REQUEST_BYTES, UPLOAD_CHUNK_BYTES, UPLOAD_STAGING_DIR
+from jarvis.sub_agents.atlas import get_atlas_agent
+from jarvis.sub_agents.emma import get_emma_agent
+from jarvis.sub_agents.colin import get_colin_agent
+from jarvis.tools.scheduler import get_all_scheduled_jobs, start_scheduler, shutdown_scheduler
+from jarvis.tools.events import VoiceAgentEvent
+from jarvis.tools.meetings import get_demo_meetings
+from jarvis.utils.notification_store import get_notification_store
+from jarvis.utils.aio import run_blocking, monitor_loop_lag, get_loop_lag_stats
+from jarvis.utils.client_registry import get_client_registry
+from jarvis.utils.crm_store import get_crm_store
+from jarvis.utils.context_packs import get_context_pack, maintain_context_packs, resolve_client_folder
+from jarvis.utils.draft_store import get_draft_store
+from jarvis.utils.event_bus import EMAIL_DRAFT, FILES_ADDED, NOTIFICATION, get_event_bus
+from jarvis.utils.mcp_sessions import get_mcp_manager
 
 
 # ============================================================================
@@ -53,12 +68,25 @@ class Notification(BaseModel):
     message: str
     timestamp: str
     read: bool = False
+    client: Optional[str] = None
+    cursor: Optional[int] = None  # position in the notification log (for paging / SSE resume)
 
 
 class ClientInfo(BaseModel):
     name: str
     folder: str
     file_count: int
+    transcript_count: int = 0
+    email_count: int = 0
+    last_activity: Optional[str] = None
+    # CRM summary (None when the client has no crm.json)
+    client_id: Optional[str] = None
+    email: Optional[str] = None
+    risk_profile: Optional[str] = None
+    service_status: Optional[str] = None
+    last_review_date: Optional[str] = None
+    next_review_date: Optional[str] = None
+    net_worth_gbp: Optional[float] = None
 
 
 class EmailSuggestion(BaseModel):
@@ -67,7 +95,8 @@ class EmailSuggestion(BaseModel):
     to: str
     subject: str
     body: str
-    status: str = "pending"  # pending | approved | rejected
+    status: str = "pending"  # pending | sending | approved | rejected
+    version: int = 1
     created_at: str
 
 
@@ -75,23 +104,35 @@ class ApproveEmailRequest(BaseModel):
     edited_body: Optional[str] = None
 
 
-# ============================================================================
-# Notification Storage (in-memory for simplicity)
-# ============================================================================
+class BatchEmailItem(BaseModel):
+    id: str
+    edited_body: Optional[str] = None
 
-_notifications: List[dict] = []
-MAX_NOTIFICATIONS = 50
 
+class BatchEmailRequest(BaseModel):
+    items: List[BatchEmailItem] = Field(max_length=EMAIL_BATCH_MAX_ITEMS)
+    action: Literal["approve", "reject"] = "approve"
+    mode: Literal["best_effort", "all_or_nothing"] = "best_effort"
 
-# ============================================================================
-# Email Suggestion Storage (in-memory)
-# ============================================================================
 
-_email_suggestions: dict = {}
+class BatchEmailResult(BaseModel):
+    id: str
+    success: bool
+    status: Optional[str] = None   # draft status after the batch
+    filename: Optional[str] = None
+    error: Optional[str] = None
 
 
+# ============================================================================
+# Email Suggestion Storage (SQLite, see jarvis.utils.draft_store)
+# ============================================================================
+
 def seed_email_suggestions():
     """Seed demo email suggestions that Jarvis has drafted and Emma has verified."""
+    store = get_draft_store()
+    # The draft store is durable; only seed an empty store
+    if store.count() > 0:
+        return
     suggestions = [
         {
             "id": str(uuid.uuid4()),
@@ -163,25 +204,26 @@ def seed_email_suggestions():
         },
     ]
     for s in suggestions:
-        _email_suggestions[s["id"]] = s
+        store.add(s)
     print("[API] Email suggestions seeded successfully")
 
 
-def add_notification(notification_type: str, title: str, message: str):
-    """Add a notification to the store."""
-    notification = {
-        "id": str(uuid.uuid4()),
-        "type": notification_type,
-        "title": title,
-        "message": message,
-        "timestamp": datetime.now().isoformat(),
-        "read": False
-    }
-    _notifications.insert(0, notification)
-    # Keep only the most recent notifications
-    if len(_notifications) > MAX_NOTIFICATIONS:
-        _notifications.pop()
-    return notification
+def add_notification(notification_type: str, title: str, message: str, client: Optional[str] = None):
+    """Add a notification to the store (pushed to dashboard subscribers)."""
+    return get_notification_store().add(notification_type, title, message, client=client)
+
+
+def add_email_suggestion(suggestion: dict):
+    """Add a drafted email to the approval queue."""
+    get_draft_store().add(suggestion)
+
+
+async def _on_notification_event(event: dict):
+    await run_blocking(add_notification, **event)
+
+
+async def _on_email_draft_event(event: dict):
+    await run_blocking(add_email_suggestion, event)
 
 
 def seed_demo_data():
@@ -194,8 +236,10 @@ def seed_demo_data():
         ("action", "🔔 Policy Renewal Reminder", "Brian Potter's life insurance policy renews in 14 days. Atlas found a potentially better rate with Scottish Widows. Recommend scheduling a call."),
     ]
     
-    for notif_type, title, message in demo_notifications:
-        add_notification(notif_type, title, message)
+    # The notification log is durable; only seed an empty store
+    if get_notification_store().count() == 0:
+        for notif_type, title, message in demo_notifications:
+            add_notification(notif_type, title, message)
     
     # Seed demo scheduled tasks
     from jarvis.tools.scheduler import seed_demo_jobs
@@ -204,11 +248,6 @@ def seed_demo_data():
     print("[API] Demo data seeded successfully")
 
 
-# Seed demo data on module load
-seed_demo_data()
-seed_email_suggestions()
-
-
 # ============================================================================
 # Agent Management
 # ============================================================================
@@ -225,11 +264,11 @@ def get_or_create_agent(agent_type: str, thread_id: str):
         if agent_type == "jarvis":
             _agents[key] = create_jarvis_agent()
         elif agent_type == "atlas":
-            _agents[key] = atlas_agent
+            _agents[key] = get_atlas_agent()
         elif agent_type == "emma":
-            _agents[key] = emma_agent
+            _agents[key] = get_emma_agent()
         elif agent_type == "colin":
-            _agents[key] = colin_agent
+            _agents[key] = get_colin_agent()
         else:
             raise ValueError(f"Unknown agent type: {agent_type}")
 
@@ -240,39 +279,91 @@ def get_or_create_agent(agent_type: str, thread_id: str):
 # FastAPI App
 # ============================================================================
 
+# Startup phase timings, logged once and exposed on /health
+_startup = {"phases": {}, "total_ms": None}
+
+
+@contextmanager
+def _startup_phase(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _startup["phases"][name] = int((time.perf_counter() - started) * 1000)
+
+
+def _on_mcp_server_ready(name: str):
+    """A degraded MCP server recovered: rebuild Jarvis agents so they get its tools.
+
+    Conversation history lives in the shared checkpointer, so dropping the
+    cached agent loses nothing.
+    """
+    for key in [k for k in _agents if k.startswith("jarvis:")]:
+        del _agents[key]
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
-    import threading
-    from jarvis.jarvis_heartbeat import run_scheduler, heartbeat_job
-    from jarvis.config import HEARTBEAT_INTERVAL_MINUTES
+    from jarvis.jarvis_heartbeat import run_heartbeat_loop
 
     print("🚀 Jarvis API starting...")
     print(f"📁 Workspace: {WORKSPACE_DIR}")
-
-    # Pre-warm calendar MCP tools so the cache is ready before any request
-    print("📅 Loading Calendar MCP tools...")
-    await init_calendar_tools()
-    print("📅 Calendar MCP tools ready")
-
-    # Pre-warm market feed MCP tools
-    print("📈 Loading Market Feed MCP tools...")
-    await init_market_feed_tools()
-    print("📈 Market Feed MCP tools ready")
-
-    # Start heartbeat scheduler in background thread
-    def start_heartbeat():
-        print(f"💓 Heartbeat scheduler started ({HEARTBEAT_INTERVAL_MINUTES} min interval)")
-        import time
-        time.sleep(300)  # Wait for API to be fully ready
-        heartbeat_job()
-        run_scheduler()
-
-    heartbeat_thread = threading.Thread(target=start_heartbeat, daemon=True)
-    heartbeat_thread.start()
+    started = time.perf_counter()
+
+    # Warm the calendar and market feed MCP servers concurrently. A server that
+    # is slow or down doesn't hold up startup: its tools are left out (degraded)
+    # and it is retried in the background.
+    with _startup_phase("mcp_warmup"):
+        mcp_status = await warm_up_mcp_tools(on_ready=_on_mcp_server_ready)
+    for name, status in mcp_status.items():
+        print(f"🔌 {name} MCP tools {status['status']} ({status['ms']} ms)")
+
+    # This process is the event bus hub: tools (here or in standalone
+    # processes) publish notifications and drafts, handled on this loop
+    with _startup_phase("event_bus"):
+        bus = get_event_bus()
+        bus.subscribe(NOTIFICATION, _on_notification_event)
+        bus.subscribe(EMAIL_DRAFT, _on_email_draft_event)
+        bus.subscribe(FILES_ADDED, _index_added_files)
+        bus_task = asyncio.create_task(bus.serve())
+
+    # Log any handler that blocks the event loop
+    lag_task = asyncio.create_task(monitor_loop_lag(describe=_describe_requests))
+
+    # Keep per-client context packs warm for Atlas / meeting insights
+    packs_task = asyncio.create_task(maintain_context_packs())
+
+    # Demo notifications, drafts and cron jobs (only into empty stores); done
+    # here rather than at import so importing the module has no side effects
+    with _startup_phase("seed_demo_data"):
+        await run_blocking(seed_demo_data)
+        await run_blocking(seed_email_suggestions)
+
+    # Reconcile drafts left in 'sending' by a process that died mid-send
+    drafts_task = asyncio.create_task(maintain_draft_claims())
+
+    # Cron jobs run on this event loop too (persistent SQLite job store)
+    with _startup_phase("scheduler"):
+        start_scheduler()
+
+    # Heartbeat runs as a task on this event loop (same loop as the MCP sessions)
+    heartbeat_task = asyncio.create_task(run_heartbeat_loop())
+
+    _startup["total_ms"] = int((time.perf_counter() - started) * 1000)
+    phases = ", ".join(f"{name} {ms} ms" for name, ms in _startup["phases"].items())
+    print(f"✅ Jarvis API ready in {_startup['total_ms']} ms ({phases})")
 
     yield
     print("👋 Jarvis API shutting down...")
+    shutdown_scheduler()
+    heartbeat_task.cancel()
+    bus_task.cancel()
+    lag_task.cancel()
+    packs_task.cancel()
+    drafts_task.cancel()
+    await asyncio.gather(heartbeat_task, bus_task, lag_task, packs_task, drafts_task, return_exceptions=True)
+    await close_mcp_tools()
 
 
 app = FastAPI(
@@ -302,6 +393,31 @@ app.add_middleware(
 )
 
 
+# Requests in flight, and requests started since the last loop-lag sample,
+# so a lag warning can name the handlers that may have blocked the loop
+_inflight_requests: Dict[str, int] = {}
+_recent_requests: set = set()
+
+
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    key = f"{request.method} {request.url.path}"
+    _inflight_requests[key] = _inflight_requests.get(key, 0) + 1
+    _recent_requests.add(key)
+    try:
+        return await call_next(request)
+    finally:
+        _inflight_requests[key] -= 1
+        if not _inflight_requests[key]:
+            del _inflight_requests[key]
+
+
+def _describe_requests() -> str:
+    seen = sorted(set(_inflight_requests) | _recent_requests)
+    _recent_requests.clear()
+    return ", ".join(seen) or "no HTTP requests"
+
+
 # ============================================================================
 # Endpoints
 # ============================================================================
@@ -311,63 +427,145 @@ async def root():
     return {"status": "online", "service": "Jarvis Financial Advisor API"}
 
 
-from jarvis.tools.voice_pipeline import stt_stream, agent_stream, tts_stream
+from jarvis.tools.voice_pipeline import (
+    stt_stream,
+    agent_stream,
+    tts_stream,
+    VoiceSessionMetrics,
+    enqueue_audio,
+    iter_audio_queue,
+    VOICE_OVERLOAD_MESSAGE,
+)
+from jarvis.config import VOICE_AUDIO_QUEUE_SIZE, VOICE_OUTBOUND_QUEUE_SIZE, VOICE_MAX_TRACKED_SESSIONS
+
+# Latency metrics for active and recently closed voice sessions (oldest evicted first)
+_voice_sessions: Dict[str, VoiceSessionMetrics] = {}
+
+
+def _track_voice_session(metrics: VoiceSessionMetrics):
+    _voice_sessions[metrics.session_id] = metrics
+    while len(_voice_sessions) > VOICE_MAX_TRACKED_SESSIONS:
+        _voice_sessions.pop(next(iter(_voice_sessions)))
+
+
+async def _send_voice_event(websocket: WebSocket, event):
+    """Serialize a pipeline event onto the WebSocket."""
+    if event.type == "stt_chunk" or event.type == "stt_output":
+        # Send transcript update
+        await websocket.send_json({"type": event.type, "text": event.transcript})
+    elif event.type == "agent_chunk":
+        # Send text response from agent
+        await websocket.send_json({"type": event.type, "text": event.text})
+    elif event.type == "tts_chunk":
+        # Send synthesized audio payload
+        await websocket.send_bytes(event.audio)
+    elif event.type == "error":
+        await websocket.send_json({"type": "error", "message": event.message})
+
 
 @app.websocket("/ws/voice")
 async def websocket_voice_endpoint(websocket: WebSocket):
     """
     WebSocket endpoint for real-time voice interaction using the Sandwich architecture.
     Client sends PCM audio (bytes). Server sends STT text, Agent text, and TTS PCM audio back.
+
+    The socket is served by three tasks joined by bounded queues:
+      reader   – drains client audio into `audio_queue`; if it fills up the
+                 session is closed as overloaded (code 1013) rather than
+                 dropping audio mid-utterance
+      pipeline – Audio -> STT -> Agent -> TTS, pushing events into `outbound_queue`
+                 (blocking put: a slow client applies backpressure to the pipeline)
+      writer   – sends queued events to the client
     """
     await websocket.accept()
     session_id = str(uuid.uuid4())
+    metrics = VoiceSessionMetrics(session_id)
+    _track_voice_session(metrics)
     print(f"[WebSocket] Voice connection established: {session_id}")
 
-    # 1. Producer: Read audio bytes from the client into an async generator
-    async def websocket_audio_stream():
+    audio_queue: asyncio.Queue = asyncio.Queue(maxsize=VOICE_AUDIO_QUEUE_SIZE)
+    outbound_queue: asyncio.Queue = asyncio.Queue(maxsize=VOICE_OUTBOUND_QUEUE_SIZE)
+
+    # 1. Reader: pull audio bytes off the socket as fast as the client sends them
+    async def reader():
         try:
             while True:
                 data = await websocket.receive_bytes()
-                yield data
+                metrics.audio_chunks_received += 1
+                if not enqueue_audio(audio_queue, data, metrics):
+                    print(f"[WebSocket] Audio queue full, closing overloaded session: {session_id}")
+                    pipeline_task.cancel()
+                    return
         except WebSocketDisconnect:
             print(f"[WebSocket] Client disconnected: {session_id}")
         except Exception as e:
             print(f"[WebSocket] Error reading audio: {e}")
+        # End of stream: the pipeline transcribes what is queued, then stops
+        await audio_queue.put(None)
 
+    # 2. Pipeline: Audio -> STT -> Agent -> TTS
+    async def pipeline():
+        try:
+            stt_gen = stt_stream(iter_audio_queue(audio_queue), metrics)
+            agent_gen = agent_stream(stt_gen, session_id, metrics)
+            tts_gen = tts_stream(agent_gen, metrics)
+            async for event in tts_gen:
+                await outbound_queue.put(event)
+        except Exception as e:
+            print(f"[WebSocket Pipeline Error] {e}")
+            await outbound_queue.put(VoiceAgentEvent.error("Voice pipeline encountered an error."))
+        finally:
+            if metrics.overloaded:
+                await outbound_queue.put(VoiceAgentEvent.error(VOICE_OVERLOAD_MESSAGE))
+            await outbound_queue.put(None)
+
+    # 3. Writer: send pipeline outputs to the client
+    async def writer():
+        while True:
+            event = await outbound_queue.get()
+            if event is None:
+                return
+            await _send_voice_event(websocket, event)
+            metrics.events_sent += 1
+
+    pipeline_task = asyncio.create_task(pipeline())
+    tasks = [asyncio.create_task(reader()), pipeline_task]
     try:
-        # Create the pipeline: Audio -> STT -> Agent -> TTS
-        stt_gen = stt_stream(websocket_audio_stream())
-        agent_gen = agent_stream(stt_gen, session_id)
-        tts_gen = tts_stream(agent_gen)
-        
-        # 2. Consumer: Loop through final pipeline outputs and send to client
-        async for event in tts_gen:
-            if event.type == "stt_chunk" or event.type == "stt_output":
-                # Send transcript update
-                await websocket.send_json({"type": event.type, "text": event.transcript})
-            elif event.type == "agent_chunk":
-                # Send text response from agent
-                await websocket.send_json({"type": event.type, "text": event.text})
-            elif event.type == "tts_chunk":
-                # Send synthesized audio payload
-                await websocket.send_bytes(event.audio)
-            elif event.type == "error":
-                await websocket.send_json({"type": "error", "message": event.message})
-                
+        await writer()
     except Exception as e:
-        print(f"[WebSocket Pipeline Error] {e}")
-        try:
-            await websocket.send_json({"type": "error", "message": "Voice pipeline encountered an error."})
-        except:
-            pass
+        print(f"[WebSocket] Error sending to client: {e}")
     finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        metrics.close()
         try:
-            await websocket.close()
+            # 1013 "Try Again Later" tells the client the close was load shedding
+            await websocket.close(code=1013 if metrics.overloaded else 1000)
         except:
             pass
         print(f"[WebSocket] Voice connection closed: {session_id}")
 
 
+@app.get("/api/voice/sessions")
+async def list_voice_sessions():
+    """
+    Latency histograms (STT, first agent token, first TTS byte) for recent voice sessions.
+    """
+    return [m.snapshot() for m in reversed(list(_voice_sessions.values()))]
+
+
+@app.get("/api/voice/sessions/{session_id}/metrics")
+async def get_voice_session_metrics(session_id: str):
+    """
+    Latency histograms and queue statistics for a single voice session.
+    """
+    metrics = _voice_sessions.get(session_id)
+    if metrics is None:
+        raise HTTPException(status_code=404, detail="Voice session not found")
+    return metrics.snapshot()
+
+
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
@@ -422,78 +620,235 @@ async def chat(request: ChatRequest):
 @app.get("/api/clients", response_model=List[ClientInfo])
 async def list_clients():
     """
-    List all available clients from the workspace/datasets folder.
+    List all clients (workspace datasets and email archive) with file counts,
+    last activity and CRM summary fields, served from the cached client registry.
     """
-    datasets_dir = WORKSPACE_DIR / "datasets"
-    clients = []
-    
-    if datasets_dir.exists():
-        for client_folder in sorted(datasets_dir.iterdir()):
-            if client_folder.is_dir() and not client_folder.name.startswith('.'):
-                # Count files in the folder
-                file_count = len([f for f in client_folder.iterdir() if f.is_file()])
-                
-                # Convert folder name to display name
-                display_name = client_folder.name.replace('_', ' ').title()
-                
-                clients.append(ClientInfo(
-                    name=display_name,
-                    folder=client_folder.name,
-                    file_count=file_count
-                ))
-    
-    return clients
+    clients = await run_blocking(get_client_registry().clients)
+    return [ClientInfo(**c) for c in clients]
+
+
+def _upload_target_dir(client: str, upload_type: str) -> Path:
+    # Convert client name to folder name; subfolder based on upload type
+    client_folder = client.lower().replace(' ', '_')
+    subfolder = "meeting_transcripts" if upload_type == "transcript" else "email_archive"
+    return WORKSPACE_DIR / "datasets" / client_folder / subfolder
+
+
+class _UploadBudget:
+    """Tracks bytes written against the per-request upload cap."""
+
+    def __init__(self, limit: int = UPLOAD_MAX_REQUEST_BYTES):
+        self.limit = limit
+        self.used = 0
+
+    def consume(self, n: int):
+        self.used += n
+        if self.used > self.limit:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Upload exceeds the {self.limit // (1024 * 1024)} MB per-request limit",
+            )
+
+
+def _check_content_length(request: Request):
+    # Reject obviously oversized requests before writing anything to client folders
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > UPLOAD_MAX_REQUEST_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Upload exceeds the {UPLOAD_MAX_REQUEST_BYTES // (1024 * 1024)} MB per-request limit",
+        )
+
+
+async def _stream_to_file(read_chunk, target_path: Path, budget: _UploadBudget) -> int:
+    """
+    Stream chunks into a temp file next to `target_path`, then atomically rename.
+
+    Args:
+        read_chunk: Async callable returning the next chunk (b"" at the end).
+        target_path: Final location of the file.
+        budget: Per-request byte budget, charged as chunks arrive.
+
+    Returns:
+        Number of bytes written.
+    """
+    await run_blocking(target_path.parent.mkdir, parents=True, exist_ok=True)
+    tmp = await run_blocking(_staging_file)
+    size = 0
+    try:
+        while chunk := await read_chunk():
+            size += len(chunk)
+            if size > UPLOAD_MAX_FILE_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"'{target_path.name}' exceeds the {UPLOAD_MAX_FILE_BYTES // (1024 * 1024)} MB per-file limit",
+                )
+            budget.consume(len(chunk))
+            await run_blocking(tmp.write, chunk)
+        await run_blocking(tmp.close)
+        await run_blocking(os.replace, tmp.name, target_path)
+    except BaseException:
+        await run_blocking(_discard_temp, tmp)
+        raise
+    return size
+
+
+def _staging_file():
+    """Open a temp file in the upload staging dir (outside datasets/, same filesystem)."""
+    UPLOAD_STAGING_DIR.mkdir(parents=True, exist_ok=True)
+    return tempfile.NamedTemporaryFile(dir=UPLOAD_STAGING_DIR, prefix="upload-", suffix=".part", delete=False)
+
+
+def _discard_temp(tmp):
+    tmp.close()
+    Path(tmp.name).unlink(missing_ok=True)
+
+
+def _extract_zip_members(zip_path: Path, target_dir: Path, budget: _UploadBudget, results: List[dict]):
+    """
+    Extract the .txt members of an uploaded zip (flattened) with the same caps (blocking).
+
+    Results are appended to `results` as members are written, so members
+    extracted before the request budget runs out are still reported.
+    """
+    target_dir.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(zip_path) as archive:
+        for member in archive.infolist():
+            name = Path(member.filename).name
+            if member.is_dir() or not name or name.startswith('.'):
+                continue
+            if not name.endswith('.txt'):
+                results.append({"file": member.filename, "success": False, "error": "Only .txt files are allowed"})
+                continue
+            if member.file_size > UPLOAD_MAX_FILE_BYTES:
+                results.append({"file": member.filename, "success": False, "error": "Exceeds the per-file limit"})
+                continue
+            budget.consume(member.file_size)
+            target_path = target_dir / name
+            with _staging_file() as tmp:
+                try:
+                    with archive.open(member) as src:
+                        shutil.copyfileobj(src, tmp, UPLOAD_CHUNK_BYTES)
+                except BaseException:
+                    tmp.close()
+                    Path(tmp.name).unlink(missing_ok=True)
+                    raise
+            os.replace(tmp.name, target_path)
+            results.append({"file": member.filename, "success": True, "path": target_path})
+
+
+def _announce_files(paths: List[Path]):
+    """Publish newly written client files so they are indexed in one batch."""
+    if paths:
+        get_event_bus().publish(FILES_ADDED, {"paths": [str(p) for p in paths]})
+
+
+async def _index_added_files(event: dict):
+    from jarvis.utils.vector_store import index_text_files
+    try:
+        await run_blocking(index_text_files, [Path(p) for p in event["paths"]])
+    except Exception as e:
+        print(f"[API] Failed to index uploaded files: {e}")
 
 
 @app.post("/api/upload")
 async def upload_file(
+    request: Request,
     file: UploadFile = File(...),
     client: str = Form(...),
     upload_type: str = Form(...)
 ):
     """
-    Upload a markdown file to a client's folder.
+    Upload a .txt file to a client's folder (streamed to disk, size-capped).
     """
+    _check_content_length(request)
+
     # Validate file type
     if not file.filename.endswith('.txt'):
         raise HTTPException(status_code=400, detail="Only .txt files are allowed")
     
-    # Convert client name to folder name
-    client_folder = client.lower().replace(' ', '_')
-    target_dir = WORKSPACE_DIR / "datasets" / client_folder
-    
-    # Create folder if it doesn't exist
-    target_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Determine subfolder based on upload type
-    if upload_type == "transcript":
-        subfolder = "meeting_transcripts"
-    else:
-        subfolder = "email_archive"
-    
-    # Create subfolder
-    (target_dir / subfolder).mkdir(exist_ok=True)
-    
-    # Save file
-    target_path = target_dir / subfolder / file.filename
+    target_path = _upload_target_dir(client, upload_type) / Path(file.filename).name
     
     try:
-        content = await file.read()
-        target_path.write_bytes(content)
-        
-        return {
-            "success": True,
-            "message": f"File uploaded to {client_folder}/{subfolder}/",
-            "path": str(target_path.relative_to(WORKSPACE_DIR))
-        }
+        await _stream_to_file(lambda: file.read(UPLOAD_CHUNK_BYTES), target_path, _UploadBudget())
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
+    _announce_files([target_path])
+    return {
+        "success": True,
+        "message": f"File uploaded to {target_path.parent.relative_to(WORKSPACE_DIR / 'datasets')}/",
+        "path": str(target_path.relative_to(WORKSPACE_DIR))
+    }
+
+
+@app.post("/api/upload/batch")
+async def upload_batch(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    client: str = Form(...),
+    upload_type: str = Form(...)
+):
+    """
+    Upload many .txt files, or .zip archives of them, to a client's folder.
+
+    Each file is streamed to disk and capped at UPLOAD_MAX_FILE_BYTES; the
+    request as a whole (uncompressed) is capped at UPLOAD_MAX_REQUEST_BYTES.
+    Files that fail are reported individually; the rest are kept and indexed
+    together in one batch.
+    """
+    _check_content_length(request)
+
+    target_dir = _upload_target_dir(client, upload_type)
+    budget = _UploadBudget()
+    results = []
+
+    for upload in files:
+        name = Path(upload.filename or "").name
+        try:
+            if name.endswith('.zip'):
+                zip_path = UPLOAD_STAGING_DIR / f"{uuid.uuid4().hex}.zip"
+                try:
+                    # The compressed bytes are not charged; extracted members are
+                    await _stream_to_file(
+                        lambda: upload.read(UPLOAD_CHUNK_BYTES), zip_path, _UploadBudget(float("inf"))
+                    )
+                    await run_blocking(_extract_zip_members, zip_path, target_dir, budget, results)
+                finally:
+                    await run_blocking(zip_path.unlink, missing_ok=True)
+            elif name.endswith('.txt'):
+                target_path = target_dir / name
+                await _stream_to_file(lambda: upload.read(UPLOAD_CHUNK_BYTES), target_path, budget)
+                results.append({"file": upload.filename, "success": True, "path": target_path})
+            else:
+                results.append({"file": upload.filename, "success": False, "error": "Only .txt or .zip files are allowed"})
+        except HTTPException as e:
+            results.append({"file": upload.filename, "success": False, "error": e.detail})
+            if budget.used > budget.limit:
+                break  # request budget exhausted; skip the remaining files
+        except (zipfile.BadZipFile, OSError) as e:
+            results.append({"file": upload.filename, "success": False, "error": f"Upload failed: {str(e)}"})
+
+    saved = [r["path"] for r in results if r["success"]]
+    _announce_files(saved)
+    for r in results:
+        if r["success"]:
+            r["path"] = str(r["path"].relative_to(WORKSPACE_DIR))
+
+    return {
+        "success": bool(saved),
+        "message": f"{len(saved)} of {len(results)} files uploaded to {target_dir.relative_to(WORKSPACE_DIR / 'datasets')}/",
+        "files": results,
+    }
+
 
 class CreateNotificationRequest(BaseModel):
     type: str = "action"  # info, warning, action, success
     title: str
     message: str
+    client: Optional[str] = None
 
 
 @app.post("/api/notifications", response_model=Notification)
@@ -501,51 +856,48 @@ async def create_notification(request: CreateNotificationRequest):
     """
     Create a new notification (used by heartbeat system).
     """
-    notification = add_notification(
+    notification = await run_blocking(
+        add_notification,
         notification_type=request.type,
         title=request.title,
-        message=request.message
+        message=request.message,
+        client=request.client,
     )
     return Notification(**notification)
 
 
 @app.get("/api/notifications", response_model=List[Notification])
-async def get_notifications():
+async def get_notifications(
+    limit: int = 10,
+    before: Optional[int] = None,
+    client: Optional[str] = None,
+    unread_only: bool = False,
+):
     """
-    Get recent notifications from Jarvis.
-    Combines stored heartbeat notifications with file activity notifications.
+    Get recent notifications from Jarvis, newest first.
+    Page with `before=<cursor of the last item>`; filter by `client` or `unread_only`.
+    Falls back to file activity notifications when the log is nearly empty.
     """
-    notifications = []
-    
-    # First, add any stored heartbeat notifications (these are the priority ones)
-    for n in _notifications:
-        notifications.append(Notification(**n))
+    rows = await run_blocking(
+        get_notification_store().list, limit=limit, before=before, client=client, unread_only=unread_only
+    )
+    notifications = [Notification(**n) for n in rows]
+    if before is not None or client or unread_only:
+        return notifications
     
     # Then check for recent file changes in workspace (if we need more)
     if len(notifications) < 5:
-        datasets_dir = WORKSPACE_DIR / "datasets"
-        
-        if datasets_dir.exists():
-            recent_files = []
-            for client_folder in datasets_dir.iterdir():
-                if client_folder.is_dir():
-                    for file_path in client_folder.rglob("*.md"):
-                        mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
-                        recent_files.append((file_path, mtime, client_folder.name))
-            
-            recent_files.sort(key=lambda x: x[1], reverse=True)
+        for file_path, mtime, client_slug in await run_blocking(_recent_dataset_files, 3):
+            client_display = client_slug.replace('_', ' ').title()
             
-            for file_path, mtime, client in recent_files[:3]:
-                client_display = client.replace('_', ' ').title()
-                
-                notifications.append(Notification(
-                    id=str(uuid.uuid4()),
-                    type="info",
-                    title=f"Document Activity: {client_display}",
-                    message=f"File '{file_path.name}' was recently updated.",
-                    timestamp=mtime.isoformat(),
-                    read=False
-                ))
+            notifications.append(Notification(
+                id=str(uuid.uuid4()),
+                type="info",
+                title=f"Document Activity: {client_display}",
+                message=f"File '{file_path.name}' was recently updated.",
+                timestamp=mtime.isoformat(),
+                read=False
+            ))
     
     # Add a standing "online" notification if no other notifications
     if len(notifications) == 0:
@@ -558,7 +910,84 @@ async def get_notifications():
             read=True
         ))
     
-    return notifications[:10]  # Limit to 10 notifications
+    return notifications[:limit]
+
+
+def _recent_dataset_files(limit: int) -> list:
+    """Most recently modified markdown files across client datasets (blocking walk)."""
+    datasets_dir = WORKSPACE_DIR / "datasets"
+    if not datasets_dir.exists():
+        return []
+    recent_files = []
+    for client_folder in datasets_dir.iterdir():
+        if client_folder.is_dir():
+            for file_path in client_folder.rglob("*.md"):
+                mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
+                recent_files.append((file_path, mtime, client_folder.name))
+    recent_files.sort(key=lambda x: x[1], reverse=True)
+    return recent_files[:limit]
+
+
+@app.post("/api/notifications/{notification_id}/read")
+async def mark_notification_read(notification_id: str):
+    """
+    Mark a notification as read.
+    """
+    if not await run_blocking(get_notification_store().mark_read, notification_id):
+        raise HTTPException(status_code=404, detail="Notification not found")
+    return {"success": True}
+
+
+SSE_CATCHUP_PAGE_SIZE = 100
+
+
+def _sse_event(notification: dict) -> str:
+    return f"id: {notification['cursor']}\nevent: notification\ndata: {json.dumps(notification)}\n\n"
+
+
+@app.get("/api/notifications/stream")
+async def stream_notifications(request: Request, after: Optional[int] = None):
+    """
+    Server-Sent Events stream of new notifications.
+    Reconnecting clients resume from `Last-Event-ID` (or `after=<cursor>`).
+    """
+    store = get_notification_store()
+    last_event_id = request.headers.get("last-event-id")
+    resume_after = int(last_event_id) if last_event_id and last_event_id.isdigit() else after
+
+    async def event_stream():
+        queue = store.subscribe()
+        try:
+            # Replay the whole backlog oldest first, a page at a time
+            last_sent = resume_after
+            while last_sent is not None:
+                page = await run_blocking(store.list_after, last_sent, SSE_CATCHUP_PAGE_SIZE)
+                for notification in page:
+                    yield _sse_event(notification)
+                    last_sent = notification["cursor"]
+                if len(page) < SSE_CATCHUP_PAGE_SIZE:
+                    break
+            while not await request.is_disconnected():
+                try:
+                    notification = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if notification is None:
+                    # Fell too far behind; end the stream so the browser reconnects and replays
+                    break
+                # Already replayed if it arrived while the backlog was being sent
+                if last_sent is not None and notification["cursor"] <= last_sent:
+                    continue
+                yield _sse_event(notification)
+        finally:
+            store.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ============================================================================
@@ -567,17 +996,40 @@ async def get_notifications():
 
 @app.get("/health")
 async def health_check():
+    warmup = get_mcp_warmup_status()
+    degraded = any(status["status"] != "ready" for status in warmup.values())
     return {
-        "status": "healthy",
+        "status": "degraded" if degraded else "healthy",
         "workspace": str(WORKSPACE_DIR),
-        "workspace_exists": WORKSPACE_DIR.exists()
+        "workspace_exists": WORKSPACE_DIR.exists(),
+        "startup": _startup,
+        "event_loop": get_loop_lag_stats(),
+        "mcp": get_mcp_manager().stats(),
+        "mcp_warmup": warmup,
     }
 
 
+@app.get("/api/heartbeat/stats")
+async def heartbeat_stats():
+    """
+    Skipped (pre-check) vs executed heartbeats, tokens used and estimated tokens saved.
+    """
+    from jarvis.jarvis_heartbeat import get_heartbeat_stats
+    return get_heartbeat_stats()
+
+
 # ============================================================================
 # Scheduled Tasks
 # ============================================================================
 
+class TaskRun(BaseModel):
+    started_at: str
+    finished_at: str
+    duration_ms: int
+    status: str  # ok | notified | no_reply | error
+    error: Optional[str] = None
+
+
 class ScheduledTask(BaseModel):
     id: str
     name: str
@@ -585,17 +1037,47 @@ class ScheduledTask(BaseModel):
     cron: str
     next_run: Optional[str] = None
     trigger: str
+    recent_runs: List[TaskRun] = []
 
 
 @app.get("/api/scheduled-tasks", response_model=List[ScheduledTask])
 async def get_scheduled_tasks():
     """
-    Get all scheduled cron jobs for display in the dashboard.
+    Get all scheduled cron jobs for display in the dashboard, with their recent run history.
     """
-    jobs = get_all_scheduled_jobs()
+    jobs = await run_blocking(get_all_scheduled_jobs)
     return [ScheduledTask(**job) for job in jobs]
 
 
+# ============================================================================
+# CRM Queries
+# ============================================================================
+
+class CRMQueryRequest(BaseModel):
+    sql: str
+    max_rows: int = 100
+
+
+@app.get("/api/crm/schema")
+async def crm_schema():
+    """
+    Tables and columns of the queryable CRM database (built from all crm.json files).
+    """
+    return await run_blocking(get_crm_store().schema)
+
+
+@app.post("/api/crm/query")
+async def crm_query(request: CRMQueryRequest):
+    """
+    Run a read-only SQL SELECT over the CRM database.
+    Returns columns, rows, row_count and whether the result was truncated.
+    """
+    try:
+        return await run_blocking(get_crm_store().query, request.sql, max_rows=request.max_rows)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # ============================================================================
 # Email Suggestions
 # ============================================================================
@@ -605,14 +1087,67 @@ async def get_email_suggestions():
     """
     Return all pending email suggestions drafted by Jarvis and verified by Emma.
     """
-    pending = [
-        EmailSuggestion(**s)
-        for s in _email_suggestions.values()
-        if s["status"] == "pending"
-    ]
-    # Sort by created_at descending
-    pending.sort(key=lambda x: x.created_at, reverse=True)
-    return pending
+    return [EmailSuggestion(**s) for s in await run_blocking(get_draft_store().list, "pending")]
+
+
+def _draft_message_id(draft_id: str) -> str:
+    """Message-ID written into a draft's archived email, so a send can be confirmed later."""
+    return f"<{draft_id}@jarvis>"
+
+
+def _reconcile_stale_drafts():
+    """
+    Resolve drafts claimed for sending longer than DRAFT_CLAIM_TIMEOUT_SECONDS ago (blocking).
+
+    Such a claim means the sender died mid-send. If the email reached the
+    archive the draft is marked approved; otherwise nothing was sent and it
+    goes back to pending. Releasing without checking could let the advisor
+    approve (and send) the same email twice.
+    """
+    from jarvis.tools.calendar_server import find_sent_email
+
+    store = get_draft_store()
+    for draft in store.stale_claims(DRAFT_CLAIM_TIMEOUT_SECONDS):
+        filename = find_sent_email(draft["client_name"], _draft_message_id(draft["id"]))
+        status = "approved" if filename else "pending"
+        if store.transition(draft["id"], "sending", status, expected_version=draft["version"]):
+            print(f"[Drafts] Stale send claim on {draft['id']} resolved to {status}"
+                  + (f" (archived as {filename})" if filename else ""))
+
+
+async def maintain_draft_claims(interval: int = DRAFT_CLAIM_SWEEP_SECONDS):
+    """Background task: periodically reconcile stale 'sending' claims."""
+    while True:
+        try:
+            await run_blocking(_reconcile_stale_drafts)
+        except Exception as e:
+            print(f"[Drafts] Reconciling stale claims failed: {e}")
+        await asyncio.sleep(interval)
+
+
+def _claim_error(suggestion_id: str) -> HTTPException:
+    """Explain why a compare-and-set on a draft did not apply (blocking)."""
+    current = get_draft_store().get(suggestion_id)
+    if current is None:
+        return HTTPException(status_code=404, detail="Suggestion not found")
+    return HTTPException(status_code=409, detail=f"Suggestion is already {current['status']}")
+
+
+def _send_draft(suggestion: dict, body: str) -> dict:
+    """Send a claimed draft via the Calendar MCP send_email (blocking file write)."""
+    # Directly call the calendar_server send_email function
+    # (imported module, not subprocess — MCP tools are loaded at startup)
+    from jarvis.tools.calendar_server import send_email as calendar_send_email
+    result = calendar_send_email(
+        client_name=suggestion["client_name"],
+        to=suggestion["to"],
+        subject=suggestion["subject"],
+        body=body,
+        message_id=_draft_message_id(suggestion["id"]),
+    )
+    if not result.get("success"):
+        raise RuntimeError("Calendar MCP send_email failed")
+    return result
 
 
 @app.post("/api/email-suggestions/{suggestion_id}/approve")
@@ -622,58 +1157,127 @@ async def approve_email_suggestion(
 ):
     """
     Approve a Jarvis-suggested email and send it via the Calendar MCP (saves to email_archive).
-    """
-    if suggestion_id not in _email_suggestions:
-        raise HTTPException(status_code=404, detail="Suggestion not found")
 
-    suggestion = _email_suggestions[suggestion_id]
-    if suggestion["status"] != "pending":
-        raise HTTPException(status_code=400, detail=f"Suggestion is already {suggestion['status']}")
+    The draft is claimed (pending -> sending) before sending, so concurrent
+    approvals of the same draft cannot both send it.
+    """
+    store = get_draft_store()
+    suggestion = await run_blocking(store.transition, suggestion_id, "pending", "sending")
+    if suggestion is None:
+        raise await run_blocking(_claim_error, suggestion_id)
 
     # Use edited body if provided, otherwise use original
     body = request.edited_body if request.edited_body else suggestion["body"]
 
     try:
-        # Directly call the calendar_server send_email function
-        # (imported module, not subprocess — MCP tools are loaded at startup)
-        from jarvis.tools.calendar_server import send_email as calendar_send_email
-        result = calendar_send_email(
-            client_name=suggestion["client_name"],
-            to=suggestion["to"],
-            subject=suggestion["subject"],
-            body=body,
-        )
-
-        if not result.get("success"):
-            raise HTTPException(status_code=500, detail="Calendar MCP send_email failed")
-
-        # Mark as approved
-        _email_suggestions[suggestion_id]["status"] = "approved"
-
-        return {
-            "success": True,
-            "message": result.get("message", "Email sent and archived successfully."),
-            "filename": result.get("filename"),
-        }
-
+        result = await run_blocking(_send_draft, suggestion, body)
     except Exception as e:
+        # Release the claim so the advisor can retry
+        await run_blocking(store.transition, suggestion_id, "sending", "pending")
         raise HTTPException(status_code=500, detail=f"Failed to send email: {str(e)}")
 
+    # Mark as approved (keeping the body that was actually sent)
+    await run_blocking(store.transition, suggestion_id, "sending", "approved", body=body)
+
+    return {
+        "success": True,
+        "message": result.get("message", "Email sent and archived successfully."),
+        "filename": result.get("filename"),
+    }
+
 
 @app.post("/api/email-suggestions/{suggestion_id}/reject")
 async def reject_email_suggestion(suggestion_id: str):
     """
     Reject a Jarvis-suggested email (removes it from the pending list).
     """
-    if suggestion_id not in _email_suggestions:
-        raise HTTPException(status_code=404, detail="Suggestion not found")
+    if await run_blocking(get_draft_store().transition, suggestion_id, "pending", "rejected") is None:
+        raise await run_blocking(_claim_error, suggestion_id)
+    return {"success": True, "message": "Email suggestion rejected."}
 
-    suggestion = _email_suggestions[suggestion_id]
-    if suggestion["status"] != "pending":
-        raise HTTPException(status_code=400, detail=f"Suggestion is already {suggestion['status']}")
 
-    _email_suggestions[suggestion_id]["status"] = "rejected"
-    return {"success": True, "message": "Email suggestion rejected."}
+# Bounds concurrent archive writes across all batch requests
+_email_send_semaphore = asyncio.Semaphore(EMAIL_SEND_CONCURRENCY)
+
+
+@app.post("/api/email-suggestions/batch", response_model=List[BatchEmailResult])
+async def batch_email_suggestions(request: BatchEmailRequest):
+    """
+    Approve or reject many email suggestions in one request.
+
+    All drafts are claimed in one transaction first. Approved drafts are then
+    sent concurrently in worker threads (at most EMAIL_SEND_CONCURRENCY at a
+    time). In `all_or_nothing` mode nothing is applied unless every draft can
+    be claimed and sent: emails already written are deleted from the archive
+    and every claim is released back to pending.
+    """
+    store = get_draft_store()
+    atomic = request.mode == "all_or_nothing"
+    # Later duplicates of the same id are ignored
+    items = {item.id: item for item in reversed(request.items)}
+    ids = list(dict.fromkeys(item.id for item in request.items))
+
+    target = "sending" if request.action == "approve" else "rejected"
+    claimed = await run_blocking(store.transition_many, ids, "pending", target, atomic)
+
+    results: Dict[str, BatchEmailResult] = {}
+    for draft_id in ids:
+        if claimed[draft_id] is None:
+            current = await run_blocking(store.get, draft_id)
+            if current is None:
+                error = "Suggestion not found"
+            elif current["status"] != "pending":
+                error = f"Suggestion is already {current['status']}"
+            else:
+                error = "Not applied: another item in the batch failed"
+            results[draft_id] = BatchEmailResult(
+                id=draft_id, success=False, status=current["status"] if current else None, error=error
+            )
+        elif request.action == "reject":
+            results[draft_id] = BatchEmailResult(id=draft_id, success=True, status="rejected")
+
+    if request.action == "reject":
+        return [results[draft_id] for draft_id in ids]
+
+    to_send = {draft_id: draft for draft_id, draft in claimed.items() if draft is not None}
+
+    async def send_one(draft: dict):
+        body = items[draft["id"]].edited_body or draft["body"]
+        async with _email_send_semaphore:
+            try:
+                return body, await run_blocking(_send_draft, draft, body), None
+            except Exception as e:
+                return body, None, str(e)
+
+    outcomes = dict(zip(to_send, await asyncio.gather(*(send_one(d) for d in to_send.values()))))
+    failed = any(error for _, _, error in outcomes.values())
+
+    if atomic and failed:
+        # Roll back: remove written emails and release every claim
+        for draft_id, (_, result, error) in outcomes.items():
+            if result and result.get("path"):
+                await run_blocking(Path(result["path"]).unlink, missing_ok=True)
+            await run_blocking(store.transition, draft_id, "sending", "pending")
+            results[draft_id] = BatchEmailResult(
+                id=draft_id,
+                success=False,
+                status="pending",
+                error=f"Failed to send email: {error}" if error else "Rolled back: another item in the batch failed",
+            )
+        return [results[draft_id] for draft_id in ids]
+
+    for draft_id, (body, result, error) in outcomes.items():
+        if error:
+            await run_blocking(store.transition, draft_id, "sending", "pending")
+            results[draft_id] = BatchEmailResult(
+                id=draft_id, success=False, status="pending", error=f"Failed to send email: {error}"
+            )
+        else:
+            await run_blocking(store.transition, draft_id, "sending", "approved", body=body)
+            results[draft_id] = BatchEmailResult(
+                id=draft_id, success=True, status="approved", filename=result.get("filename")
+            )
+    return [results[draft_id] for draft_id in ids]
 
 
 # ============================================================================
@@ -691,132 +1295,71 @@ class Meeting(BaseModel):
     end_time: str      # HH:MM
 
 
-def _get_demo_meetings() -> List[dict]:
-    """Return hardcoded demo meetings for the current week."""
-    return [
-        {
-            "id": "mtg-001",
-            "client_name": "Gareth Cheeseman",
-            "client_email": "gareth.cheeseman@constructionpm.com",
-            "subject": "Property Purchase & Protection Review",
-            "content": (
-                "Follow-up from Gareth's salary increase confirmation (now £78k). "
-                "He has redirected extra income into house savings as agreed.\n\n"
-                "Agenda:\n"
-                "• Review deposit progress — current savings £45k vs target £40k deposit\n"
-                "• Discuss timeline for property purchase (target Jul 2026)\n"
-                "• Urgent: Will update needed post-divorce — currently leaving estate to ex-spouse Claire\n"
-                "• Income protection — still unprotected during peak financial responsibility years\n"
-                "• Jack's ongoing therapy costs and custody arrangement impact on budget"
-            ),
-            "date": "2026-02-27",
-            "start_time": "09:00",
-            "end_time": "10:00",
-        },
-        {
-            "id": "mtg-002",
-            "client_name": "Brian Potter",
-            "client_email": "brian.potter47@gmail.com",
-            "subject": "Downsizing Options & Gifting Strategy for Sarah",
-            "content": (
-                "Follow-up from our earlier call about supporting daughter Sarah. "
-                "Brian was emotional — this needs a sensitive approach.\n\n"
-                "Agenda:\n"
-                "• Walk through the £30k gift option for Sarah with transparency plan for Andrew\n"
-                "• Review downsizing options — potential £150k equity release from Willow Close\n"
-                "• Margaret's inherited ISA (£47k) — spousal transfer still pending\n"
-                "• Excess cash position (£115k across savings/premium bonds) — discuss investment\n"
-                "• Check in on Brian's wellbeing — bereavement support, loneliness concerns"
-            ),
-            "date": "2026-02-27",
-            "start_time": "14:00",
-            "end_time": "15:00",
-        },
-        {
-            "id": "mtg-003",
-            "client_name": "Hyacinth Bucket",
-            "client_email": "hyacinth.bucket@talktalk.net",
-            "subject": "Sheridan Financial Support & LPA Planning",
-            "content": (
-                "Follow-up from Hyacinth's urgent email about Sheridan needing financial assistance again. "
-                "Historic £25k already unrepaid.\n\n"
-                "Agenda:\n"
-                "• Discuss boundaries for Sheridan support — unbounded goal is depleting savings\n"
-                "• Critical: LPAs and will update for both Hyacinth (73) and Richard (75) — neither in place\n"
-                "• Savings runway risk — depletion projected early 2030s without changes\n"
-                "• Richard's private pension drawdown (£45k remaining) — withdrawal strategy\n"
-                "• Car replacement goal — recommended budget £18k vs Hyacinth's £35k aspiration"
-            ),
-            "date": "2026-02-28",
-            "start_time": "10:00",
-            "end_time": "11:00",
-        },
-        {
-            "id": "mtg-004",
-            "client_name": "Robert Hughes",
-            "client_email": "robert.hughes@rghlegal.com",
-            "subject": "BTL Refinancing & Pre-Retirement Strategy",
-            "content": (
-                "Follow-up from the BTL rate update email. "
-                "Guildford property rate expired Aug 2025 — refinancing overdue.\n\n"
-                "Agenda:\n"
-                "• Review latest refinancing rates for Guildford BTL (current mortgage £85k)\n"
-                "• Recommendation: Sell Guildford BTL post-refinance — after-tax return weak vs alternatives\n"
-                "• Partnership exit planning — £280k buyout over 4 years (£70k/year)\n"
-                "• IHT exposure estimated ~£580k — LPAs, updated wills, gifting strategy needed\n"
-                "• Tom's house deposit gift (£75k) — timing and tax implications\n"
-                "• Charles Stanley managed portfolio fee drag — £2,720/year, worth reviewing"
-            ),
-            "date": "2026-03-02",
-            "start_time": "11:00",
-            "end_time": "12:00",
-        },
-        {
-            "id": "mtg-005",
-            "client_name": "Rodney & Cassandra Trotter",
-            "client_email": "cass.trotter@citybank.co.uk",
-            "subject": "House Purchase Deposit & Debt Clearance Plan",
-            "content": (
-                "Follow-up from Cassandra's email expressing frustration about housing delays. "
-                "She wants to see 'real progress this year'.\n\n"
-                "Agenda:\n"
-                "• Deposit position — current savings £38k joint + ISAs vs £50k target\n"
-                "• Director's loan (£12k overdrawn) — declare dividend to clear and avoid S455 tax\n"
-                "• Personal loan at 9.8% interest — prioritise clearing £8k balance\n"
-                "• Rodney's salary restructure — increase to £60k for mortgage strength\n"
-                "• Income protection — Rodney self-employed with two dependants, currently unprotected\n"
-                "• Relationship check-in — financial stress driving marital tension"
-            ),
-            "date": "2026-03-03",
-            "start_time": "15:00",
-            "end_time": "16:00",
-        },
-        {
-            "id": "mtg-006",
-            "client_name": "Basil Fawlty",
-            "client_email": "basil@fawltytowers.co.uk",
-            "subject": "Hotel Exit Strategy & Valuation Discussion",
-            "content": (
-                "Follow-up from Basil's email rejecting the £1.45m valuation as 'unrealistic'. "
-                "He remains emotionally attached to the hotel. Sybil wants to proceed with a sale.\n\n"
-                "Agenda:\n"
-                "• Address Basil's valuation expectations — agent estimates £1.2m–£1.3m range\n"
-                "• CGT planning — estimated gain £925k, BADR tax ~£92.5k\n"
-                "• Lease-back option as compromise — potential income £48k/year\n"
-                "• Retirement income modelling — £65k/year target from pensions + investments\n"
-                "• Mediterranean relocation plans — budget £120k for overseas property\n"
-                "• Manage Basil/Sybil dynamic — need aligned decision before proceeding"
-            ),
-            "date": "2026-03-04",
-            "start_time": "09:30",
-            "end_time": "10:30",
-        },
-    ]
-
-
 @app.get("/api/meetings", response_model=List[Meeting])
 async def get_meetings():
     """
     Get upcoming meetings for the advisor.
     """
-    return [Meeting(**m) for m in _get_demo_meetings()]
+    return [Meeting(**m) for m in get_demo_meetings()]
+
+
+MEETING_INSIGHTS_PROMPT = """I have an upcoming meeting with my client. Please help me prepare by providing key insights, talking points, and any important considerations.
+
+Meeting Details:
+- Client: {client_name}
+- Email: {client_email}
+- Subject: {subject}
+- Date: {date}
+- Time: {start_time} – {end_time}
+
+Meeting Notes & Agenda:
+{content}
+
+{client_context}
+
+Based on the above, please provide:
+1. Key preparation points for this meeting
+2. Important questions to ask the client
+3. Any risks or sensitive topics to be mindful of
+4. Recommended next steps to propose"""
+
+
+class MeetingInsights(BaseModel):
+    response: str
+    client_folder: str
+    context_tokens: int
+    context_built_at: Optional[str] = None
+
+
+@app.post("/api/meetings/{meeting_id}/insights", response_model=MeetingInsights)
+async def get_meeting_insights(meeting_id: str):
+    """
+    Pre-meeting brief from Atlas: the client's cached context pack plus a
+    single LLM call (no agent tool loop).
+    """
+    from langchain_core.messages import HumanMessage, SystemMessage
+    from jarvis.sub_agents.atlas import get_llm as get_atlas_llm, atlas_system_prompt
+
+    meeting = next((m for m in get_demo_meetings() if m["id"] == meeting_id), None)
+    if meeting is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    pack = await run_blocking(get_context_pack, meeting["client_name"])
+    prompt = MEETING_INSIGHTS_PROMPT.format(
+        **meeting,
+        client_context=pack["text"] if pack else "(No client records found.)",
+    )
+    try:
+        result = await get_atlas_llm().ainvoke([
+            SystemMessage(content=atlas_system_prompt),
+            HumanMessage(content=prompt),
+        ])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get insights: {str(e)}")
+
+    return MeetingInsights(
+        response=result.content,
+        client_folder=pack["folder"] if pack else resolve_client_folder(meeting["client_name"]),
+        context_tokens=pack["tokens"] if pack else 0,
+        context_built_at=pack["built_at"] if pack else None,
+    )
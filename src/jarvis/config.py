@@ -16,6 +16,7 @@ RAW_DATASETS_DIR = BASE_DIR / "raw_datasets"
 SYSTEM_PROMPT_DIR = BASE_DIR / "system_prompt"
 MEMORY_DIR = WORKSPACE_DIR / "memory"
 EMAIL_ARCHIVE_DIR = BASE_DIR / "email_archive"  # Owned by the Calendar MCP server
+DATA_DIR = Path(os.getenv("JARVIS_DATA_DIR", str(BASE_DIR / "data")))  # Runtime state (watermarks, SQLite stores)
 
 
 # API Keys (Loaded from environment)
@@ -28,14 +29,123 @@ WATSONX_PROJECT_ID = os.getenv("WATSONX_PROJECT_ID")
 
 # Heartbeat Configuration
 HEARTBEAT_INTERVAL_MINUTES = int(os.getenv("HEARTBEAT_INTERVAL_MINUTES", 30))
+HEARTBEAT_JITTER_SECONDS = int(os.getenv("HEARTBEAT_JITTER_SECONDS", 60))
 HEARTBEAT_PROMPT = (
     "Read HEARTBEAT.md if it exists (workspace context). "
     "Follow it strictly. Do not infer or repeat old tasks from prior chats. "
     "If nothing needs attention, reply HEARTBEAT_OK."
 )
+# Heartbeat mode: "single" runs one agent over the whole book, "fanout" discovers
+# changed clients deterministically and triages each one concurrently.
+HEARTBEAT_MODE = os.getenv("HEARTBEAT_MODE", "fanout")
+HEARTBEAT_MAX_CONCURRENCY = int(os.getenv("HEARTBEAT_MAX_CONCURRENCY", 8))
+HEARTBEAT_CLIENT_TIMEOUT_SECONDS = int(os.getenv("HEARTBEAT_CLIENT_TIMEOUT_SECONDS", 300))
+HEARTBEAT_CLIENT_PROMPT = (
+    "Heartbeat triage for client '{client_name}' (folder: datasets/{client_folder}/). "
+    "These files changed since {since}:\n{changed_files}\n{upcoming_meetings}"
+    "Workspace files are readable with the filesystem tools; email_archive files with the "
+    "calendar `read_email` tool. Read the changed files, and call `get_client_context` once for the "
+    "client's CRM record, recent emails, transcripts and memory notes, and `get_memory_notes` once "
+    "with an empty list and include_general=True for the advisor's general notes. If something is "
+    "important, ask Atlas for the recommended action, have Colin check it, then call `send_important_notification` "
+    "and/or `send_draft_email`. Only look at this client. "
+    "If nothing needs attention, reply HEARTBEAT_OK."
+)
+# Book-level market & compliance pass (HEARTBEAT.md step 2) in fan-out mode. It
+# runs on its own cadence, independent of the file pre-check, so market moves
+# still reach clients when none of their files changed.
+HEARTBEAT_MARKET_INTERVAL_MINUTES = int(os.getenv("HEARTBEAT_MARKET_INTERVAL_MINUTES", HEARTBEAT_INTERVAL_MINUTES))
+HEARTBEAT_MARKET_PROMPT = (
+    "Heartbeat market & compliance check across the whole client book. Call `get_macro_snapshot` "
+    "once, `search_financial_news` for UK financial market news (last 24h) and for UK "
+    "compliance/regulatory news, and `get_asset_performance` for the assets, funds or indices "
+    "clients hold. Call `get_memory_notes` once with an empty list and include_general=True for "
+    "the advisor's general notes. If a move or regulatory change materially affects clients, ask Atlas which "
+    "clients are affected and the recommended action, have Colin check it, then call "
+    "`send_important_notification` and/or `send_draft_email`. Do not re-read client files for "
+    "other reasons; per-client changes are triaged separately. "
+    "If nothing needs attention, reply HEARTBEAT_OK."
+)
+# Deterministic pre-check: skip the LLM entirely when no files changed, no
+# meeting is coming up and the market check is not due since the last
+# successful heartbeat.
+HEARTBEAT_PREFILTER = os.getenv("HEARTBEAT_PREFILTER", "true").lower() == "true"
+HEARTBEAT_STATE_PATH = DATA_DIR / "heartbeat_state.json"
+HEARTBEAT_MEETING_LOOKAHEAD_HOURS = int(os.getenv("HEARTBEAT_MEETING_LOOKAHEAD_HOURS", 24))
+HEARTBEAT_TOKEN_ESTIMATE = int(os.getenv("HEARTBEAT_TOKEN_ESTIMATE", 20000))  # used until a real run is measured
 NO_REPLY_TOKEN = "NO_REPLY"
 HEARTBEAT_OK_TOKEN = "HEARTBEAT_OK"
 
+# Dashboard Stores
+NOTIFICATIONS_DB_PATH = DATA_DIR / "notifications.sqlite"
+DRAFTS_DB_PATH = DATA_DIR / "drafts.sqlite"
+EMAIL_SEND_CONCURRENCY = int(os.getenv("EMAIL_SEND_CONCURRENCY", 4))  # parallel sends in batch approvals
+EMAIL_BATCH_MAX_ITEMS = int(os.getenv("EMAIL_BATCH_MAX_ITEMS", 100))  # drafts per batch request
+DRAFT_CLAIM_TIMEOUT_SECONDS = int(os.getenv("DRAFT_CLAIM_TIMEOUT_SECONDS", 300))  # 'sending' claims older than this are reconciled
+DRAFT_CLAIM_SWEEP_SECONDS = int(os.getenv("DRAFT_CLAIM_SWEEP_SECONDS", 60))  # how often stale claims are checked
+
+# Event Bus (notifications/drafts from other processes reach the API via an outbox)
+EVENT_BUS_DB_PATH = DATA_DIR / "event_bus.sqlite"
+EVENT_BUS_POLL_SECONDS = float(os.getenv("EVENT_BUS_POLL_SECONDS", 1.0))
+
+# Cron Scheduler Configuration
+SCHEDULER_DB_PATH = DATA_DIR / "scheduler.sqlite"  # persistent job store + run history
+CRON_MAX_CONCURRENT_RUNS = int(os.getenv("CRON_MAX_CONCURRENT_RUNS", 2))
+CRON_MISFIRE_GRACE_SECONDS = int(os.getenv("CRON_MISFIRE_GRACE_SECONDS", 3600))
+CRON_STORE_POLL_SECONDS = int(os.getenv("CRON_STORE_POLL_SECONDS", 60))  # pick up jobs added by other processes
+
+# Voice Pipeline Configuration
+VOICE_AUDIO_QUEUE_SIZE = int(os.getenv("VOICE_AUDIO_QUEUE_SIZE", 200))  # inbound PCM chunks (session closed as overloaded when full)
+VOICE_OUTBOUND_QUEUE_SIZE = int(os.getenv("VOICE_OUTBOUND_QUEUE_SIZE", 64))  # outbound events (backpressure when full)
+VOICE_MAX_TRACKED_SESSIONS = int(os.getenv("VOICE_MAX_TRACKED_SESSIONS", 50))
+
+# API Event Loop Configuration
+BLOCKING_IO_WORKERS = int(os.getenv("BLOCKING_IO_WORKERS", 8))  # thread pool for disk I/O from async handlers
+LOOP_LAG_WARN_MS = int(os.getenv("LOOP_LAG_WARN_MS", 100))  # log when the event loop is blocked this long
+LOOP_LAG_CHECK_SECONDS = float(os.getenv("LOOP_LAG_CHECK_SECONDS", 0.5))
+
+# Sub-agent dispatch (independent Atlas / Emma / Colin tasks run concurrently)
+SUBAGENT_DISPATCH_MAX_CONCURRENCY = int(os.getenv("SUBAGENT_DISPATCH_MAX_CONCURRENCY", 4))
+SUBAGENT_DISPATCH_TIMEOUT_SECONDS = int(os.getenv("SUBAGENT_DISPATCH_TIMEOUT_SECONDS", 180))  # per task
+
+# Client Context Packs (precomputed per-client context for Atlas / Jarvis / meeting insights)
+CONTEXT_PACK_TOKEN_BUDGET = int(os.getenv("CONTEXT_PACK_TOKEN_BUDGET", 4000))
+CONTEXT_PACK_REFRESH_SECONDS = int(os.getenv("CONTEXT_PACK_REFRESH_SECONDS", 300))
+
+# Uploads
+UPLOAD_MAX_FILE_BYTES = int(os.getenv("UPLOAD_MAX_FILE_BYTES", 10 * 1024 * 1024))  # per file (zip members too)
+UPLOAD_MAX_REQUEST_BYTES = int(os.getenv("UPLOAD_MAX_REQUEST_BYTES", 200 * 1024 * 1024))  # per request, uncompressed
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Partial uploads are staged here, outside datasets/ (so the file watcher never
+# sees them) but on the same filesystem (so the final rename stays atomic)
+UPLOAD_STAGING_DIR = WORKSPACE_DIR / ".uploads"
+
+# MCP Sessions (one long-lived session per bundled MCP server)
+# How the agent reaches the bundled calendar / market feed servers:
+#   stdio     - spawn each server as a subprocess (default)
+#   inprocess - import the FastMCP tools and call them directly (no transport)
+#   http      - connect to servers deployed separately (streamable HTTP)
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "stdio").lower()
+CALENDAR_MCP_URL = os.getenv("CALENDAR_MCP_URL", "http://localhost:8001/mcp")
+MARKET_FEED_MCP_URL = os.getenv("MARKET_FEED_MCP_URL", "http://localhost:8002/mcp")
+MCP_PING_SECONDS = float(os.getenv("MCP_PING_SECONDS", 30))  # health-check interval
+MCP_PING_TIMEOUT_SECONDS = float(os.getenv("MCP_PING_TIMEOUT_SECONDS", 10))
+MCP_CALL_WAIT_SECONDS = float(os.getenv("MCP_CALL_WAIT_SECONDS", 30))  # how long a call waits for a restarting server
+MCP_RESTART_MAX_BACKOFF_SECONDS = float(os.getenv("MCP_RESTART_MAX_BACKOFF_SECONDS", 30))
+MCP_WARMUP_TIMEOUT_SECONDS = float(os.getenv("MCP_WARMUP_TIMEOUT_SECONDS", 20))  # API starts degraded after this
+
+# Market Feed MCP server (Tavily search: results cache, outbound concurrency)
+MARKET_CACHE_DB_PATH = DATA_DIR / "market_cache.sqlite"
+MARKET_SEARCH_CONCURRENCY = int(os.getenv("MARKET_SEARCH_CONCURRENCY", 8))  # parallel Tavily calls
+MARKET_SEARCH_TIMEOUT_SECONDS = float(os.getenv("MARKET_SEARCH_TIMEOUT_SECONDS", 20))
+MARKET_RESPONSE_CHAR_BUDGET = int(os.getenv("MARKET_RESPONSE_CHAR_BUDGET", 3000))  # compact tool responses
+# Scheduled prefetch of macro indicators + watchlist assets into a snapshot store
+MARKET_SNAPSHOTS_DB_PATH = DATA_DIR / "market_snapshots.sqlite"
+MARKET_PREFETCH_MINUTES = int(os.getenv("MARKET_PREFETCH_MINUTES", 60))  # 0 disables the prefetcher
+MARKET_PREFETCH_REGION = os.getenv("MARKET_PREFETCH_REGION", "UK")
+# Comma-separated 'SYMBOL' or 'SYMBOL:TIMEFRAME' (1D/1W/1M/1Y/YTD, default 1M)
+MARKET_WATCHLIST = [s.strip() for s in os.getenv("MARKET_WATCHLIST", "FTSE100,S&P500").split(",") if s.strip()]
+
 # Vector Store Config
 VECTOR_STORE_PATH = BASE_DIR / "chroma_db"
 
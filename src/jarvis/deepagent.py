@@ -1,25 +1,36 @@
 from pathlib import Path
 from datetime import datetime
+from typing import Callable, Optional
 import asyncio
 import sys
-from deepagents import create_deep_agent, CompiledSubAgent
+import time
 from jarvis.tools.user_interaction import ask_user
 from jarvis.tools.file_monitor import find_files_updated_after
+from jarvis.tools.crm_query import query_crm
+from jarvis.tools.client_context import get_client_context
+from jarvis.tools.memory_notes import get_memory_notes
+from jarvis.tools.subagent_dispatch import dispatch_subagents
 from jarvis.tools.scheduler import (
     add_cron_job,
     remove_cron_job,
     list_cron_jobs,
     get_cron_job_info
 )
-# Import the agent graphs directly (not the tool wrappers)
-from jarvis.sub_agents.atlas import atlas_agent
-from jarvis.sub_agents.emma import emma_agent
-from jarvis.sub_agents.colin import colin_agent
-from jarvis.config import OPENAI_API_KEY, WORKSPACE_DIR
+# Accessors for the agent graphs (not the tool wrappers), built on first use
+from jarvis.sub_agents.atlas import get_atlas_agent
+from jarvis.sub_agents.emma import get_emma_agent
+from jarvis.sub_agents.colin import get_colin_agent
+from jarvis.config import (
+    OPENAI_API_KEY,
+    WORKSPACE_DIR,
+    MCP_TRANSPORT,
+    CALENDAR_MCP_URL,
+    MARKET_FEED_MCP_URL,
+    MCP_WARMUP_TIMEOUT_SECONDS,
+)
+from jarvis.utils.mcp_sessions import InProcessServer, get_mcp_manager
 from dotenv import find_dotenv, load_dotenv
-from deepagents.backends import FilesystemBackend
 from langgraph.checkpoint.memory import MemorySaver
-from langchain.agents.middleware import ModelRetryMiddleware
 from langchain_mcp_adapters.client import MultiServerMCPClient
 
 load_dotenv(find_dotenv(), override=True)
@@ -27,7 +38,7 @@ load_dotenv(find_dotenv(), override=True)
 checkpointer = MemorySaver()
 
 # ---------------------------------------------------------------------------
-# Calendar MCP tool cache
+# Calendar / Market Feed MCP tool cache
 # ---------------------------------------------------------------------------
 
 # When installed via `pip install .` in Docker, __file__ resolves into site-packages.
@@ -45,20 +56,56 @@ _MARKET_FEED_SERVER_PATH = str(
 )
 _market_feed_tools: list = []  # populated once, reused everywhere
 
+# server name -> (stdio script, in-process module, HTTP URL)
+_MCP_SERVERS = {
+    "calendar": (_CALENDAR_SERVER_PATH, "jarvis.tools.calendar_server", CALENDAR_MCP_URL),
+    "market_feed": (_MARKET_FEED_SERVER_PATH, "jarvis.tools.market_feed_server", MARKET_FEED_MCP_URL),
+}
+
+
+def _mcp_connection(name: str) -> dict:
+    """Connection for a bundled MCP server according to MCP_TRANSPORT."""
+    server_path, module, url = _MCP_SERVERS[name]
+    if MCP_TRANSPORT == "inprocess":
+        return {"transport": "inprocess", "module": module}
+    if MCP_TRANSPORT == "http":
+        return {"transport": "streamable_http", "url": url}
+    return {
+        "transport": "stdio",
+        "command": sys.executable,
+        "args": [server_path],
+        "env": dict(_os.environ),  # explicitly propagate Railway env vars to subprocess
+    }
+
+
+async def _fetch_mcp_tools(name: str, timeout: Optional[float] = None) -> list:
+    """Tools for a bundled server: in-process, or on a persistent, health-checked session."""
+    return await get_mcp_manager().get_tools(name, _mcp_connection(name), timeout=timeout)
+
+
+async def _load_inprocess_tools(name: str, module: str) -> list:
+    server = InProcessServer(name, module)
+    await server.wait_ready()
+    return server.langchain_tools()
 
-async def _fetch_calendar_tools() -> list:
-    """Fetch tools from the Calendar MCP server (coroutine, call once)."""
-    client = MultiServerMCPClient(
-        {
-            "calendar": {
-                "transport": "stdio",
-                "command": sys.executable,
-                "args": [_CALENDAR_SERVER_PATH],
-                "env": dict(_os.environ),  # explicitly propagate Railway env vars to subprocess
-            }
-        }
-    )
-    return await client.get_tools()
+
+def _load_mcp_tools_sync(name: str) -> list:
+    """Synchronous fallback for callers without a long-lived event loop.
+
+    asyncio.run() gives no loop that outlives the call, so transported tools
+    open a session per call here (in-process tools need none). On a running
+    event loop (server still warming up) the tools are left out rather than
+    blocking the loop.
+    """
+    connection = _mcp_connection(name)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        if connection["transport"] == "inprocess":
+            return asyncio.run(_load_inprocess_tools(name, connection["module"]))
+        return asyncio.run(MultiServerMCPClient({name: connection}).get_tools())
+    print(f"[MCP] {name} tools not ready yet; building the agent without them")
+    return []
 
 
 def _load_calendar_tools() -> list:
@@ -67,49 +114,113 @@ def _load_calendar_tools() -> list:
     Safe to call from background threads (scheduler, heartbeat) because
     asyncio.run() spins up a fresh event loop — no conflict with FastAPI's loop.
     In FastAPI, call `await init_calendar_tools()` at startup instead so the
-    cache is already warm before requests arrive.
+    cache is already warm (and on a persistent session) before requests arrive.
     """
     global _calendar_tools
     if not _calendar_tools:
-        _calendar_tools = asyncio.run(_fetch_calendar_tools())
+        _calendar_tools = _load_mcp_tools_sync("calendar")
     return _calendar_tools
 
 
-async def init_calendar_tools() -> None:
+async def init_calendar_tools(timeout: Optional[float] = None) -> None:
     """Async warm-up for FastAPI startup: populate the cache without asyncio.run()."""
     global _calendar_tools
     if not _calendar_tools:
-        _calendar_tools = await _fetch_calendar_tools()
-
-
-async def _fetch_market_feed_tools() -> list:
-    """Fetch tools from the Market Feed MCP server (coroutine, call once)."""
-    client = MultiServerMCPClient(
-        {
-            "market_feed": {
-                "transport": "stdio",
-                "command": sys.executable,
-                "args": [_MARKET_FEED_SERVER_PATH],
-                "env": dict(_os.environ),  # explicitly propagate Railway env vars to subprocess
-            }
-        }
-    )
-    return await client.get_tools()
+        _calendar_tools = await _fetch_mcp_tools("calendar", timeout)
 
 
 def _load_market_feed_tools() -> list:
     """Return cached market feed tools, loading them synchronously if needed."""
     global _market_feed_tools
     if not _market_feed_tools:
-        _market_feed_tools = asyncio.run(_fetch_market_feed_tools())
+        _market_feed_tools = _load_mcp_tools_sync("market_feed")
     return _market_feed_tools
 
 
-async def init_market_feed_tools() -> None:
+async def init_market_feed_tools(timeout: Optional[float] = None) -> None:
     """Async warm-up for FastAPI startup: populate the cache without asyncio.run()."""
     global _market_feed_tools
     if not _market_feed_tools:
-        _market_feed_tools = await _fetch_market_feed_tools()
+        _market_feed_tools = await _fetch_mcp_tools("market_feed", timeout)
+
+
+# ---------------------------------------------------------------------------
+# Concurrent warm-up with degraded mode
+# ---------------------------------------------------------------------------
+
+_MCP_WARMUPS = {"calendar": init_calendar_tools, "market_feed": init_market_feed_tools}
+_mcp_warmup_status: dict = {}  # server -> {"status": "ready" | "degraded", "ms", "error"}
+_mcp_retry_tasks: set = set()
+
+
+def get_mcp_warmup_status() -> dict:
+    return {name: dict(status) for name, status in _mcp_warmup_status.items()}
+
+
+async def warm_up_mcp_tools(
+    timeout: float = MCP_WARMUP_TIMEOUT_SECONDS,
+    on_ready: Optional[Callable[[str], None]] = None,
+) -> dict:
+    """
+    Warm every bundled MCP server concurrently, giving each at most `timeout` seconds.
+
+    Never raises: a server that is slow or down is marked "degraded" (agents
+    are built without its tools) and retried in the background; `on_ready`
+    is called with the server name once it recovers.
+
+    Returns:
+        Per-server {"status", "ms", "error"}.
+    """
+    async def warm(name: str):
+        started = time.perf_counter()
+        try:
+            await _MCP_WARMUPS[name](timeout=timeout)
+            _mcp_warmup_status[name] = {"status": "ready", "ms": _elapsed_ms(started)}
+        except Exception as e:
+            error = f"timed out after {timeout:.0f}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+            _mcp_warmup_status[name] = {"status": "degraded", "ms": _elapsed_ms(started), "error": error}
+            print(f"[MCP] {name} warm-up failed ({error}); continuing without it, retrying in background")
+            task = asyncio.create_task(_retry_warm_up(name, timeout, on_ready))
+            _mcp_retry_tasks.add(task)
+            task.add_done_callback(_mcp_retry_tasks.discard)
+
+    await asyncio.gather(*(warm(name) for name in _MCP_WARMUPS))
+    return get_mcp_warmup_status()
+
+
+async def _retry_warm_up(name: str, timeout: float, on_ready: Optional[Callable[[str], None]]):
+    delay = 5.0
+    while True:
+        await asyncio.sleep(delay)
+        started = time.perf_counter()
+        try:
+            await _MCP_WARMUPS[name](timeout=timeout)
+        except Exception as e:
+            _mcp_warmup_status[name]["error"] = str(e) or type(e).__name__
+            delay = min(delay * 2, 300.0)
+            continue
+        _mcp_warmup_status[name] = {
+            "status": "ready",
+            "ms": _elapsed_ms(started),
+            "recovered_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        print(f"[MCP] {name} tools recovered")
+        if on_ready is not None:
+            on_ready(name)
+        return
+
+
+async def close_mcp_tools() -> None:
+    """Stop background warm-up retries and close every MCP session."""
+    for task in list(_mcp_retry_tasks):
+        task.cancel()
+    await asyncio.gather(*_mcp_retry_tasks, return_exceptions=True)
+    await get_mcp_manager().aclose()
+
+
+def _elapsed_ms(started: float) -> int:
+    return int((time.perf_counter() - started) * 1000)
+
 
 def build_system_prompt(mode: str = "chat") -> str:
     """
@@ -151,6 +262,12 @@ Keep narration brief and value-dense.
 Your working directory is: ./
 Treat this directory as your single global workspace for file operations.
 
+## Memory
+Advisor memory notes come from `get_memory_notes`, not from `MEMORY.md` or the memory/ files.
+Once per session, before your first answer or action, call `get_memory_notes([], include_general=True)`
+for the advisor's general notes (preferences, house rules). Call it again with client names for
+notes about specific clients.
+
 ## Current Date & Time
 {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
@@ -193,9 +310,9 @@ If something **does** need attention, you MUST take action by calling the approp
 Do NOT simply reply with alert text — always finish the work by calling the appropriate tool.
 After calling the tool(s), reply HEARTBEAT_OK.
 
-**If the user asks to show anything in the last 10 days that looks urgent across my book(emails and meeting notes), FIRST read the contents of `SOUL.md`, `USER.md` and `MEMORY.md` files into your chat history. Then check the local workspace use the ls and glob to find all the datasets/**/email_archive/*.txt and datasets/**/meeting_transcripts/*.txt(just have * don't put any more) files inside datasets/ for email archive and meeting transcripts from the name you can find the one that happened in the last 10 days(if today is 2026-02-08, then from 2026-01-28 to 2026-02-08), once you found the files, read them, and ask the atlas for specific users(just mention the user names and ask for actions no need to call multiple times and no need to mention the exact file names) and get the further details and then reply to the user. The `find_files_updated_after` is not the right tool don't use it.**
+**If the user asks to show anything in the last 10 days that looks urgent across my book(emails and meeting notes), FIRST read the contents of `SOUL.md` and `USER.md` files into your chat history. Then check the local workspace use the ls and glob to find all the datasets/**/email_archive/*.txt and datasets/**/meeting_transcripts/*.txt(just have * don't put any more) files inside datasets/ for email archive and meeting transcripts from the name you can find the one that happened in the last 10 days(if today is 2026-02-08, then from 2026-01-28 to 2026-02-08), once you found the files, read them, call `get_memory_notes` once with the names of the clients those files are about, and ask the atlas for specific users(just mention the user names and ask for actions no need to mention the exact file names; when several clients are involved, call `dispatch_subagents` once with one atlas task per client so they run in parallel) and get the further details and then reply to the user. The `find_files_updated_after` is not the right tool don't use it.**
 
-**If you wake up from a heartbeat, FIRST read the contents of `SOUL.md`, `USER.md`, `MEMORY.md` and `HEARTBEAT.md` files into your chat history, use the find_files_updated_after in last 30 minutes to find the files that were updated in last 30 minutes, if there is any mails read it and if its something important, read the CRM of the client and other last one or two email and previous transcripts to get the context and ask the atlas to get the recommended action and investigate whether there is any similar client advise abi has given and take that action response give it to the colin and finally back to the user.**
+**If you wake up from a heartbeat, FIRST read the contents of `SOUL.md`, `USER.md` and `HEARTBEAT.md` files into your chat history (do not read `MEMORY.md` or the memory/ files; call `get_memory_notes([], include_general=True)` once for the general notes and `get_memory_notes` for the clients involved instead), use the find_files_updated_after in last 30 minutes to find the files that were updated in last 30 minutes, if there is any mails read it and if its something important, read the CRM of the client and other last one or two email and previous transcripts to get the context and ask the atlas to get the recommended action and investigate whether there is any similar client advise abi has given and take that action response give it to the colin and finally back to the user. When more than one client needs attention, do not ask atlas one client at a time: call `dispatch_subagents` once with one atlas task per client, then call it again with one colin task per recommended action.**
 """
     
     return prompt
@@ -211,6 +328,10 @@ def create_jarvis_agent(system_prompt: str = None, model: str = "openai:gpt-5.1-
         model: The model to use for the agent. Defaults to "openai:gpt-4.1".
         extra_tools: Additional tools to include beyond the defaults.
     """
+    from deepagents import create_deep_agent, CompiledSubAgent
+    from deepagents.backends import FilesystemBackend
+    from langchain.agents.middleware import ModelRetryMiddleware
+
     if system_prompt is None:
         system_prompt = build_system_prompt()
 
@@ -224,6 +345,10 @@ def create_jarvis_agent(system_prompt: str = None, model: str = "openai:gpt-5.1-
     # Core + calendar + market feed tools
     tools = [
         find_files_updated_after,
+        query_crm,
+        get_client_context,
+        get_memory_notes,
+        dispatch_subagents,
         add_cron_job,
         remove_cron_job,
         list_cron_jobs,
@@ -241,7 +366,7 @@ def create_jarvis_agent(system_prompt: str = None, model: str = "openai:gpt-5.1-
             "meeting transcripts, and emails. Use Atlas to retrieve and analyze information "
             "from client documents and provide fact-based insights."
         ),
-        runnable=atlas_agent
+        runnable=get_atlas_agent()
     )
     
     emma_subagent = CompiledSubAgent(
@@ -252,7 +377,7 @@ def create_jarvis_agent(system_prompt: str = None, model: str = "openai:gpt-5.1-
             "with traceable reasoning and source citations. Use Emma for drafting "
             "client communications and financial recommendation letters."
         ),
-        runnable=emma_agent
+        runnable=get_emma_agent()
     )
     
     colin_subagent = CompiledSubAgent(
@@ -263,7 +388,7 @@ def create_jarvis_agent(system_prompt: str = None, model: str = "openai:gpt-5.1-
             "UK financial regulations. Returns binary PASS/FAIL decisions with specific "
             "reasoning. Use Colin to verify compliance before sending client-facing documents."
         ),
-        runnable=colin_agent
+        runnable=get_colin_agent()
     )
     
     # Create the Deep Agent with subagents
@@ -1,25 +1,290 @@
 import asyncio
+import json
+import os
+import random
 import time
-import threading
-import schedule
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
 
-from jarvis.deepagent import create_jarvis_agent, build_system_prompt
+from jarvis.deepagent import create_jarvis_agent, warm_up_mcp_tools
 from jarvis.config import (
     HEARTBEAT_INTERVAL_MINUTES,
+    HEARTBEAT_JITTER_SECONDS,
     HEARTBEAT_PROMPT,
     HEARTBEAT_OK_TOKEN,
-    NO_REPLY_TOKEN
+    NO_REPLY_TOKEN,
+    HEARTBEAT_MODE,
+    HEARTBEAT_MAX_CONCURRENCY,
+    HEARTBEAT_CLIENT_TIMEOUT_SECONDS,
+    HEARTBEAT_CLIENT_PROMPT,
+    HEARTBEAT_MARKET_INTERVAL_MINUTES,
+    HEARTBEAT_MARKET_PROMPT,
+    HEARTBEAT_PREFILTER,
+    HEARTBEAT_STATE_PATH,
+    HEARTBEAT_MEETING_LOOKAHEAD_HOURS,
+    HEARTBEAT_TOKEN_ESTIMATE,
+    DATASETS_DIR,
 )
-from jarvis.tools.heartbeat_tools import send_important_notification, send_draft_email
+from jarvis.tools.heartbeat_tools import send_important_notification, send_draft_email, heartbeat_actions
+from jarvis.tools.file_monitor import scan_changed_files
+from jarvis.tools.meetings import get_meetings_due, meeting_client_folder
+from jarvis.tools.scheduler import start_scheduler
+from jarvis.utils.aio import run_blocking
 import uuid
 
 
-async def _heartbeat_job_async():
+# ---------------------------------------------------------------------------
+# Persisted state: change watermark + skipped/executed statistics
+# ---------------------------------------------------------------------------
+
+def _load_state() -> dict:
+    """Load the heartbeat state file (watermark, reviewed meetings, stats)."""
+    state = {}
+    if HEARTBEAT_STATE_PATH.exists():
+        try:
+            state = json.loads(HEARTBEAT_STATE_PATH.read_text())
+        except (OSError, ValueError) as e:
+            print(f"[Scheduler]: Could not read heartbeat state, starting fresh: {e}")
+    state.setdefault("watermark", None)
+    state.setdefault("reviewed_meetings", [])
+    # Clients whose last triage failed -> watermark of their last successful one
+    state.setdefault("client_watermarks", {})
+    state.setdefault("market_checked_at", None)
+    state.setdefault("stats", {})
+    for key in ("skipped", "executed", "tokens_used", "tokens_saved"):
+        state["stats"].setdefault(key, 0)
+    return state
+
+
+def _save_state(state: dict):
+    """Atomically persist the heartbeat state file."""
+    HEARTBEAT_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = HEARTBEAT_STATE_PATH.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(state, indent=2))
+    os.replace(tmp_path, HEARTBEAT_STATE_PATH)
+
+
+def get_heartbeat_stats() -> dict:
+    """Skipped vs executed heartbeats, token usage and the current watermark."""
+    state = _load_state()
+    return {"watermark": state["watermark"], **state["stats"]}
+
+
+def _count_tokens(messages: list) -> int:
+    """Sum the token usage reported on the AI messages of a run."""
+    total = 0
+    for msg in messages:
+        usage = getattr(msg, "usage_metadata", None) or {}
+        total += usage.get("total_tokens", 0)
+    return total
+
+
+def _known_client_folders() -> set:
+    if not DATASETS_DIR.exists():
+        return set()
+    return {d.name for d in DATASETS_DIR.iterdir() if d.is_dir() and not d.name.startswith('.')}
+
+
+def _precheck(state: dict, now: datetime) -> dict:
     """
-    Async implementation of the heartbeat job.
-    MCP tools (calendar, market-feed) are async-only, so the agent
-    graph MUST be driven with ainvoke — invoke() will raise NotImplementedError
-    when it tries to execute those tools synchronously.
+    Cheap, deterministic pre-check (no model call).
+
+    Looks at the change journal (files modified in datasets/ and the email
+    archive since the watermark), at meetings starting within
+    HEARTBEAT_MEETING_LOOKAHEAD_HOURS that have not been reviewed yet, and
+    at whether the market check is due (HEARTBEAT_MARKET_INTERVAL_MINUTES).
+    Blocking (directory scans); run it off the event loop.
+    """
+    if state["watermark"]:
+        since = datetime.fromisoformat(state["watermark"])
+    else:
+        since = now - timedelta(minutes=HEARTBEAT_INTERVAL_MINUTES)
+
+    changes = scan_changed_files(since)
+    # Clients whose triage failed are rescanned from their own, older watermark
+    since_by_client = {}
+    for folder, watermark in state["client_watermarks"].items():
+        since_by_client[folder] = datetime.fromisoformat(watermark)
+        changes.pop(folder, None)
+        changes.update(scan_changed_files(since_by_client[folder], clients={folder}))
+
+    reviewed = set(state["reviewed_meetings"])
+    due_meetings = [
+        m for m in get_meetings_due(now, HEARTBEAT_MEETING_LOOKAHEAD_HOURS)
+        if m["id"] not in reviewed
+    ]
+    new_emails = sum(1 for files in changes.values() for f in files if f["source"] == "email_archive")
+    market_checked_at = state["market_checked_at"]
+    market_due = (
+        market_checked_at is None
+        or now - datetime.fromisoformat(market_checked_at) >= timedelta(minutes=HEARTBEAT_MARKET_INTERVAL_MINUTES)
+    )
+    return {
+        "since": since,
+        "since_by_client": since_by_client,
+        "changes": changes,
+        "new_emails": new_emails,
+        "due_meetings": due_meetings,
+        "market_due": market_due,
+        "client_folders": _known_client_folders(),
+    }
+
+
+def _format_meetings(meetings: list) -> str:
+    if not meetings:
+        return ""
+    lines = "\n".join(
+        f"- {m['date']} {m['start_time']}: {m['subject']} with {m['client_name']}" for m in meetings
+    )
+    return f"Upcoming meeting(s) to prepare for:\n{lines}\n"
+
+
+# ---------------------------------------------------------------------------
+# Heartbeat runs
+# ---------------------------------------------------------------------------
+
+async def _run_triage(agent, prompt: str, thread_prefix: str, semaphore: asyncio.Semaphore) -> dict:
+    """
+    One bounded heartbeat run on the shared agent graph.
+    Notifications / drafts created by the tools are captured in a per-task action log.
+    """
+    async with semaphore:
+        actions: list = []
+        token = heartbeat_actions.set(actions)
+        started = time.perf_counter()
+        tokens = 0
+        try:
+            result = await asyncio.wait_for(
+                agent.ainvoke(
+                    {"messages": [{"role": "user", "content": prompt}]},
+                    config={"configurable": {"thread_id": f"{thread_prefix}_{uuid.uuid4()}"}},
+                ),
+                timeout=HEARTBEAT_CLIENT_TIMEOUT_SECONDS,
+            )
+            status, response = "ok", result["messages"][-1].content
+            tokens = _count_tokens(result["messages"])
+        except asyncio.TimeoutError:
+            status, response = "timeout", ""
+        except Exception as e:
+            status, response = "error", str(e)
+        finally:
+            heartbeat_actions.reset(token)
+
+    return {
+        "status": status,
+        "response": response,
+        "actions": actions,
+        "tokens": tokens,
+        "duration_s": round(time.perf_counter() - started, 2),
+    }
+
+
+async def _triage_client(
+    agent,
+    client_folder: str,
+    files: list,
+    meetings: list,
+    since: datetime,
+    semaphore: asyncio.Semaphore,
+) -> dict:
+    """Run a single-client heartbeat triage on the shared agent graph."""
+    client_name = client_folder.replace('_', ' ').title()
+    changed_files = "\n".join(
+        f"- [{f['source']}] {f['path']} (modified {f['modified']})" for f in files
+    ) or "(none)"
+    prompt = HEARTBEAT_CLIENT_PROMPT.format(
+        client_name=client_name,
+        client_folder=client_folder,
+        since=since.strftime("%Y-%m-%d %H:%M:%S"),
+        changed_files=changed_files,
+        upcoming_meetings=_format_meetings(meetings),
+    )
+
+    return {
+        "client": client_name,
+        "folder": client_folder,
+        "meetings": [m["id"] for m in meetings],
+        **await _run_triage(agent, prompt, f"heartbeat_{client_folder}", semaphore),
+    }
+
+
+async def _market_pass(agent, semaphore: asyncio.Semaphore) -> dict:
+    """Run the book-level market & compliance check on the shared agent graph."""
+    return {
+        "client": "market check",
+        "folder": None,
+        "meetings": [],
+        **await _run_triage(agent, HEARTBEAT_MARKET_PROMPT, "heartbeat_market", semaphore),
+    }
+
+
+async def _fanout_heartbeat_async(precheck: dict) -> Tuple[int, list]:
+    """
+    Fan-out heartbeat: triage each changed client (and each client with a
+    meeting coming up) concurrently, bounded by HEARTBEAT_MAX_CONCURRENCY,
+    and merge the per-client outcomes into one report.
+
+    When the market check is due, a book-level market & compliance pass runs
+    alongside the client triages.
+
+    Returns the number of tokens used and the results of the runs that
+    failed or timed out (retried on the next heartbeat); the market pass
+    result has folder None.
+    """
+    print("\n[Scheduler]: Triggering Heartbeat (fan-out)...")
+    since = precheck["since"]
+    work = {folder: {"files": files, "meetings": []} for folder, files in precheck["changes"].items()}
+    for meeting in precheck["due_meetings"]:
+        folder = meeting_client_folder(meeting, work.keys() | precheck["client_folders"])
+        work.setdefault(folder, {"files": [], "meetings": []})["meetings"].append(meeting)
+
+    if not work and not precheck["market_due"]:
+        print("[Scheduler]: Heartbeat OK - No client changes detected")
+        return 0, []
+
+    print(
+        f"[Scheduler]: {len(work)} client(s) to triage with concurrency {HEARTBEAT_MAX_CONCURRENCY}"
+        + (" plus the market check" if precheck["market_due"] else "")
+    )
+
+    # One compiled graph is shared by every triage run; runs are isolated by thread_id.
+    agent = create_jarvis_agent(
+        model="openai:gpt-5-nano",
+        extra_tools=[send_important_notification, send_draft_email],
+    )
+    semaphore = asyncio.Semaphore(HEARTBEAT_MAX_CONCURRENCY)
+    runs = [
+        _triage_client(
+            agent, folder, item["files"], item["meetings"],
+            precheck["since_by_client"].get(folder, since), semaphore,
+        )
+        for folder, item in sorted(work.items())
+    ]
+    if precheck["market_due"]:
+        runs.append(_market_pass(agent, semaphore))
+    results = await asyncio.gather(*runs)
+
+    # Merge: notifications and drafts have already been delivered by the tools;
+    # report what each client run produced.
+    notifications = sum(1 for r in results for a in r["actions"] if a["kind"] == "notification")
+    drafts = sum(1 for r in results for a in r["actions"] if a["kind"] == "draft_email")
+    for r in results:
+        print(f"[Scheduler]:   {r['client']}: {r['status']} in {r['duration_s']}s, {len(r['actions'])} action(s)")
+    failed = [r for r in results if r["status"] != "ok"]
+    print(
+        f"[Scheduler]: Heartbeat fan-out completed - {len(results)} run(s), "
+        f"{notifications} notification(s), {drafts} draft(s)"
+        + (f", failed (retried next heartbeat): {', '.join(r['client'] for r in failed)}" if failed else "")
+    )
+    if failed and len(failed) == len(results):
+        raise RuntimeError(f"All {len(results)} heartbeat triage runs failed")
+    return sum(r["tokens"] for r in results), failed
+
+
+async def _single_heartbeat_async(precheck: dict) -> int:
+    """
+    Monolithic heartbeat: one agent run over the whole book.
+    Returns the number of tokens used.
     """
     print("\n[Scheduler]: Triggering Heartbeat...")
 
@@ -31,9 +296,20 @@ async def _heartbeat_job_async():
         extra_tools=[send_important_notification, send_draft_email],
     )
 
+    changed = "\n".join(
+        f"- [{f['source']}] {client}: {f['path']}"
+        for client, files in sorted(precheck["changes"].items()) for f in files
+    )
+    prompt = HEARTBEAT_PROMPT
+    if changed or precheck["due_meetings"]:
+        prompt += (
+            f"\n\nPre-check found these changes since {precheck['since'].strftime('%Y-%m-%d %H:%M:%S')}:\n"
+            f"{changed or '(no file changes)'}\n{_format_meetings(precheck['due_meetings'])}"
+        )
+
     # Use ainvoke — MCP tools are async-only and cannot be called via invoke()
     result = await agent.ainvoke(
-        {"messages": [{"role": "user", "content": HEARTBEAT_PROMPT}]},
+        {"messages": [{"role": "user", "content": prompt}]},
         config={"configurable": {"thread_id": f"heartbeat_{uuid.uuid4()}"}}
     )
     response = result["messages"][-1].content
@@ -46,28 +322,137 @@ async def _heartbeat_job_async():
     else:
         # Agent handled actions via tools (notification / draft email)
         print("[Scheduler]: Heartbeat completed with tool actions")
+    return _count_tokens(result["messages"])
 
 
-def heartbeat_job():
+async def _heartbeat_job_async():
     """
-    Synchronous wrapper around the async heartbeat so that `schedule` can call it.
-    Bridges the sync scheduler thread into an async event loop via asyncio.run().
+    Async implementation of the heartbeat job.
+    MCP tools (calendar, market-feed) are async-only, so the agent
+    graph MUST be driven with ainvoke — invoke() will raise NotImplementedError
+    when it tries to execute those tools synchronously.
+
+    A deterministic pre-check runs first; when nothing changed since the last
+    successful heartbeat (and the market check is not due) the LLM run is
+    skipped entirely. The watermark only advances after a successful run, so
+    failed heartbeats are retried. In fan-out mode a client whose triage
+    failed keeps its own watermark (and its meetings stay unreviewed) until a
+    later run for it succeeds, and a failed market pass is retried next tick.
     """
+    state = _load_state()
+    stats = state["stats"]
+    started_at = datetime.now()
+    precheck = await run_blocking(_precheck, state, started_at)
+
+    if (
+        HEARTBEAT_PREFILTER
+        and not precheck["changes"]
+        and not precheck["due_meetings"]
+        and not precheck["market_due"]
+    ):
+        # Estimate savings from the average cost of the runs we did execute
+        per_run = stats["tokens_used"] // stats["executed"] if stats["executed"] else HEARTBEAT_TOKEN_ESTIMATE
+        stats["skipped"] += 1
+        stats["tokens_saved"] += per_run
+        state["watermark"] = started_at.isoformat()
+        state["client_watermarks"] = {}  # nothing left to retry for any client
+        _save_state(state)
+        print(
+            f"[Scheduler]: Heartbeat OK (pre-check) - nothing changed, LLM skipped "
+            f"(~{per_run} tokens saved; skipped {stats['skipped']}, executed {stats['executed']}, "
+            f"~{stats['tokens_saved']} tokens saved in total)"
+        )
+        return
+
+    print(
+        f"[Scheduler]: Pre-check - {sum(len(f) for f in precheck['changes'].values())} changed file(s) "
+        f"across {len(precheck['changes'])} client(s), {precheck['new_emails']} new email(s), "
+        f"{len(precheck['due_meetings'])} meeting(s) due"
+        + (", market check due" if precheck["market_due"] else "")
+    )
+    if HEARTBEAT_MODE == "fanout":
+        tokens, failed = await _fanout_heartbeat_async(precheck)
+    else:
+        tokens, failed = await _single_heartbeat_async(precheck), []
+
+    # The single-mode run covers the market check too (HEARTBEAT.md step 2)
+    if precheck["market_due"] and not any(r["folder"] is None for r in failed):
+        state["market_checked_at"] = started_at.isoformat()
+    failed = [r for r in failed if r["folder"] is not None]
+    for result in failed:
+        state["client_watermarks"].setdefault(result["folder"], precheck["since"].isoformat())
+    failed_folders = {r["folder"] for r in failed}
+    for folder in set(state["client_watermarks"]) - failed_folders:
+        del state["client_watermarks"][folder]
+    failed_meetings = {meeting_id for r in failed for meeting_id in r["meetings"]}
+
+    state["watermark"] = started_at.isoformat()
+    state["reviewed_meetings"] = sorted(
+        set(state["reviewed_meetings"])
+        | {m["id"] for m in precheck["due_meetings"] if m["id"] not in failed_meetings}
+    )
+    state["stats"]["executed"] += 1
+    state["stats"]["tokens_used"] += tokens
+    _save_state(state)
+    print(f"[Scheduler]: Heartbeat used {tokens} tokens (executed {state['stats']['executed']}, skipped {state['stats']['skipped']})")
+
+
+def _next_delay(interval_minutes: int, jitter_seconds: int) -> float:
+    """Seconds until the next tick: the interval +/- a random jitter."""
+    return max(1.0, interval_minutes * 60 + random.uniform(-jitter_seconds, jitter_seconds))
+
+
+async def _run_heartbeat_guarded():
+    """Run one heartbeat, logging (not propagating) any failure."""
     try:
-        asyncio.run(_heartbeat_job_async())
+        await _heartbeat_job_async()
+    except asyncio.CancelledError:
+        print("[Scheduler]: Heartbeat cancelled")
+        raise
     except Exception as e:
         print(f"\n[Scheduler]: Error in heartbeat: {e}")
 
 
-def run_scheduler():
+async def run_heartbeat_loop(
+    interval_minutes: int = HEARTBEAT_INTERVAL_MINUTES,
+    jitter_seconds: int = HEARTBEAT_JITTER_SECONDS,
+    run_immediately: bool = True,
+):
     """
-    Background scheduler that triggers heartbeats every HEARTBEAT_INTERVAL_MINUTES.
+    Asyncio-native heartbeat scheduler.
+
+    Runs on the caller's event loop (the FastAPI loop when started from the API),
+    so the MCP tool sessions warmed on that loop are reused by every heartbeat.
+    Each tick starts the heartbeat as a task; if the previous heartbeat is still
+    running the tick is skipped instead of overlapping. Cancelling this coroutine
+    also cancels an in-flight heartbeat.
     """
-    schedule.every(HEARTBEAT_INTERVAL_MINUTES).minutes.do(heartbeat_job)
-    
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    running: Optional[asyncio.Task] = None
+    print(f"💓 Heartbeat scheduler started ({interval_minutes} min interval, ±{jitter_seconds}s jitter)")
+    try:
+        if not run_immediately:
+            await asyncio.sleep(_next_delay(interval_minutes, jitter_seconds))
+        while True:
+            if running is not None and not running.done():
+                print("[Scheduler]: Previous heartbeat still running - skipping this tick")
+            else:
+                running = asyncio.create_task(_run_heartbeat_guarded())
+            await asyncio.sleep(_next_delay(interval_minutes, jitter_seconds))
+    except asyncio.CancelledError:
+        if running is not None and not running.done():
+            running.cancel()
+            await asyncio.gather(running, return_exceptions=True)
+        print("💓 Heartbeat scheduler stopped")
+        raise
+
+
+async def _main_async():
+    # MCP tools must be warmed on this loop before the first heartbeat builds an agent
+    # (concurrently; a server that is down is retried in the background)
+    await warm_up_mcp_tools()
+    # Persist cron jobs the agent adds; the API process is the one that runs them
+    start_scheduler(paused=True)
+    await run_heartbeat_loop(run_immediately=True)
 
 
 def main():
@@ -79,19 +464,12 @@ def main():
     print("  JARVIS HEARTBEAT - Autonomous Monitoring")
     print("=" * 60)
     print()
-    
-    # Trigger an immediate heartbeat on startup
-    print("Running initial heartbeat...")
-    heartbeat_job()
-    print()
-    
-    # Run the scheduler (blocking)
-    print(f"✓ Scheduler started ({HEARTBEAT_INTERVAL_MINUTES} min interval)")
-    print("Press Ctrl+C to stop.")
+    print("Running initial heartbeat, then every "
+          f"{HEARTBEAT_INTERVAL_MINUTES} min. Press Ctrl+C to stop.")
     print("-" * 60)
-    
+
     try:
-        run_scheduler()
+        asyncio.run(_main_async())
     except KeyboardInterrupt:
         print("\n\nHeartbeat stopped. Goodbye!")
 
@@ -1,16 +1,18 @@
 import os
+from functools import lru_cache
 from langchain.messages import HumanMessage
 from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
-from langchain.agents import create_agent
 from jarvis.utils.vector_store import query_vector_store, ingest_documents
+from jarvis.tools.crm_query import query_crm
+from jarvis.tools.client_context import get_client_context
 from jarvis.config import OPENAI_API_KEY, LITELLM_API_KEY, LITELLM_URL
-from langchain.chat_models import init_chat_model
-from langchain.agents.middleware import TodoListMiddleware
-from langchain.agents.middleware import ModelRetryMiddleware
 
-# Initialize LLM for Atlas (consistent with simple_rag_agent.py)
-llm = init_chat_model("gpt-4.1")
+
+@lru_cache(maxsize=1)
+def get_llm():
+    """LLM for Atlas (consistent with simple_rag_agent.py), created on first use."""
+    from langchain.chat_models import init_chat_model
+    return init_chat_model("gpt-4.1")
 
 @tool
 def retrieve_context(query: str):
@@ -34,19 +36,28 @@ atlas_system_prompt = (
     "You are Atlas, a RAG (Retrieval-Augmented Generation) specialist for a financial advisory firm. "
     "Your job is to analyze client data, meeting transcripts, and emails to provide accurate, "
     "fact-based insights to the advisor. "
+    "When asked about a specific client, start with the 'get_client_context' tool (CRM record, "
+    "recent transcripts and emails, memory notes in one call), then use 'retrieve_context' for anything else. "
     "Always rely on the information retrieved via the 'retrieve_context' tool. "
+    "For questions across many clients (filters, rankings, totals over CRM fields such as "
+    "mortgages, pensions, income or review dates), use the 'query_crm' tool instead. "
     "If the information is not present in the documents, state that clearly. "
     "Be concise, professional, and highlight specific details or numbers when found."
 )
 
-# The Atlas Agent Graph - to be used with CompiledSubAgent
-atlas_agent = create_agent(
-    model=llm, 
-    tools=[retrieve_context], 
-    system_prompt=atlas_system_prompt, 
-    middleware=[
-        TodoListMiddleware(),
-        ModelRetryMiddleware(
+@lru_cache(maxsize=1)
+def get_atlas_agent():
+    """The Atlas Agent Graph - to be used with CompiledSubAgent."""
+    from langchain.agents import create_agent
+    from langchain.agents.middleware import TodoListMiddleware, ModelRetryMiddleware
+
+    return create_agent(
+        model=get_llm(),
+        tools=[retrieve_context, query_crm, get_client_context],
+        system_prompt=atlas_system_prompt,
+        middleware=[
+            TodoListMiddleware(),
+            ModelRetryMiddleware(
                 max_retries=3,
                 backoff_factor=2.0,
                 initial_delay=1.0,
@@ -55,6 +66,15 @@ atlas_agent = create_agent(
     )
 
 
+def __getattr__(name):
+    # `llm` and `atlas_agent` used to be built at import; keep them importable
+    if name == "llm":
+        return get_llm()
+    if name == "atlas_agent":
+        return get_atlas_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
-    print(atlas_agent.invoke({"messages": [HumanMessage(content="Summarize Sarah Thompson's meeting and then identify her primary financial goals.")]}))
+    print(get_atlas_agent().invoke({"messages": [HumanMessage(content="Summarize Sarah Thompson's meeting and then identify her primary financial goals.")]}))
     # print(retrieve_context.invoke({"query": "Sarah Thompson"}))
\ No newline at end of file
@@ -2,20 +2,24 @@ import os
 from dotenv import find_dotenv, load_dotenv
 load_dotenv(find_dotenv(), override=True)
 
+from functools import lru_cache
 from langchain.messages import HumanMessage
 from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
-from langchain.agents import create_agent
-from tavily import TavilyClient
 from jarvis.config import OPENAI_API_KEY
-from langchain.chat_models import init_chat_model
-from langchain.agents.middleware import ModelRetryMiddleware
 
-# Initialize LLM for Colin
-llm = init_chat_model("gpt-4.1")
 
-# Initialize DuckDuckGo search tool
-tavily_client = TavilyClient(api_key=os.environ["TAVILY_API_KEY"])
+@lru_cache(maxsize=1)
+def get_llm():
+    """LLM for Colin, created on first use."""
+    from langchain.chat_models import init_chat_model
+    return init_chat_model("gpt-4.1")
+
+
+@lru_cache(maxsize=1)
+def get_tavily_client():
+    """Search client, created on Colin's first search (TAVILY_API_KEY is only needed then)."""
+    from tavily import TavilyClient
+    return TavilyClient(api_key=os.environ["TAVILY_API_KEY"])
 
 @tool
 def search_uk_compliance(
@@ -30,7 +34,7 @@ def search_uk_compliance(
 
     topic: Category of the search
     """
-    return tavily_client.search(
+    return get_tavily_client().search(
         query,
         max_results=max_results,
         include_raw_content=include_raw_content,
@@ -71,19 +75,35 @@ colin_system_prompt = (
     "Always use the web search tool to double check your response."
 )
 
-# The Colin Agent Graph - to be used with CompiledSubAgent
-colin_agent = create_agent(
-    model=llm,
-    tools=[search_uk_compliance],
-    system_prompt=colin_system_prompt,
-    middleware=[
-        ModelRetryMiddleware(
-            max_retries=3,
-            backoff_factor=2.0,
-            initial_delay=1.0,
-        ),
-    ],
-)
+@lru_cache(maxsize=1)
+def get_colin_agent():
+    """The Colin Agent Graph - to be used with CompiledSubAgent."""
+    from langchain.agents import create_agent
+    from langchain.agents.middleware import ModelRetryMiddleware
+
+    return create_agent(
+        model=get_llm(),
+        tools=[search_uk_compliance],
+        system_prompt=colin_system_prompt,
+        middleware=[
+            ModelRetryMiddleware(
+                max_retries=3,
+                backoff_factor=2.0,
+                initial_delay=1.0,
+            ),
+        ],
+    )
+
+
+def __getattr__(name):
+    # `llm`, `tavily_client` and `colin_agent` used to be built at import; keep them importable
+    if name == "llm":
+        return get_llm()
+    if name == "tavily_client":
+        return get_tavily_client()
+    if name == "colin_agent":
+        return get_colin_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
@@ -97,4 +117,4 @@ if __name__ == "__main__":
     Best regards,
     Financial Advisor
     """
-    print(colin_agent.invoke({"messages": [{"role": "user", "content": test_document}]}))
+    print(get_colin_agent().invoke({"messages": [{"role": "user", "content": test_document}]}))
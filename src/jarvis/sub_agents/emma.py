@@ -1,15 +1,14 @@
 import os
+from functools import lru_cache
 from langchain.messages import HumanMessage
-from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
-from langchain.agents import create_agent
 from jarvis.config import OPENAI_API_KEY
-from langchain.chat_models import init_chat_model
-from langchain.agents.middleware import TodoListMiddleware
-from langchain.agents.middleware import ModelRetryMiddleware
 
-# Initialize LLM for Emma
-llm = init_chat_model("gpt-4.1")
+
+@lru_cache(maxsize=1)
+def get_llm():
+    """LLM for Emma, created on first use."""
+    from langchain.chat_models import init_chat_model
+    return init_chat_model("gpt-4.1")
 
 
 # Create the Emma Agent (Paraplanner)
@@ -44,21 +43,37 @@ emma_system_prompt = (
     "You can call the atlas to get the information multiple times if needed"
 )
 
-# The Emma Agent Graph - to be used with CompiledSubAgent
-# Note: Emma will communicate with Atlas through the deep agent's subagent system
-emma_agent = create_agent(
-    model=llm,
-    tools=[],  # Tools removed - deep agent handles subagent communication
-    system_prompt=emma_system_prompt,
-    middleware=[
-        TodoListMiddleware(),
-        ModelRetryMiddleware(
-            max_retries=3,
-            backoff_factor=2.0,
-            initial_delay=1.0,
-        ),
-    ],
-)
+@lru_cache(maxsize=1)
+def get_emma_agent():
+    """The Emma Agent Graph - to be used with CompiledSubAgent.
+
+    Note: Emma will communicate with Atlas through the deep agent's subagent system
+    """
+    from langchain.agents import create_agent
+    from langchain.agents.middleware import TodoListMiddleware, ModelRetryMiddleware
+
+    return create_agent(
+        model=get_llm(),
+        tools=[],  # Tools removed - deep agent handles subagent communication
+        system_prompt=emma_system_prompt,
+        middleware=[
+            TodoListMiddleware(),
+            ModelRetryMiddleware(
+                max_retries=3,
+                backoff_factor=2.0,
+                initial_delay=1.0,
+            ),
+        ],
+    )
+
+
+def __getattr__(name):
+    # `llm` and `emma_agent` used to be built at import; keep them importable
+    if name == "llm":
+        return get_llm()
+    if name == "emma_agent":
+        return get_emma_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
@@ -67,4 +82,4 @@ if __name__ == "__main__":
         "Draft an email to Sarah Thompson recommending she consolidate her ISAs. "
         "Include specific reasons based on her situation."
     )
-    print(emma_agent.invoke({"messages": [HumanMessage(content=test_query)]}))
+    print(get_emma_agent().invoke({"messages": [HumanMessage(content=test_query)]}))
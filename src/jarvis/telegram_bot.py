@@ -9,10 +9,11 @@ load_dotenv(find_dotenv(), override=True)
 from telegram import Update
 from telegram.ext import Application, MessageHandler, filters, ContextTypes
 
-from jarvis.deepagent import create_jarvis_agent, init_calendar_tools, init_market_feed_tools
-from jarvis.sub_agents.atlas import atlas_agent
-from jarvis.sub_agents.emma import emma_agent
-from jarvis.sub_agents.colin import colin_agent
+from jarvis.deepagent import create_jarvis_agent, warm_up_mcp_tools
+from jarvis.sub_agents.atlas import get_atlas_agent
+from jarvis.sub_agents.emma import get_emma_agent
+from jarvis.sub_agents.colin import get_colin_agent
+from jarvis.tools.scheduler import start_scheduler
 
 # Enable logging
 logging.basicConfig(
@@ -34,11 +35,11 @@ def get_or_create_agent(agent_type: str, thread_id: str):
         if agent_type == "jarvis":
             _agents[key] = create_jarvis_agent()
         elif agent_type == "atlas":
-            _agents[key] = atlas_agent
+            _agents[key] = get_atlas_agent()
         elif agent_type == "emma":
-            _agents[key] = emma_agent
+            _agents[key] = get_emma_agent()
         elif agent_type == "colin":
-            _agents[key] = colin_agent
+            _agents[key] = get_colin_agent()
         else:
             raise ValueError(f"Unknown agent type: {agent_type}")
 
@@ -116,13 +117,18 @@ async def post_init(application: Application):
     Hook that runs after the application is initialized and within the event loop.
     We warm up our MCP tools here because they require a running event loop.
     """
-    logger.info("📅 Loading Calendar MCP tools...")
-    await init_calendar_tools()
-    logger.info("📅 Calendar MCP tools ready")
-
-    logger.info("📈 Loading Market Feed MCP tools...")
-    await init_market_feed_tools()
-    logger.info("📈 Market Feed MCP tools ready")
+    # Both servers warm concurrently; one that is slow or down is retried in
+    # the background and its tools are added once it recovers
+    def on_ready(name: str):
+        for key in [k for k in _agents if k.startswith("jarvis:")]:
+            del _agents[key]
+
+    logger.info("🔌 Loading MCP tools...")
+    for name, status in (await warm_up_mcp_tools(on_ready=on_ready)).items():
+        logger.info(f"🔌 {name} MCP tools {status['status']} ({status['ms']} ms)")
+
+    # Cron jobs added from Telegram are persisted; the API process executes them
+    start_scheduler(paused=True)
 
 def main():
     bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
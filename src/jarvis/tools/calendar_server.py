@@ -11,11 +11,13 @@ Each .txt file follows the format:
     Body...
 
 Run standalone:  uv run python src/jarvis/tools/calendar_server.py
+Serve over HTTP: FASTMCP_PORT=8001 uv run python src/jarvis/tools/calendar_server.py streamable-http
 """
 
 from __future__ import annotations
 
 import re
+import sys
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -106,19 +108,18 @@ def list_clients() -> list[dict]:
     Returns:
         A list of dicts with keys: client_name, folder, email_count.
     """
-    if not EMAIL_ARCHIVE_ROOT.exists():
-        return []
-
-    result = []
-    for d in sorted(EMAIL_ARCHIVE_ROOT.iterdir()):
-        if d.is_dir():
-            emails = list(d.glob("*.txt"))
-            result.append({
-                "client_name": d.name.replace("_", " ").title(),
-                "folder": d.name,
-                "email_count": len(emails),
-            })
-    return result
+    # Served from the shared (cached) client registry
+    from jarvis.utils.client_registry import get_client_registry
+
+    return [
+        {
+            "client_name": c["folder"].replace("_", " ").title(),
+            "folder": c["folder"],
+            "email_count": c["archive_email_count"],
+        }
+        for c in get_client_registry().clients()
+        if c["in_email_archive"]
+    ]
 
 
 @mcp.tool()
@@ -219,6 +220,7 @@ def send_email(
     to: str,
     subject: str,
     body: str,
+    message_id: str | None = None,
 ) -> dict:
     """Compose and save a new outgoing email to a client's archive.
 
@@ -227,6 +229,8 @@ def send_email(
         to: Recipient address, e.g. "Alan Partridge <alan.partridge@norfolkradio.co.uk>".
         subject: Email subject line.
         body: Plain-text body of the email.
+        message_id: Optional Message-ID header, e.g. "<draft-id@jarvis>", so the
+            sender can later check whether this email was archived.
 
     Returns:
         Dict with 'success', 'filename', and 'path' keys, or an error dict.
@@ -240,22 +244,28 @@ def send_email(
     slug = _date_slug(subject)
     filename = f"{date_prefix}_{slug}.txt"
 
-    # Avoid collisions
-    path = client_dir / filename
-    if path.exists():
-        uid = str(uuid.uuid4())[:6]
-        filename = f"{date_prefix}_{slug}_{uid}.txt"
-        path = client_dir / filename
-
     content = (
         f"From: {ADVISOR_FROM}\n"
         f"To: {to}\n"
         f"Date: {date_str}\n"
         f"Subject: {subject}\n"
-        f"\n"
+        + (f"Message-ID: {message_id}\n" if message_id else "")
+        + f"\n"
         f"{body}\n"
     )
-    path.write_text(content, encoding="utf-8")
+
+    # Avoid collisions: exclusive create, so concurrent sends of the same
+    # subject on the same day never overwrite each other's archive file
+    path = client_dir / filename
+    while True:
+        try:
+            with open(path, "x", encoding="utf-8") as f:
+                f.write(content)
+            break
+        except FileExistsError:
+            uid = str(uuid.uuid4())[:6]
+            filename = f"{date_prefix}_{slug}_{uid}.txt"
+            path = client_dir / filename
 
     return {
         "success": True,
@@ -265,6 +275,25 @@ def send_email(
     }
 
 
+def find_sent_email(client_name: str, message_id: str) -> str | None:
+    """Filename of the client's archived email with this Message-ID, or None."""
+    client_dir = _client_dir(client_name)
+    if not client_dir.exists():
+        return None
+    header = f"Message-ID: {message_id}"
+    for path in client_dir.glob("*.txt"):
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        break  # end of headers
+                    if line.rstrip("\n") == header:
+                        return path.name
+        except OSError:
+            continue
+    return None
+
+
 @mcp.tool()
 def get_recent_emails(
     days: int = 7,
@@ -306,4 +335,5 @@ def get_recent_emails(
 # Entry point
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    # "stdio" (default, spawned by the agent) or "streamable-http" (separate deployment)
+    mcp.run(transport=sys.argv[1] if len(sys.argv) > 1 else "stdio")
@@ -0,0 +1,27 @@
+"""
+Client context tool: one call returns a client's precomputed context pack
+(CRM record, recent transcripts and emails, indexed memory notes) instead of many
+separate file reads.
+"""
+from langchain_core.tools import tool
+
+from jarvis.utils.context_packs import get_context_pack
+
+
+@tool
+def get_client_context(client_name: str) -> str:
+    """Get a compact, up-to-date briefing pack for one client in a single call.
+
+    Includes the client's CRM record, the most recent meeting transcripts and
+    emails, and the advisor's memory notes about them. Use this FIRST whenever
+    you start working on a specific client, instead of reading crm.json,
+    transcripts and emails one by one. Read individual files only if you need
+    something the pack does not cover (it is truncated to a token budget).
+
+    Args:
+        client_name: Client name (e.g. 'David Chen') or folder (e.g. 'david_chen').
+    """
+    pack = get_context_pack(client_name)
+    if pack is None:
+        return f"No client found matching '{client_name}'."
+    return f"{pack['text']}\n\n(context pack built {pack['built_at']}, ~{pack['tokens']} tokens)"
@@ -0,0 +1,49 @@
+"""
+Book-wide CRM query tool.
+
+Lets agents answer questions across all clients ("which mortgages are fixed
+until before June?", "average net worth by risk profile") with one SQL query
+over the in-memory CRM database instead of reading every crm.json.
+"""
+import json
+
+from langchain_core.tools import tool
+
+from jarvis.utils.crm_store import get_crm_store
+
+
+@tool
+def query_crm(sql: str, max_rows: int = 50) -> str:
+    """Run a read-only SQL (SQLite) SELECT over every client's CRM record.
+
+    Use this for questions across the whole client book: filtering, sorting,
+    counting or aggregating clients by household, income, property/mortgage,
+    pensions, goals, review dates or risk profile. Prefer it over reading
+    crm.json files one by one. Join tables on `folder` (client folder slug).
+
+    Tables:
+        clients(folder, client_id, full_name, first_name, last_name, date_of_birth,
+            age, occupation, employer, annual_income_gbp, email, mobile, partner_name,
+            partner_income_gbp, household_income_gbp, children_count, risk_profile,
+            service_status, last_review_date, next_review_date, net_worth_gbp)
+        properties(folder, name, value_gbp, purchase_year, mortgage_balance_gbp,
+            mortgage_rate_percent, mortgage_fixed_until, mortgage_monthly_payment_gbp,
+            mortgage_term_remaining_years)
+        pensions(folder, owner, name, type, provider, value_gbp, accrued_income_gbp_per_year)
+        goals(folder, goal, target_date, target_amount_gbp, status)
+        vulnerabilities(folder, person, type, description)
+        facts(folder, path, value_text, value_num)  -- every other CRM value by dotted
+            path, e.g. path LIKE 'financials.investments.isas.%'
+
+    Dates are 'YYYY-MM-DD' strings, e.g.
+    WHERE mortgage_fixed_until <= date('now', '+6 months').
+
+    Args:
+        sql: A single SELECT statement. Writes, PRAGMA and ATTACH are rejected.
+        max_rows: Maximum rows to return (default 50, max 200).
+    """
+    try:
+        result = get_crm_store().query(sql, max_rows=max_rows)
+    except ValueError as e:
+        return f"Error: {e}"
+    return json.dumps(result, default=str)
@@ -1,8 +1,56 @@
 from langchain_core.tools import tool
 from pathlib import Path
 from datetime import datetime
-from typing import Union
-from jarvis.config import CLIENT_DATA_PATH, WORKSPACE_DIR
+from typing import Dict, List, Optional, Set, Union
+from jarvis.config import CLIENT_DATA_PATH, WORKSPACE_DIR, EMAIL_ARCHIVE_DIR
+
+
+def scan_changed_files(since: datetime, clients: Optional[Set[str]] = None) -> Dict[str, List[dict]]:
+    """
+    Deterministically collect files modified after `since`, grouped by client folder.
+
+    Covers both per-client dataset folders (`workspace/datasets/<client>/**`) and
+    the Calendar MCP email archive (`email_archive/<client>/*.txt`). No LLM involved —
+    this is the cheap discovery step used by the heartbeat before any agent runs.
+    `clients` limits the scan to those client folders.
+
+    Returns:
+        dict mapping client folder slug -> list of {"path", "source", "modified"} dicts,
+        sorted oldest first. "source" is "datasets" (path relative to the workspace,
+        readable with the filesystem tools) or "email_archive" (path is the filename,
+        readable with the Calendar MCP `read_email` tool).
+    """
+    since_ts = since.timestamp()
+    changes: Dict[str, List[dict]] = {}
+
+    for root, source in ((Path(CLIENT_DATA_PATH), "datasets"), (Path(EMAIL_ARCHIVE_DIR), "email_archive")):
+        if not root.exists():
+            continue
+        for client_folder in root.iterdir():
+            if not client_folder.is_dir() or client_folder.name.startswith('.'):
+                continue
+            if clients is not None and client_folder.name not in clients:
+                continue
+            for file_path in client_folder.rglob('*'):
+                if not file_path.is_file():
+                    continue
+                mtime = file_path.stat().st_mtime
+                if mtime <= since_ts:
+                    continue
+                if source == "datasets":
+                    rel_path = str(file_path.relative_to(WORKSPACE_DIR))
+                else:
+                    rel_path = str(file_path.relative_to(client_folder))
+                changes.setdefault(client_folder.name, []).append({
+                    "path": rel_path,
+                    "source": source,
+                    "modified": datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                })
+
+    for files in changes.values():
+        files.sort(key=lambda f: f["modified"])
+    return changes
+
 
 @tool
 def find_files_updated_after(timestamp: str) -> Union[str, list]:
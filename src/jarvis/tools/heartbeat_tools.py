@@ -8,48 +8,46 @@ interpret.
 """
 
 import uuid
-import os
-import requests
+from contextvars import ContextVar
 from datetime import datetime
+from typing import List, Optional
 from langchain_core.tools import tool
 
-# API endpoint for notifications (used for HTTP fallback only)
-API_BASE_URL = os.getenv("API_INTERNAL_URL", "http://localhost:8000")
+from jarvis.utils.event_bus import EMAIL_DRAFT, NOTIFICATION, get_event_bus
 
+# Per-run action log. The fan-out heartbeat sets a fresh list for each client
+# triage task so the actions taken by concurrent runs can be merged afterwards.
+# Context variables are copied into the executor threads LangChain runs tools in.
+heartbeat_actions: ContextVar[Optional[List[dict]]] = ContextVar("heartbeat_actions", default=None)
 
-def send_notification(title: str, message: str, notification_type: str = "action"):
+
+def _record_action(kind: str, **details):
+    actions = heartbeat_actions.get()
+    if actions is not None:
+        actions.append({"kind": kind, **details})
+
+
+def send_notification(title: str, message: str, notification_type: str = "action", client: str = None):
     """
     Send a notification to the dashboard.
-    When running in-process with API, uses direct function call.
-    Falls back to HTTP request if direct import fails.
+
+    Published on the event bus: delivered directly when running inside the API
+    process, or through the SQLite outbox from a standalone process.
     """
-    try:
-        # Try direct function call first (when running in-process with API)
-        from jarvis.api import add_notification
-        add_notification(notification_type, title, message)
-        print(f"[Scheduler]: Notification added to dashboard")
-    except ImportError:
-        # Fall back to HTTP request (when running as separate process)
-        try:
-            response = requests.post(
-                f"{API_BASE_URL}/api/notifications",
-                json={
-                    "type": notification_type,
-                    "title": title,
-                    "message": message
-                },
-                timeout=5
-            )
-            if response.ok:
-                print(f"[Scheduler]: Notification sent to dashboard")
-            else:
-                print(f"[Scheduler]: Failed to send notification: {response.status_code}")
-        except requests.exceptions.RequestException as e:
-            print(f"[Scheduler]: Could not reach API: {e}")
+    get_event_bus().publish(
+        NOTIFICATION,
+        {"notification_type": notification_type, "title": title, "message": message, "client": client},
+    )
+    print(f"[Heartbeat]: Notification sent to dashboard")
 
 
 @tool
-def send_important_notification(title: str, message: str, notification_type: str = "action") -> str:
+def send_important_notification(
+    title: str,
+    message: str,
+    notification_type: str = "action",
+    client_name: str = "",
+) -> str:
     """Send an important notification to the advisor's dashboard.
 
     Use this ONLY during heartbeat checks when something urgent or noteworthy
@@ -60,8 +58,15 @@ def send_important_notification(title: str, message: str, notification_type: str
         title: Short headline for the notification (e.g. '🚨 Urgent: Client Risk').
         message: Detailed body text explaining what was found.
         notification_type: One of 'info', 'warning', 'action', 'success'. Defaults to 'action'.
+        client_name: Name of the client this is about (e.g. 'David Chen'), if any.
     """
-    send_notification(title=title, message=message, notification_type=notification_type)
+    send_notification(
+        title=title,
+        message=message,
+        notification_type=notification_type,
+        client=client_name or None,
+    )
+    _record_action("notification", title=title, notification_type=notification_type)
     return f"Notification sent to dashboard: {title}"
 
 
@@ -79,8 +84,6 @@ def send_draft_email(client_name: str, to: str, subject: str, body: str) -> str:
         subject: Email subject line.
         body: Full email body text.
     """
-    from jarvis.api import _email_suggestions
-
     suggestion = {
         "id": str(uuid.uuid4()),
         "client_name": client_name,
@@ -90,6 +93,7 @@ def send_draft_email(client_name: str, to: str, subject: str, body: str) -> str:
         "status": "pending",
         "created_at": datetime.now().isoformat(),
     }
-    _email_suggestions[suggestion["id"]] = suggestion
+    get_event_bus().publish(EMAIL_DRAFT, suggestion)
+    _record_action("draft_email", client_name=client_name, subject=subject, id=suggestion["id"])
 
     return f"Draft email created for advisor approval (id={suggestion['id']}). It will appear in the Email Drafts dashboard."
@@ -1,23 +1,55 @@
 """
 Market Feed MCP Server for Jarvis.
 
-Exposes three read-only market intelligence tools powered by Tavily search:
+Exposes four read-only market intelligence tools powered by Tavily search:
   • get_macro_indicators  – macro-economic indicators (interest rates, inflation, etc.)
+  • get_macro_snapshot    – several macro indicators at once, in one compact payload
   • search_financial_news – curated financial/regulatory news search
   • get_asset_performance – price/performance snapshot for a given asset/ticker
 
+Tools are async: searches go out concurrently over a pooled keep-alive HTTP
+client, capped by a semaphore and a per-call timeout. Results are cached in
+SQLite (data/market_cache.sqlite) with per-tool TTLs; identical concurrent
+searches share one Tavily call, and stale results are served immediately
+while a fresh copy is fetched in the background. Responses are shaped
+before they reach the agent: near-duplicate articles dropped, results ranked
+by score and recency, content trimmed to a character budget (or just the
+answer and citations with detail='answer'), with a token estimate attached.
+
+Macro indicators and watchlisted assets are also prefetched on a schedule by
+the API process (`refresh_snapshots`) into a versioned snapshot store, which
+the tools serve from while it is within TTL. Every response carries
+'freshness' metadata.
+
 Run standalone:  uv run python src/jarvis/tools/market_feed_server.py
+Serve over HTTP: FASTMCP_PORT=8002 uv run python src/jarvis/tools/market_feed_server.py streamable-http
 """
 
 from __future__ import annotations
 
+import asyncio
+import inspect
+import json
 import os
+import re
+import sys
+import time
 from enum import Enum
-from datetime import date
+from datetime import date, datetime
+from typing import Any, Protocol
 
+import httpx
 from dotenv import find_dotenv, load_dotenv
 from mcp.server.fastmcp import FastMCP
-from tavily import TavilyClient
+
+from jarvis.config import (
+    MARKET_RESPONSE_CHAR_BUDGET,
+    MARKET_SEARCH_CONCURRENCY,
+    MARKET_SEARCH_TIMEOUT_SECONDS,
+)
+from jarvis.utils.market_cache import cache_key, get_market_cache
+from jarvis.utils.market_snapshots import get_market_snapshot_store
+from jarvis.utils.tokens import estimate_tokens
 
 load_dotenv(find_dotenv(), override=True)
 
@@ -27,16 +59,139 @@ load_dotenv(find_dotenv(), override=True)
 mcp = FastMCP("market_feed")
 
 # ---------------------------------------------------------------------------
-# Tavily client (shared across tools)
+# Search client (shared across tools, injectable for offline tests)
 # ---------------------------------------------------------------------------
-_tavily = TavilyClient(api_key=os.environ["TAVILY_API_KEY"])
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+
+class SearchClient(Protocol):
+    def search(self, **kwargs: Any) -> dict: ...  # may also be a coroutine function
+
+
+class TavilyHTTPClient:
+    """Async Tavily search over one pooled keep-alive HTTP connection set."""
+
+    def __init__(self, api_key: str, timeout: float = MARKET_SEARCH_TIMEOUT_SECONDS):
+        self._http = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=httpx.Timeout(timeout, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=MARKET_SEARCH_CONCURRENCY,
+                max_keepalive_connections=MARKET_SEARCH_CONCURRENCY,
+            ),
+        )
+
+    async def search(self, **kwargs: Any) -> dict:
+        resp = await self._http.post(TAVILY_SEARCH_URL, json=kwargs)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+_client: SearchClient | None = None
+# Caps concurrent outbound searches; parallel tool calls beyond it queue here
+_search_slots = asyncio.Semaphore(MARKET_SEARCH_CONCURRENCY)
+
+
+def set_search_client(client: SearchClient | None) -> None:
+    """Replace the Tavily client, e.g. with a stub returning canned results."""
+    global _client
+    _client = client
+
+
+def _get_client() -> SearchClient:
+    """The shared Tavily client, created on first use (not at import time)."""
+    global _client
+    if _client is None:
+        api_key = os.getenv("TAVILY_API_KEY")
+        if not api_key:
+            raise RuntimeError("TAVILY_API_KEY is not set")
+        _client = TavilyHTTPClient(api_key)
+    return _client
 
 
 # ---------------------------------------------------------------------------
-# Helpers
+# Result cache
 # ---------------------------------------------------------------------------
+# How long a cached result is served as fresh, in seconds. Older results are
+# still returned immediately while a background refresh fetches a new copy.
+_HOUR = 3600
+_DAY = 24 * _HOUR
+NEWS_TTL = 15 * 60
+
+_inflight: dict[str, asyncio.Task] = {}  # cache key -> fetch in progress (kept referenced until done)
+
+
+async def _fetch(params: dict) -> dict:
+    """Run a Tavily search (bounded concurrency, per-call timeout) and return a clean result dict."""
+    try:
+        async with _search_slots:
+            resp = _get_client().search(
+                **params,
+                include_answer=True,         # short AI summary of results
+                include_raw_content=False,   # keep payload small
+                include_images=False,
+            )
+            if inspect.isawaitable(resp):
+                resp = await asyncio.wait_for(resp, MARKET_SEARCH_TIMEOUT_SECONDS)
+        # Tavily sends explicit nulls (e.g. no published_date), so coerce rather than default
+        return {
+            "answer": resp.get("answer") or "",
+            "results": [
+                {
+                    "title": r.get("title") or "",
+                    "url": r.get("url") or "",
+                    "published_date": r.get("published_date") or "",
+                    "content": r.get("content") or "",
+                    "score": r.get("score") or 0,
+                }
+                for r in resp.get("results", [])
+            ],
+        }
+    except asyncio.TimeoutError:
+        return {"error": f"search timed out after {MARKET_SEARCH_TIMEOUT_SECONDS}s", "results": []}
+    except Exception as exc:
+        return {"error": str(exc) or type(exc).__name__, "results": []}
+
 
-def _search(
+async def _store(key: str, params: dict) -> dict:
+    result = await _fetch(params)
+    if "error" not in result:
+        get_market_cache().put(key, params, result)
+    return result
+
+
+def _start_fetch(key: str, params: dict) -> asyncio.Task:
+    """The fetch in progress for `key`, starting one if there is none."""
+    task = _inflight.get(key)
+    if task is None:
+        task = _inflight[key] = asyncio.create_task(_store(key, params))
+        task.add_done_callback(lambda t: _finish(key, t))
+    return task
+
+
+def _finish(key: str, task: asyncio.Task) -> None:
+    _inflight.pop(key, None)
+    if not task.cancelled():
+        task.exception()  # mark retrieved so a revalidation nobody awaits is not logged
+
+
+async def _fetch_and_store(key: str, params: dict) -> dict:
+    """Fetch once per key at a time; concurrent callers await the same result.
+
+    The fetch runs in its own task and every caller awaits it through a
+    shield, so a caller that is cancelled does not cancel it for the others.
+    """
+    return await asyncio.shield(_start_fetch(key, params))
+
+
+def _revalidate(key: str, params: dict) -> None:
+    _start_fetch(key, params)
+
+
+def _search_params(
     query: str,
     *,
     topic: str = "finance",
@@ -44,42 +199,159 @@ def _search(
     search_depth: str = "basic",
     max_results: int = 5,
 ) -> dict:
-    """Run a Tavily search and return a clean result dict.
+    """Tavily Search API parameters (also the cache key).
 
-    Parameters map directly to the Tavily Search API:
       topic       – "general" | "news" | "finance"
       time_range  – "day" | "week" | "month" | "year" | None
       search_depth – "basic" | "basic"
     """
+    params: dict = dict(query=query, max_results=max_results, topic=topic, search_depth=search_depth)
+    if time_range:
+        params["time_range"] = time_range
+    return params
+
+
+def _freshness(source: str, age: float, stale: bool, version: int | None = None) -> dict:
+    """Metadata telling the agent where a result came from and how old it is."""
+    meta = {
+        "source": source,  # "snapshot" (prefetched) | "cache" | "live"
+        "fetched_at": datetime.fromtimestamp(time.time() - age).isoformat(timespec="seconds"),
+        "age_seconds": int(age),
+        "stale": stale,
+    }
+    if version is not None:
+        meta["version"] = version
+    return meta
+
+
+async def _search(query: str, *, ttl: int = _HOUR, **search_kwargs) -> dict:
+    """Search via the cache: fresh hit, stale hit (revalidated in background) or live fetch.
+
+    ttl is how many seconds a cached result counts as fresh.
+    """
+    params = _search_params(query, **search_kwargs)
+    key = cache_key(params)
+
+    cached = get_market_cache().get(key)
+    if cached is not None:
+        payload, age = cached
+        stale = age > ttl
+        if stale:
+            _revalidate(key, params)
+        return {**payload, "freshness": _freshness("cache", age, stale)}
+
+    result = await _fetch_and_store(key, params)
+    return {**result, "freshness": _freshness("live", 0, False)}
+
+
+# ---------------------------------------------------------------------------
+# Prefetched snapshots
+# ---------------------------------------------------------------------------
+
+async def _served(kind: str, subject: str, query: str, *, ttl: int, **search_kwargs) -> dict:
+    """Serve from the prefetched snapshot if it is within ttl, else search (cache/live).
+
+    A live result becomes the subject's new snapshot.
+    """
+    store = get_market_snapshot_store()
+    snap = store.latest(kind, subject)
+    if snap is not None and snap["age_seconds"] <= ttl:
+        return {**snap["payload"], "freshness": _freshness("snapshot", snap["age_seconds"], False, snap["version"])}
+
+    result = await _search(query, ttl=ttl, **search_kwargs)
+    if result["freshness"]["source"] == "live" and "error" not in result:
+        payload = {k: v for k, v in result.items() if k != "freshness"}
+        result["freshness"]["version"] = store.put(kind, subject, payload)
+    return result
+
+
+async def _refresh(kind: str, subject: str, query: str, **search_kwargs) -> str:
+    """Fetch one subject live (ignoring TTLs) into the cache and snapshot store."""
+    params = _search_params(query, **search_kwargs)
+    result = await _fetch_and_store(cache_key(params), params)
+    if "error" in result:
+        print(f"[MarketPrefetch] {kind} {subject} failed: {result['error']}", file=sys.stderr)
+        return "failed"
+    store = get_market_snapshot_store()
+    before = store.latest(kind, subject)
+    version = store.put(kind, subject, result)
+    return "changed" if before is None or before["version"] != version else "unchanged"
+
+
+# ---------------------------------------------------------------------------
+# Response shaping (keeps tool output small in the LLM context)
+# ---------------------------------------------------------------------------
+DETAIL_LEVELS = ("compact", "full", "answer")
+DUPLICATE_SIMILARITY = 0.8  # word-set overlap above which two articles count as the same story
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _words(result: dict) -> set[str]:
+    return set(_WORD.findall(f"{result.get('title') or ''} {(result.get('content') or '')[:300]}".lower()))
+
+
+def _dedupe(results: list[dict]) -> list[dict]:
+    """Drop repeated URLs and near-identical articles (syndicated copies), keeping the first."""
+    kept: list[dict] = []
+    seen_urls: set[str] = set()
+    kept_words: list[set[str]] = []
+    for r in results:
+        url = (r.get("url") or "").split("?")[0].rstrip("/").lower()
+        words = _words(r)
+        if url and url in seen_urls:
+            continue
+        if any(len(words & w) / max(1, len(words | w)) >= DUPLICATE_SIMILARITY for w in kept_words):
+            continue
+        seen_urls.add(url)
+        kept_words.append(words)
+        kept.append(r)
+    return kept
+
+
+def _rank_key(result: dict) -> float:
+    """Relevance score boosted for recent articles (worth up to +0.25 when published today)."""
     try:
-        kwargs: dict = dict(
-            query=query,
-            max_results=max_results,
-            topic=topic,
-            search_depth=search_depth,
-            include_answer=True,         # short AI summary of results
-            include_raw_content=False,   # keep payload small
-            include_images=False,
-        )
-        if time_range:
-            kwargs["time_range"] = time_range
+        published = datetime.fromisoformat((result.get("published_date") or "")[:10])
+        age_days = max(0, (datetime.now() - published).days)
+        recency = 0.25 / (1 + age_days / 7)
+    except ValueError:
+        recency = 0.0
+    return float(result.get("score") or 0) + recency
 
-        resp = _tavily.search(**kwargs)
-        return {
-            "answer": resp.get("answer", ""),
-            "results": [
-                {
-                    "title": r.get("title", ""),
-                    "url": r.get("url", ""),
-                    "published_date": r.get("published_date", ""),
-                    "content": r.get("content", ""),
-                    "score": r.get("score", 0),
-                }
-                for r in resp.get("results", [])
-            ],
-        }
-    except Exception as exc:
-        return {"error": str(exc), "results": []}
+
+def _truncate(text: str, limit: int) -> str:
+    return text[:limit].rstrip() + ("…" if len(text) > limit else "")
+
+
+def _shape(result: dict, detail: str = "compact", char_budget: int = MARKET_RESPONSE_CHAR_BUDGET) -> dict:
+    """Dedupe, rank and truncate a search result for the agent, and report its token cost.
+
+    detail:
+      compact – answer + ranked, deduped results with content cut to fit char_budget
+      full    – answer + every result with full content (ranked, deduped)
+      answer  – answer + citations (title, url, date) only
+    """
+    raw_tokens = estimate_tokens(json.dumps(result))
+    if detail not in DETAIL_LEVELS:
+        detail = "compact"
+    results = sorted(_dedupe(result.get("results", [])), key=_rank_key, reverse=True)
+
+    shaped = {k: v for k, v in result.items() if k != "results"}
+    if detail == "answer":
+        shaped["citations"] = [
+            {"title": r.get("title", ""), "url": r.get("url", ""), "published_date": r.get("published_date", "")}
+            for r in results
+        ]
+    elif detail == "compact" and results:
+        per_result = max(200, (char_budget - len(result.get("answer") or "")) // len(results))
+        shaped["results"] = [
+            {**r, "content": _truncate(r.get("content") or "", per_result)}
+            for r in results
+        ]
+    else:
+        shaped["results"] = results
+    shaped["tokens"] = {"response": estimate_tokens(json.dumps(shaped)), "unshaped": raw_tokens}
+    return shaped
 
 
 # ---------------------------------------------------------------------------
@@ -93,6 +365,14 @@ _TIMEFRAME_TO_TIME_RANGE: dict[str, str | None] = {
     "YTD": "year",   # closest native range; query will also state YTD explicitly
 }
 
+_TIMEFRAME_TTLS: dict[str, int] = {
+    "1D":  15 * 60,
+    "1W":  _HOUR,
+    "1M":  6 * _HOUR,
+    "1Y":  _DAY,
+    "YTD": _DAY,
+}
+
 
 # ---------------------------------------------------------------------------
 # MCP Tools
@@ -114,11 +394,22 @@ _INDICATOR_QUERIES: dict[IndicatorType, str] = {
     IndicatorType.state_pension: "{region} new state pension weekly amount {year}",
 }
 
+# Rates move at most at each MPC meeting, CPI is published monthly and the
+# allowances change once a tax year.
+_INDICATOR_TTLS: dict[IndicatorType, int] = {
+    IndicatorType.interest_rate: 6 * _HOUR,
+    IndicatorType.inflation:     _DAY,
+    IndicatorType.cgt_allowance: 7 * _DAY,
+    IndicatorType.isa_allowance: 7 * _DAY,
+    IndicatorType.state_pension: 7 * _DAY,
+}
+
 
 @mcp.tool()
-def get_macro_indicators(
+async def get_macro_indicators(
     indicator_type: str,
     region: str = "UK",
+    detail: str = "compact",
 ) -> dict:
     """Fetch a current macro-economic or regulatory indicator for a given region.
 
@@ -127,9 +418,13 @@ def get_macro_indicators(
             'interest_rate', 'inflation', 'cgt_allowance',
             'isa_allowance', 'state_pension'.
         region: Geographic region/country for the indicator (default: 'UK').
+        detail: 'compact' (default: ranked, deduped, content trimmed),
+            'answer' (summary + citations only, cheapest) or 'full'.
 
     Returns:
-        Dict with 'answer' (AI summary) and 'results' (source articles).
+        Dict with 'answer' (AI summary), 'results' (source articles, or
+        'citations' for detail='answer'), 'freshness' (source, fetched_at,
+        age_seconds, stale) and 'tokens' (estimated size of this response).
     """
     try:
         ind = IndicatorType(indicator_type)
@@ -139,20 +434,75 @@ def get_macro_indicators(
         print("fallback to interest_rate")
         ind = IndicatorType.interest_rate
 
+    return _shape(await _indicator(ind, region), detail)
+
+
+def _indicator_query(ind: IndicatorType, region: str) -> str:
     year = date.today().year
-    template = _INDICATOR_QUERIES[ind]
-    query = template.format(region=region, year=year, year1=year + 1)
-
-    # Macro indicators change infrequently; search within the past year is fine
-    return _search(
-        query,
-        topic="finance",
-        time_range="year",
-        search_depth="basic",
-        max_results=5,
+    return _INDICATOR_QUERIES[ind].format(region=region, year=year, year1=year + 1)
+
+
+# Macro indicators change infrequently; search within the past year is fine
+_INDICATOR_SEARCH = dict(topic="finance", time_range="year", search_depth="basic", max_results=5)
+
+
+async def _indicator(ind: IndicatorType, region: str) -> dict:
+    return await _served(
+        "indicator",
+        f"{ind.value}:{region}",
+        _indicator_query(ind, region),
+        ttl=_INDICATOR_TTLS[ind],
+        **_INDICATOR_SEARCH,
     )
 
 
+SNAPSHOT_SOURCES = 2  # source links kept per indicator in a snapshot
+
+
+@mcp.tool()
+async def get_macro_snapshot(
+    region: str = "UK",
+    indicators: list[str] | None = None,
+) -> dict:
+    """Fetch several macro-economic / regulatory indicators in ONE call.
+
+    Prefer this over calling get_macro_indicators repeatedly, e.g. when a
+    client review needs the base rate, CPI, CGT and ISA allowances and the
+    state pension together. All indicators are fetched concurrently.
+
+    Args:
+        region: Geographic region/country (default: 'UK').
+        indicators: Any of 'interest_rate', 'inflation', 'cgt_allowance',
+            'isa_allowance', 'state_pension'. Defaults to all of them.
+
+    Returns:
+        Dict with 'region' and 'indicators': {name: {'answer', 'sources',
+        'freshness'}} ('error' instead of 'answer' if a lookup failed) and
+        'tokens' (estimated size of this response).
+    """
+    names = list(dict.fromkeys(indicators or [e.value for e in IndicatorType]))
+    valid = {e.value for e in IndicatorType}
+    wanted = [IndicatorType(n) for n in names if n in valid]
+
+    results = await asyncio.gather(*(_indicator(ind, region) for ind in wanted))
+
+    snapshot: dict[str, dict] = {}
+    for ind, result in zip(wanted, results):
+        entry: dict = {"freshness": result.get("freshness", {})}
+        if result.get("error"):
+            entry["error"] = result["error"]
+        else:
+            entry["answer"] = result.get("answer", "")
+            entry["sources"] = _shape(result, "answer")["citations"][:SNAPSHOT_SOURCES]
+        snapshot[ind.value] = entry
+    for name in names:
+        if name not in valid:
+            snapshot[name] = {"error": f"Unknown indicator. Valid: {sorted(valid)}"}
+    payload = {"region": region, "indicators": snapshot}
+    payload["tokens"] = estimate_tokens(json.dumps(payload))
+    return payload
+
+
 # ---------------------------------------------------------------------------
 
 _CATEGORY_PREFIXES: dict[str, str] = {
@@ -174,10 +524,11 @@ def _days_to_time_range(days: int) -> str:
 
 
 @mcp.tool()
-def search_financial_news(
+async def search_financial_news(
     query: str,
     category: str = "general",
     days_back: int = 3,
+    detail: str = "compact",
 ) -> dict:
     """Search for recent financial or regulatory news using Tavily.
 
@@ -187,9 +538,13 @@ def search_financial_news(
         category: Narrow the search context. One of:
             'general', 'tax_legislation', 'fca_regulation', 'equities'.
         days_back: How many days back to search (default: 3).
+        detail: 'compact' (default: ranked, deduped, content trimmed),
+            'answer' (summary + citations only, cheapest) or 'full'.
 
     Returns:
-        Dict with 'answer' (AI summary) and 'results' (source articles).
+        Dict with 'answer' (AI summary), 'results' (source articles, or
+        'citations' for detail='answer'), 'freshness' (source, fetched_at,
+        age_seconds, stale) and 'tokens' (estimated size of this response).
     """
     prefix = _CATEGORY_PREFIXES.get(category, "")
     full_query = f"{prefix} {query}".strip() if prefix else query
@@ -198,21 +553,24 @@ def search_financial_news(
     # Use "news" topic for recency-focused searches, "finance" for regulatory
     topic = "finance" if category in ("tax_legislation", "fca_regulation") else "news"
 
-    return _search(
+    result = await _search(
         full_query,
         topic=topic,
         time_range=time_range,
         search_depth="basic",
         max_results=7,
+        ttl=NEWS_TTL,
     )
+    return _shape(result, detail)
 
 
 # ---------------------------------------------------------------------------
 
 @mcp.tool()
-def get_asset_performance(
+async def get_asset_performance(
     symbol: str,
     timeframe: str = "1M",
+    detail: str = "compact",
 ) -> dict:
     """Get a performance snapshot for an asset, index, or fund via Tavily search.
 
@@ -221,13 +579,26 @@ def get_asset_performance(
             Examples: 'FTSE100', 'S&P500', 'Vanguard LifeStrategy 80'.
         timeframe: Look-back window. One of: '1D', '1W', '1M', '1Y', 'YTD'.
             Defaults to '1M'.
+        detail: 'compact' (default: ranked, deduped, content trimmed),
+            'answer' (summary + citations only, cheapest) or 'full'.
 
     Returns:
-        Dict with 'answer' (AI summary) and 'results' (source articles).
+        Dict with 'answer' (AI summary), 'results' (source articles, or
+        'citations' for detail='answer'), 'freshness' (source, fetched_at,
+        age_seconds, stale) and 'tokens' (estimated size of this response).
     """
     tf = timeframe.upper()
-    time_range = _TIMEFRAME_TO_TIME_RANGE.get(tf, "month")
+    result = await _served(
+        "asset",
+        f"{symbol.strip().upper()}:{tf}",
+        _asset_query(symbol, tf),
+        ttl=_TIMEFRAME_TTLS.get(tf, _HOUR),
+        **_asset_search(tf),
+    )
+    return _shape(result, detail)
+
 
+def _asset_query(symbol: str, tf: str) -> str:
     label_map = {
         "1D":  "daily performance today",
         "1W":  "weekly performance past 7 days",
@@ -236,19 +607,50 @@ def get_asset_performance(
         "YTD": "year to date performance YTD",
     }
     label = label_map.get(tf, "performance")
-    query = f"{symbol} {label} price return"
+    return f"{symbol} {label} price return"
 
-    return _search(
-        query,
-        topic="finance",
-        time_range=time_range,
-        search_depth="basic",
-        max_results=5,
-    )
+
+def _asset_search(tf: str) -> dict:
+    time_range = _TIMEFRAME_TO_TIME_RANGE.get(tf, "month")
+    return dict(topic="finance", time_range=time_range, search_depth="basic", max_results=5)
+
+
+# ---------------------------------------------------------------------------
+# Scheduled prefetch (run by the API's scheduler, not by the MCP server)
+# ---------------------------------------------------------------------------
+
+def _parse_watchlist(watchlist: list[str]) -> list[tuple[str, str]]:
+    """'FTSE100' or 'FTSE100:1D' entries -> (symbol, timeframe); default timeframe 1M."""
+    assets = []
+    for entry in watchlist:
+        symbol, _, tf = entry.partition(":")
+        tf = tf.strip().upper() or "1M"
+        if symbol.strip() and tf in _TIMEFRAME_TO_TIME_RANGE:
+            assets.append((symbol.strip(), tf))
+    return assets
+
+
+async def refresh_snapshots(region: str = "UK", watchlist: list[str] | None = None) -> dict:
+    """Refresh every macro indicator and watchlisted asset into the snapshot store.
+
+    Returns:
+        Counts of 'changed', 'unchanged' and 'failed' subjects.
+    """
+    jobs = [
+        _refresh("indicator", f"{ind.value}:{region}", _indicator_query(ind, region), **_INDICATOR_SEARCH)
+        for ind in IndicatorType
+    ]
+    jobs += [
+        _refresh("asset", f"{symbol.upper()}:{tf}", _asset_query(symbol, tf), **_asset_search(tf))
+        for symbol, tf in _parse_watchlist(watchlist or [])
+    ]
+    outcomes = await asyncio.gather(*jobs)
+    return {k: outcomes.count(k) for k in ("changed", "unchanged", "failed")}
 
 
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    # "stdio" (default, spawned by the agent) or "streamable-http" (separate deployment)
+    mcp.run(transport=sys.argv[1] if len(sys.argv) > 1 else "stdio")
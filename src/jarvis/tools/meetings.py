@@ -0,0 +1,153 @@
+"""
+Advisor calendar (demo data).
+
+Meetings are hardcoded for the demo week. Shared by the API (`/api/meetings`)
+and the heartbeat pre-check, which looks for meetings coming up soon.
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+
+
+def get_demo_meetings() -> List[dict]:
+    """Return hardcoded demo meetings for the current week."""
+    return [
+        {
+            "id": "mtg-001",
+            "client_name": "Gareth Cheeseman",
+            "client_email": "gareth.cheeseman@constructionpm.com",
+            "subject": "Property Purchase & Protection Review",
+            "content": (
+                "Follow-up from Gareth's salary increase confirmation (now £78k). "
+                "He has redirected extra income into house savings as agreed.\n\n"
+                "Agenda:\n"
+                "• Review deposit progress — current savings £45k vs target £40k deposit\n"
+                "• Discuss timeline for property purchase (target Jul 2026)\n"
+                "• Urgent: Will update needed post-divorce — currently leaving estate to ex-spouse Claire\n"
+                "• Income protection — still unprotected during peak financial responsibility years\n"
+                "• Jack's ongoing therapy costs and custody arrangement impact on budget"
+            ),
+            "date": "2026-02-27",
+            "start_time": "09:00",
+            "end_time": "10:00",
+        },
+        {
+            "id": "mtg-002",
+            "client_name": "Brian Potter",
+            "client_email": "brian.potter47@gmail.com",
+            "subject": "Downsizing Options & Gifting Strategy for Sarah",
+            "content": (
+                "Follow-up from our earlier call about supporting daughter Sarah. "
+                "Brian was emotional — this needs a sensitive approach.\n\n"
+                "Agenda:\n"
+                "• Walk through the £30k gift option for Sarah with transparency plan for Andrew\n"
+                "• Review downsizing options — potential £150k equity release from Willow Close\n"
+                "• Margaret's inherited ISA (£47k) — spousal transfer still pending\n"
+                "• Excess cash position (£115k across savings/premium bonds) — discuss investment\n"
+                "• Check in on Brian's wellbeing — bereavement support, loneliness concerns"
+            ),
+            "date": "2026-02-27",
+            "start_time": "14:00",
+            "end_time": "15:00",
+        },
+        {
+            "id": "mtg-003",
+            "client_name": "Hyacinth Bucket",
+            "client_email": "hyacinth.bucket@talktalk.net",
+            "subject": "Sheridan Financial Support & LPA Planning",
+            "content": (
+                "Follow-up from Hyacinth's urgent email about Sheridan needing financial assistance again. "
+                "Historic £25k already unrepaid.\n\n"
+                "Agenda:\n"
+                "• Discuss boundaries for Sheridan support — unbounded goal is depleting savings\n"
+                "• Critical: LPAs and will update for both Hyacinth (73) and Richard (75) — neither in place\n"
+                "• Savings runway risk — depletion projected early 2030s without changes\n"
+                "• Richard's private pension drawdown (£45k remaining) — withdrawal strategy\n"
+                "• Car replacement goal — recommended budget £18k vs Hyacinth's £35k aspiration"
+            ),
+            "date": "2026-02-28",
+            "start_time": "10:00",
+            "end_time": "11:00",
+        },
+        {
+            "id": "mtg-004",
+            "client_name": "Robert Hughes",
+            "client_email": "robert.hughes@rghlegal.com",
+            "subject": "BTL Refinancing & Pre-Retirement Strategy",
+            "content": (
+                "Follow-up from the BTL rate update email. "
+                "Guildford property rate expired Aug 2025 — refinancing overdue.\n\n"
+                "Agenda:\n"
+                "• Review latest refinancing rates for Guildford BTL (current mortgage £85k)\n"
+                "• Recommendation: Sell Guildford BTL post-refinance — after-tax return weak vs alternatives\n"
+                "• Partnership exit planning — £280k buyout over 4 years (£70k/year)\n"
+                "• IHT exposure estimated ~£580k — LPAs, updated wills, gifting strategy needed\n"
+                "• Tom's house deposit gift (£75k) — timing and tax implications\n"
+                "• Charles Stanley managed portfolio fee drag — £2,720/year, worth reviewing"
+            ),
+            "date": "2026-03-02",
+            "start_time": "11:00",
+            "end_time": "12:00",
+        },
+        {
+            "id": "mtg-005",
+            "client_name": "Rodney & Cassandra Trotter",
+            "client_email": "cass.trotter@citybank.co.uk",
+            "subject": "House Purchase Deposit & Debt Clearance Plan",
+            "content": (
+                "Follow-up from Cassandra's email expressing frustration about housing delays. "
+                "She wants to see 'real progress this year'.\n\n"
+                "Agenda:\n"
+                "• Deposit position — current savings £38k joint + ISAs vs £50k target\n"
+                "• Director's loan (£12k overdrawn) — declare dividend to clear and avoid S455 tax\n"
+                "• Personal loan at 9.8% interest — prioritise clearing £8k balance\n"
+                "• Rodney's salary restructure — increase to £60k for mortgage strength\n"
+                "• Income protection — Rodney self-employed with two dependants, currently unprotected\n"
+                "• Relationship check-in — financial stress driving marital tension"
+            ),
+            "date": "2026-03-03",
+            "start_time": "15:00",
+            "end_time": "16:00",
+        },
+        {
+            "id": "mtg-006",
+            "client_name": "Basil Fawlty",
+            "client_email": "basil@fawltytowers.co.uk",
+            "subject": "Hotel Exit Strategy & Valuation Discussion",
+            "content": (
+                "Follow-up from Basil's email rejecting the £1.45m valuation as 'unrealistic'. "
+                "He remains emotionally attached to the hotel. Sybil wants to proceed with a sale.\n\n"
+                "Agenda:\n"
+                "• Address Basil's valuation expectations — agent estimates £1.2m–£1.3m range\n"
+                "• CGT planning — estimated gain £925k, BADR tax ~£92.5k\n"
+                "• Lease-back option as compromise — potential income £48k/year\n"
+                "• Retirement income modelling — £65k/year target from pensions + investments\n"
+                "• Mediterranean relocation plans — budget £120k for overseas property\n"
+                "• Manage Basil/Sybil dynamic — need aligned decision before proceeding"
+            ),
+            "date": "2026-03-04",
+            "start_time": "09:30",
+            "end_time": "10:30",
+        },
+    ]
+
+
+def meeting_start(meeting: dict) -> datetime:
+    """Parse a meeting's date + start_time into a datetime."""
+    return datetime.strptime(f"{meeting['date']} {meeting['start_time']}", "%Y-%m-%d %H:%M")
+
+
+def meeting_client_folder(meeting: dict, client_folders) -> str:
+    """Match a meeting's client name (e.g. 'Rodney & Cassandra Trotter') to a client folder."""
+    words = set(meeting["client_name"].lower().replace("&", " ").split())
+    for folder in client_folders:
+        if set(folder.split("_")) <= words:
+            return folder
+    return meeting["client_name"].strip().lower().replace(" ", "_")
+
+
+def get_meetings_due(now: datetime, within_hours: int) -> List[dict]:
+    """Meetings starting between `now` and `now + within_hours`, soonest first."""
+    horizon = now + timedelta(hours=within_hours)
+    due = [m for m in get_demo_meetings() if now <= meeting_start(m) <= horizon]
+    return sorted(due, key=meeting_start)
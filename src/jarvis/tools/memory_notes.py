@@ -0,0 +1,35 @@
+"""
+Memory notes tool: returns the advisor's memory notes for the clients in play
+from the memory index, instead of reading every workspace/memory/*.md file.
+"""
+from typing import List
+
+from langchain_core.tools import tool
+
+from jarvis.utils.context_packs import resolve_client_folder
+from jarvis.utils.memory_index import get_memory_index
+
+
+@tool
+def get_memory_notes(client_names: List[str], since: str = "", include_general: bool = False) -> str:
+    """Get the advisor's memory notes about specific clients, grouped by client and dated.
+
+    Memory notes are the remembered facts, preferences and follow-ups from
+    the daily memory files (memory/YYYY-MM-DD.md). Use this instead of reading
+    the memory files: it returns only the notes about the clients you name.
+
+    Args:
+        client_names: Client names (e.g. ['David Chen']) or folders (e.g. ['david_chen']).
+            Pass an empty list with include_general=True for the general notes only.
+        since: Only notes dated on or after this date (YYYY-MM-DD). Empty for all.
+        include_general: Also return notes not about any client (advisor preferences, house rules).
+    """
+    folders = {resolve_client_folder(name): name for name in client_names}
+    notes = get_memory_index().notes_for(folders, since=since or None, include_general=include_general)
+
+    sections = []
+    for folder, client_notes in notes.items():
+        title = "General notes" if folder == "general" else f"{folders[folder]} ({folder})"
+        lines = [f"- [{n['date']}] {n['text']}" for n in client_notes] or ["- (no memory notes)"]
+        sections.append(f"## {title}\n" + "\n".join(lines))
+    return "\n\n".join(sections) or "No clients given."
@@ -1,36 +1,273 @@
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+"""
+Cron scheduler for Jarvis.
+
+Jobs live in a SQLite job store (DATA_DIR/scheduler.sqlite) so user-created
+cron tasks survive restarts. The scheduler runs on the asyncio event loop it is
+started from (the FastAPI loop in the API process) and executes each task with
+`agent.ainvoke`, which the async-only MCP tools require. Every run's duration
+and outcome is recorded in the `cron_runs` table of the same database.
+"""
+import asyncio
+import time
+import uuid
 from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional
+
+from apscheduler.triggers.cron import CronTrigger
 from langchain_core.tools import tool
-from typing import Dict
-import time
-import requests
 
-# Global scheduler instance
-scheduler = BackgroundScheduler()
-scheduler.start()
+from jarvis.config import (
+    SCHEDULER_DB_PATH,
+    CRON_MAX_CONCURRENT_RUNS,
+    CRON_MISFIRE_GRACE_SECONDS,
+    CRON_STORE_POLL_SECONDS,
+    MARKET_PREFETCH_MINUTES,
+    MARKET_PREFETCH_REGION,
+    MARKET_WATCHLIST,
+)
+from jarvis.utils.db import transaction
+from jarvis.utils.event_bus import NOTIFICATION, get_event_bus
+
+
+# ---------------------------------------------------------------------------
+# Scheduler + run history storage
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=1)
+def get_scheduler():
+    """
+    The process-wide scheduler, built on first use (started via start_scheduler()).
+
+    Building it opens the SQLAlchemy job store, so it is deferred until a
+    process actually schedules or lists jobs rather than done at import.
+    """
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    from apscheduler.executors.asyncio import AsyncIOExecutor
+    from apscheduler.jobstores.memory import MemoryJobStore
+    from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+
+    _init_db()
+    return AsyncIOScheduler(
+        jobstores={
+            "default": SQLAlchemyJobStore(url=f"sqlite:///{SCHEDULER_DB_PATH}"),
+            # Internal, non-persistent jobs (job store polling)
+            "internal": MemoryJobStore(),
+        },
+        executors={"default": AsyncIOExecutor()},
+        job_defaults={
+            "coalesce": True,  # collapse a backlog of missed runs into one
+            "max_instances": 1,  # never overlap runs of the same task
+            "misfire_grace_time": CRON_MISFIRE_GRACE_SECONDS,
+        },
+    )
+
+
+def __getattr__(name):
+    # `scheduler` used to be built at import; keep it importable
+    if name == "scheduler":
+        return get_scheduler()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Limits concurrently executing cron tasks across all jobs (created on the scheduler's loop)
+_run_semaphore: Optional[asyncio.Semaphore] = None
+
+
+@lru_cache(maxsize=1)
+def _init_db():
+    SCHEDULER_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with transaction(SCHEDULER_DB_PATH) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS cron_tasks (
+                name        TEXT PRIMARY KEY,
+                cron        TEXT NOT NULL,
+                description TEXT NOT NULL,
+                created_at  TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS cron_runs (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id      TEXT NOT NULL,
+                started_at  TEXT NOT NULL,
+                finished_at TEXT NOT NULL,
+                duration_ms INTEGER NOT NULL,
+                status      TEXT NOT NULL,
+                error       TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_cron_runs_job ON cron_runs (job_id, started_at);
+            """
+        )
+
+
+def _connect():
+    """Transaction on the run history / task metadata tables (created on first use)."""
+    _init_db()
+    return transaction(SCHEDULER_DB_PATH)
+
+
+
+def _save_task_meta(name: str, cron: str, description: str):
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO cron_tasks (name, cron, description, created_at) VALUES (?, ?, ?, ?)",
+            (name, cron, description, datetime.now().isoformat()),
+        )
+
+
+def _delete_task_meta(name: str):
+    with _connect() as conn:
+        conn.execute("DELETE FROM cron_tasks WHERE name = ?", (name,))
+
+
+def _load_task_meta() -> Dict[str, dict]:
+    with _connect() as conn:
+        rows = conn.execute("SELECT name, cron, description, created_at FROM cron_tasks").fetchall()
+    return {row["name"]: dict(row) for row in rows}
+
+
+def _record_run(job_id: str, started_at: datetime, duration_ms: int, status: str, error: Optional[str] = None):
+    with _connect() as conn:
+        conn.execute(
+            "INSERT INTO cron_runs (job_id, started_at, finished_at, duration_ms, status, error) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, started_at.isoformat(), datetime.now().isoformat(), duration_ms, status, error),
+        )
+
+
+def _recent_runs(conn, job_id: str, limit: int) -> list:
+    rows = conn.execute(
+        "SELECT started_at, finished_at, duration_ms, status, error FROM cron_runs "
+        "WHERE job_id = ? ORDER BY id DESC LIMIT ?",
+        (job_id, limit),
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def get_recent_runs(job_id: str, limit: int = 5) -> list:
+    """Most recent runs of a job (newest first) with duration and outcome."""
+    with _connect() as conn:
+        return _recent_runs(conn, job_id, limit)
+
+
+def _poll_job_store():
+    """No-op job: waking the scheduler makes it pick up jobs added by other processes."""
+
 
-# Store task descriptions for display
-task_descriptions: Dict[str, dict] = {}
+async def _prefetch_market_data():
+    """Refresh market snapshots so Market Feed tools answer without a live search."""
+    # Imported lazily: the MCP server module is only needed when the job runs
+    from jarvis.tools.market_feed_server import refresh_snapshots
+
+    started = time.monotonic()
+    counts = await refresh_snapshots(MARKET_PREFETCH_REGION, MARKET_WATCHLIST)
+    print(f"[Scheduler] Market prefetch in {time.monotonic() - started:.1f}s: {counts}")
+
+
+def start_scheduler(paused: bool = False):
+    """
+    Start the scheduler on the running event loop.
+
+    The API process starts it normally and executes jobs. Other processes that
+    expose the cron tools (Telegram bot, standalone heartbeat) start it paused:
+    jobs they add are persisted to the shared store, and the API picks them up
+    on its next poll instead of running them twice.
+    """
+    scheduler = get_scheduler()
+    if scheduler.running:
+        return
+    scheduler.start(paused=paused)
+    if not paused:
+        scheduler.add_job(
+            _poll_job_store,
+            trigger="interval",
+            seconds=CRON_STORE_POLL_SECONDS,
+            id="_poll_job_store",
+            jobstore="internal",
+            replace_existing=True,
+        )
+        if MARKET_PREFETCH_MINUTES > 0:
+            scheduler.add_job(
+                _prefetch_market_data,
+                trigger="interval",
+                minutes=MARKET_PREFETCH_MINUTES,
+                next_run_time=datetime.now(),  # warm the snapshots at startup
+                id="_prefetch_market_data",
+                jobstore="internal",
+                replace_existing=True,
+            )
+    print(f"[Scheduler] Cron scheduler started{' (paused)' if paused else ''}: {SCHEDULER_DB_PATH}")
+
+
+def shutdown_scheduler():
+    scheduler = get_scheduler()
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+
+
+def _cron_trigger(cron: str) -> CronTrigger:
+    minute, hour, day, month, day_of_week = cron.split()
+    return CronTrigger(
+        minute=minute,
+        hour=hour,
+        day=day,
+        month=month,
+        day_of_week=day_of_week
+    )
+
+
+async def run_cron_task(name: str, task_description: str):
+    """
+    Execute a scheduled task with Jarvis (module-level so the persistent job store
+    can reference it). Runs on the scheduler's event loop via `ainvoke`.
+    """
+    global _run_semaphore
+    if _run_semaphore is None:
+        _run_semaphore = asyncio.Semaphore(CRON_MAX_CONCURRENT_RUNS)
+
+    async with _run_semaphore:
+        started_at = datetime.now()
+        started = time.perf_counter()
+        print(f"\n[{started_at.strftime('%Y-%m-%d %H:%M:%S')}] [Cron: {name}] Triggering scheduled task...")
+        status, error = "ok", None
+
+        try:
+            # Import here to avoid circular imports
+            from jarvis.deepagent import create_jarvis_agent
+            from jarvis.config import NO_REPLY_TOKEN
+
+            # Create agent and invoke with the task description
+            agent = create_jarvis_agent(model="openai:gpt-5-nano")
+            result = await agent.ainvoke(
+                {"messages": [{"role": "user", "content": task_description}]},
+                config={"configurable": {"thread_id": f"cron_{name}_{uuid.uuid4()}"}},
+            )
+            response = result["messages"][-1].content
+
+            # Handle response - if not NO_REPLY, send notification
+            if NO_REPLY_TOKEN not in response:
+                print(f"[Cron: {name}]: {response}")
+                send_notification(
+                    title=f"📅 Scheduled Task: {name}",
+                    message=response,
+                    notification_type="action",
+                )
+                status = "notified"
+            else:
+                print(f"[Cron: {name}]: Task completed - no notification needed")
+                status = "no_reply"
+
+        except Exception as e:
+            print(f"[Cron: {name}] Error executing task: {e}")
+            status, error = "error", str(e)
+
+        finally:
+            duration_ms = int((time.perf_counter() - started) * 1000)
+            await asyncio.to_thread(_record_run, name, started_at, duration_ms, status, error)
 
 
 def seed_demo_jobs():
     """Seed demo cron jobs for dashboard display."""
-    # Clear existing demo jobs first to prevent conflicts
-    demo_job_names = [
-        "birthday_alan_partridge",
-        "birthday_antony_makepeace", 
-        "tax_reminder_alan",
-        "tax_reminder_antony",
-        "tax_reminder_basil"
-    ]
-    
-    for job_name in demo_job_names:
-        if scheduler.get_job(job_name):
-            scheduler.remove_job(job_name)
-        if job_name in task_descriptions:
-            del task_descriptions[job_name]
-    
     demo_jobs = [
         # Birthday reminders
         {
@@ -62,73 +299,27 @@ def seed_demo_jobs():
     ]
     
     for job in demo_jobs:
-        # Only add to task_descriptions for display, skip actual scheduler
-        # (to avoid circular import issues at module load time)
-        task_descriptions[job["name"]] = {
-            "cron": job["cron"],
-            "description": job["description"],
-            "created_at": datetime.now().isoformat()
-        }
-        
-        # Parse cron for scheduler
-        cron_parts = job["cron"].split()
-        minute, hour, day, month, day_of_week = cron_parts
-        
-        # Create a simple task function (actual Jarvis invocation happens in add_cron_job)
-        def create_task(job_name, job_desc):
-            def task():
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                print(f"\n[{timestamp}] [Cron: {job_name}] Triggering scheduled task...")
-                try:
-                    from jarvis.deepagent import create_jarvis_agent
-                    from jarvis.config import NO_REPLY_TOKEN
-                    agent = create_jarvis_agent(model="openai:gpt-5-nano")
-                    result = agent.invoke({"messages": [{"role": "user", "content": job_desc}]})
-                    response = result["messages"][-1].content
-                    if NO_REPLY_TOKEN not in response:
-                        send_notification(f"📅 {job_name}", response, "action")
-                except Exception as e:
-                    print(f"[Cron: {job_name}] Error: {e}")
-            return task
-        
-        scheduler.add_job(
-            func=create_task(job["name"], job["description"]),
-            trigger=CronTrigger(
-                minute=minute,
-                hour=hour,
-                day=day,
-                month=month,
-                day_of_week=day_of_week
-            ),
+        _save_task_meta(job["name"], job["cron"], job["description"])
+        # replace_existing keeps re-seeding idempotent against the persistent store
+        get_scheduler().add_job(
+            run_cron_task,
+            trigger=_cron_trigger(job["cron"]),
+            kwargs={"name": job["name"], "task_description": job["description"]},
             id=job["name"],
-            name=job["name"]
+            name=job["name"],
+            replace_existing=True,
         )
     
     print(f"[Scheduler] Seeded {len(demo_jobs)} demo cron jobs")
 
 
-# API endpoint for notifications
-API_BASE_URL = "http://localhost:8000"
-
-
 def send_notification(title: str, message: str, notification_type: str = "action"):
-    """Send a notification to the API for the frontend dashboard."""
-    try:
-        response = requests.post(
-            f"{API_BASE_URL}/api/notifications",
-            json={
-                "type": notification_type,
-                "title": title,
-                "message": message
-            },
-            timeout=5
-        )
-        if response.ok:
-            print(f"[Scheduler]: Notification sent to dashboard")
-        else:
-            print(f"[Scheduler]: Failed to send notification: {response.status_code}")
-    except requests.exceptions.RequestException as e:
-        print(f"[Scheduler]: Could not reach API: {e}")
+    """Send a notification to the frontend dashboard via the event bus."""
+    get_event_bus().publish(
+        NOTIFICATION,
+        {"notification_type": notification_type, "title": title, "message": message},
+    )
+    print(f"[Scheduler]: Notification sent to dashboard")
 
 
 @tool
@@ -153,7 +344,7 @@ def add_cron_job(name: str, cron: str, task_description: str) -> str:
     """
     try:
         # Check if job with same name already exists
-        existing_job = scheduler.get_job(name)
+        existing_job = get_scheduler().get_job(name)
         if existing_job:
             return f"Error: Job '{name}' already exists. Remove it first or use a different name."
         
@@ -162,57 +353,17 @@ def add_cron_job(name: str, cron: str, task_description: str) -> str:
         if len(cron_parts) != 5:
             return f"Error: Invalid cron format. Expected 5 fields (minute hour day month day_of_week), got {len(cron_parts)}. Example: '0 9 * * *'"
         
-        minute, hour, day, month, day_of_week = cron_parts
-        
-        # Create the task function that invokes Jarvis
-        def task():
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print(f"\n[{timestamp}] [Cron: {name}] Triggering scheduled task...")
-            
-            try:
-                # Import here to avoid circular imports
-                from jarvis.deepagent import create_jarvis_agent
-                from jarvis.config import NO_REPLY_TOKEN
-                
-                # Create agent and invoke with the task description
-                agent = create_jarvis_agent(model="openai:gpt-5-nano")
-                result = agent.invoke({"messages": [{"role": "user", "content": task_description}]})
-                response = result["messages"][-1].content
-                
-                # Handle response - if not NO_REPLY, send notification
-                if NO_REPLY_TOKEN not in response:
-                    print(f"[Cron: {name}]: {response}")
-                    send_notification(
-                        title=f"📅 Scheduled Task: {name}",
-                        message=response,
-                        notification_type="action"
-                    )
-                else:
-                    print(f"[Cron: {name}]: Task completed - no notification needed")
-                    
-            except Exception as e:
-                print(f"[Cron: {name}] Error executing task: {e}")
-        
-        # Add job to scheduler
-        scheduler.add_job(
-            func=task,
-            trigger=CronTrigger(
-                minute=minute,
-                hour=hour,
-                day=day,
-                month=month,
-                day_of_week=day_of_week
-            ),
+        # Add job to the persistent store; run_cron_task invokes Jarvis when it fires
+        get_scheduler().add_job(
+            run_cron_task,
+            trigger=_cron_trigger(cron),
+            kwargs={"name": name, "task_description": task_description},
             id=name,
             name=name
         )
         
         # Store task description for API retrieval
-        task_descriptions[name] = {
-            "cron": cron,
-            "description": task_description,
-            "created_at": datetime.now().isoformat()
-        }
+        _save_task_meta(name, cron, task_description)
         
         return f"Success: Job '{name}' added with schedule '{cron}'. Description: '{task_description}'"
         
@@ -235,14 +386,13 @@ def remove_cron_job(name: str) -> str:
         remove_cron_job("morning_report")
     """
     try:
-        job = scheduler.get_job(name)
+        job = get_scheduler().get_job(name)
         if not job:
             return f"Error: Job '{name}' not found. Use list_cron_jobs to see available jobs."
         
-        scheduler.remove_job(name)
+        get_scheduler().remove_job(name)
         # Clean up stored description
-        if name in task_descriptions:
-            del task_descriptions[name]
+        _delete_task_meta(name)
         return f"Success: Job '{name}' has been removed."
         
     except Exception as e:
@@ -262,7 +412,7 @@ def list_cron_jobs() -> str:
         list_cron_jobs()
     """
     try:
-        jobs = scheduler.get_jobs()
+        jobs = get_scheduler().get_jobs(jobstore="default")
         
         if not jobs:
             return "No scheduled jobs found."
@@ -301,7 +451,7 @@ def get_cron_job_info(name: str) -> str:
         get_cron_job_info("morning_report")
     """
     try:
-        job = scheduler.get_job(name)
+        job = get_scheduler().get_job(name)
         if not job:
             return f"Error: Job '{name}' not found. Use list_cron_jobs to see available jobs."
         
@@ -310,6 +460,8 @@ def get_cron_job_info(name: str) -> str:
         output.append(f"Schedule: {job.trigger}")
         output.append(f"Next Run Time: {job.next_run_time}")
         output.append(f"Pending: {job.pending}")
+        for run in get_recent_runs(name, limit=3):
+            output.append(f"Run: {run['started_at']} - {run['status']} ({run['duration_ms']} ms)")
         
         return "\n".join(output)
         
@@ -319,23 +471,27 @@ def get_cron_job_info(name: str) -> str:
 
 def get_all_scheduled_jobs() -> list:
     """
-    Get all scheduled jobs with their details for API consumption.
-    Returns a list of dictionaries with job info.
+    Get all scheduled jobs with their details for API consumption (blocking).
+    Returns a list of dictionaries with job info, including recent run history.
     """
-    jobs = scheduler.get_jobs()
+    jobs = get_scheduler().get_jobs(jobstore="default")
+    task_meta = _load_task_meta()
     result = []
-    
-    for job in jobs:
-        job_info = {
-            "id": job.id,
-            "name": job.name,
-            "next_run": job.next_run_time.isoformat() if job.next_run_time else None,
-            "trigger": str(job.trigger),
-            "description": task_descriptions.get(job.id, {}).get("description", ""),
-            "cron": task_descriptions.get(job.id, {}).get("cron", ""),
-        }
-        result.append(job_info)
-    
+
+    # One connection for every job's run history
+    with _connect() as conn:
+        for job in jobs:
+            job_info = {
+                "id": job.id,
+                "name": job.name,
+                "next_run": job.next_run_time.isoformat() if getattr(job, "next_run_time", None) else None,
+                "trigger": str(job.trigger),
+                "description": task_meta.get(job.id, {}).get("description", ""),
+                "cron": task_meta.get(job.id, {}).get("cron", ""),
+                "recent_runs": _recent_runs(conn, job.id, 5),
+            }
+            result.append(job_info)
+
     return result
 
 
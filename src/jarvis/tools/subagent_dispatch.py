@@ -0,0 +1,152 @@
+"""
+Sub-agent dispatch tool: runs several independent Atlas / Emma / Colin tasks
+concurrently instead of delegating them one at a time.
+
+Each task runs on the sub-agent's shared graph (no checkpointer, so runs are
+independent), bounded by a concurrency cap and a per-task timeout. Every
+result carries its own latency, token usage and estimated cost, so a slow or
+expensive lookup is attributable to the task that caused it.
+"""
+import asyncio
+import json
+import time
+from typing import List, Literal, Optional
+
+from langchain_core.tools import tool
+from pydantic import BaseModel, Field
+
+from jarvis.config import (
+    SUBAGENT_DISPATCH_MAX_CONCURRENCY,
+    SUBAGENT_DISPATCH_TIMEOUT_SECONDS,
+)
+from jarvis.sub_agents.atlas import get_atlas_agent
+from jarvis.sub_agents.colin import get_colin_agent
+from jarvis.sub_agents.emma import get_emma_agent
+
+_SUBAGENTS = {
+    "atlas": get_atlas_agent,
+    "emma": get_emma_agent,
+    "colin": get_colin_agent,
+}
+
+# USD per million (input, output) tokens, matched by model name prefix
+MODEL_PRICES = {
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-5-nano": (0.05, 0.40),
+    "gpt-5-mini": (0.25, 2.00),
+    "gpt-5": (1.25, 10.00),
+}
+
+
+class SubagentTask(BaseModel):
+    subagent: Literal["atlas", "emma", "colin"] = Field(description="Sub-agent to run the task")
+    task: str = Field(description="Self-contained instruction for the sub-agent")
+
+
+def _model_price(model_name: str) -> Optional[tuple]:
+    matches = [prefix for prefix in MODEL_PRICES if model_name.startswith(prefix)]
+    return MODEL_PRICES[max(matches, key=len)] if matches else None
+
+
+def _usage(messages: list) -> dict:
+    """Token usage summed over a run's AI messages, with the estimated cost in USD."""
+    usage = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0, "cost_usd": 0.0}
+    priced = True
+    for msg in messages:
+        metadata = getattr(msg, "usage_metadata", None)
+        if not metadata:
+            continue
+        for key in ("input_tokens", "output_tokens", "total_tokens"):
+            usage[key] += metadata.get(key, 0)
+        price = _model_price((getattr(msg, "response_metadata", None) or {}).get("model_name", ""))
+        if price is None:
+            priced = False
+            continue
+        usage["cost_usd"] += (metadata.get("input_tokens", 0) * price[0]
+                              + metadata.get("output_tokens", 0) * price[1]) / 1_000_000
+    usage["cost_usd"] = round(usage["cost_usd"], 6) if priced else None
+    return usage
+
+
+async def _run_task(index: int, item: SubagentTask, semaphore: asyncio.Semaphore, timeout: float) -> dict:
+    async with semaphore:
+        started = time.perf_counter()
+        # Usage of a run that timed out or failed is not reported by the model
+        usage = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0, "cost_usd": None}
+        try:
+            result = await asyncio.wait_for(
+                _SUBAGENTS[item.subagent]().ainvoke({"messages": [{"role": "user", "content": item.task}]}),
+                timeout=timeout,
+            )
+            status, response = "ok", result["messages"][-1].content
+            usage = _usage(result["messages"])
+        except asyncio.TimeoutError:
+            status, response = "timeout", f"No answer within {timeout:.0f}s"
+        except Exception as e:
+            status, response = "error", str(e)
+        latency_ms = int((time.perf_counter() - started) * 1000)
+
+    print(f"[Dispatch] #{index} {item.subagent}: {status} in {latency_ms} ms, "
+          f"{usage['total_tokens']} tokens")
+    return {
+        "index": index,
+        "subagent": item.subagent,
+        "task": item.task,
+        "status": status,
+        "response": response,
+        "latency_ms": latency_ms,
+        **usage,
+    }
+
+
+@tool
+async def dispatch_subagents(
+    tasks: List[SubagentTask],
+    max_concurrency: int = SUBAGENT_DISPATCH_MAX_CONCURRENCY,
+    timeout_seconds: int = SUBAGENT_DISPATCH_TIMEOUT_SECONDS,
+) -> str:
+    """Run several independent sub-agent tasks at the same time and collect every answer.
+
+    Use this instead of delegating to Atlas (or Colin / Emma) one task at a
+    time whenever the tasks do not depend on each other, e.g. one Atlas
+    lookup per changed client, or one Colin check per drafted recommendation.
+    Each task must be self-contained: sub-agents do not see this conversation
+    or each other's answers. Run dependent steps (Atlas's answer -> Colin)
+    as a second dispatch.
+
+    Args:
+        tasks: List of {"subagent": "atlas" | "emma" | "colin", "task": "..."}.
+        max_concurrency: How many tasks run at once (capped by configuration).
+        timeout_seconds: Per-task time limit; a task that runs over is reported as a timeout.
+
+    Returns:
+        JSON with one result per task (in input order) including status,
+        response, latency_ms, token usage and cost_usd, plus totals.
+    """
+    if not tasks:
+        return json.dumps({"results": [], "error": "No tasks given."})
+    tasks = [t if isinstance(t, SubagentTask) else SubagentTask.model_validate(t) for t in tasks]
+    concurrency = max(1, min(max_concurrency, SUBAGENT_DISPATCH_MAX_CONCURRENCY))
+    timeout = max(1, min(timeout_seconds, SUBAGENT_DISPATCH_TIMEOUT_SECONDS))
+
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(*(
+        _run_task(i, item, semaphore, timeout) for i, item in enumerate(tasks)
+    ))
+    wall_ms = int((time.perf_counter() - started) * 1000)
+
+    costs = [r["cost_usd"] for r in results if r["status"] == "ok"]
+    totals = {
+        "tasks": len(results),
+        "failed": sum(r["status"] != "ok" for r in results),
+        "wall_ms": wall_ms,
+        "sum_latency_ms": sum(r["latency_ms"] for r in results),
+        "total_tokens": sum(r["total_tokens"] for r in results),
+        "cost_usd": round(sum(costs), 6) if None not in costs else None,
+    }
+    print(f"[Dispatch] {totals['tasks']} task(s) in {wall_ms} ms "
+          f"(sequential would be ~{totals['sum_latency_ms']} ms), {totals['total_tokens']} tokens")
+    return json.dumps({"results": results, "totals": totals}, indent=1, default=str)
@@ -4,18 +4,146 @@ Implements the Sandwich Architecture: STT -> Agent -> TTS.
 """
 import asyncio
 import io
-from typing import AsyncIterator
-from openai import AsyncOpenAI
-import websockets
-from pydub import AudioSegment
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator, Optional
 import json
 
 from jarvis.tools.events import VoiceAgentEvent
 from jarvis.config import OPENAI_API_KEY
 from jarvis.deepagent import create_jarvis_agent
 
-# Initialize OpenAI Client
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+@lru_cache(maxsize=1)
+def get_openai_client():
+    """OpenAI client, created on the first voice session rather than at import."""
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+
+# ---------------------------------------------------------------------------
+# Per-session latency metrics
+# ---------------------------------------------------------------------------
+
+# Histogram bucket upper bounds in milliseconds (last bucket catches the rest)
+LATENCY_BUCKETS_MS = [100, 250, 500, 1000, 2000, 5000, 10000]
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float):
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def snapshot(self) -> dict:
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "max_ms": round(self.max_ms, 1) if self.count else None,
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class VoiceSessionMetrics:
+    """Latency and queue statistics for a single voice WebSocket session.
+
+    Stages:
+        stt              – Whisper round-trip for one accumulated audio window
+        first_agent_token – final transcript -> first streamed agent token
+        first_tts_byte   – sentence submitted to TTS -> first audio bytes back
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.started_at = datetime.now().isoformat()
+        self.ended_at: Optional[str] = None
+        self.stt = LatencyHistogram()
+        self.first_agent_token = LatencyHistogram()
+        self.first_tts_byte = LatencyHistogram()
+        self.audio_chunks_received = 0
+        self.audio_chunks_dropped = 0
+        self.overloaded = False  # closed because inbound audio outran the pipeline
+        self.events_sent = 0
+
+    def close(self):
+        self.ended_at = datetime.now().isoformat()
+
+    def snapshot(self) -> dict:
+        return {
+            "session_id": self.session_id,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "audio_chunks_received": self.audio_chunks_received,
+            "audio_chunks_dropped": self.audio_chunks_dropped,
+            "overloaded": self.overloaded,
+            "events_sent": self.events_sent,
+            "latency": {
+                "stt": self.stt.snapshot(),
+                "first_agent_token": self.first_agent_token.snapshot(),
+                "first_tts_byte": self.first_tts_byte.snapshot(),
+            },
+        }
+
+
+def _elapsed_ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+# ---------------------------------------------------------------------------
+# Queue helpers (WebSocket reader/writer <-> pipeline)
+# ---------------------------------------------------------------------------
+
+VOICE_OVERLOAD_MESSAGE = (
+    "Voice session closed: audio is arriving faster than it can be processed. Please reconnect."
+)
+
+
+def enqueue_audio(
+    queue: asyncio.Queue,
+    chunk: bytes,
+    metrics: Optional[VoiceSessionMetrics] = None,
+) -> bool:
+    """Put an inbound audio chunk on a bounded queue without ever blocking.
+
+    Returns False (and counts the chunk as dropped) when the queue is full.
+    Chunks are never discarded to make room: the client sends raw PCM with
+    no utterance boundaries, so dropping any chunk splices unrelated speech
+    into one STT window. A full queue means the session is overloaded and
+    the caller closes it with ``VOICE_OVERLOAD_MESSAGE``.
+    """
+    try:
+        queue.put_nowait(chunk)
+    except asyncio.QueueFull:
+        if metrics:
+            metrics.audio_chunks_dropped += 1
+            metrics.overloaded = True
+        return False
+    return True
+
+
+async def iter_audio_queue(queue: asyncio.Queue) -> AsyncIterator[bytes]:
+    """Yield audio chunks from a queue until the ``None`` sentinel arrives."""
+    while True:
+        chunk = await queue.get()
+        if chunk is None:
+            return
+        yield chunk
 
 async def _process_audio_chunk_to_text(audio_bytes: bytes) -> str:
     """
@@ -23,6 +151,8 @@ async def _process_audio_chunk_to_text(audio_bytes: bytes) -> str:
     OpenAI Whisper requires a file-like object (e.g. WAV/MP3).
     We convert the raw PCM stream to an in-memory WAV file temporarily.
     """
+    from pydub import AudioSegment
+
     try:
         # Assuming audio from the browser is 16kHz, 1-channel, 16-bit PCM
         audio_segment = AudioSegment(
@@ -37,7 +167,7 @@ async def _process_audio_chunk_to_text(audio_bytes: bytes) -> str:
         wav_io.seek(0)
         
         # Call Whisper
-        transcription = await client.audio.transcriptions.create(
+        transcription = await get_openai_client().audio.transcriptions.create(
             model="whisper-1",
             file=wav_io,
             response_format="text"
@@ -48,7 +178,10 @@ async def _process_audio_chunk_to_text(audio_bytes: bytes) -> str:
         return ""
 
 
-async def stt_stream(audio_stream: AsyncIterator[bytes]) -> AsyncIterator[VoiceAgentEvent]:
+async def stt_stream(
+    audio_stream: AsyncIterator[bytes],
+    metrics: Optional[VoiceSessionMetrics] = None,
+) -> AsyncIterator[VoiceAgentEvent]:
     """
     Transform stream: Audio (Bytes) -> Voice Events (STT output)
     We batch incoming audio bytes until a silence or a fixed time window,
@@ -59,25 +192,36 @@ async def stt_stream(audio_stream: AsyncIterator[bytes]) -> AsyncIterator[VoiceA
     
     buffer = bytearray()
     CHUNK_ACCUMULATION_THRESHOLD = 16000 * 2 * 1 * 3 # 3 seconds of 16k 16-bit audio
+
+    async def transcribe(audio_bytes: bytes) -> str:
+        started = time.perf_counter()
+        transcript = await _process_audio_chunk_to_text(audio_bytes)
+        if metrics:
+            metrics.stt.observe(_elapsed_ms(started))
+        return transcript
     
     async for audio_chunk in audio_stream:
         buffer.extend(audio_chunk)
         
         if len(buffer) >= CHUNK_ACCUMULATION_THRESHOLD:
             # Yield partial/final
-            transcript = await _process_audio_chunk_to_text(bytes(buffer))
+            transcript = await transcribe(bytes(buffer))
             if transcript:
                 yield VoiceAgentEvent.stt_output(transcript)
             buffer.clear()
             
     # Process remaining buffer
     if len(buffer) > 0:
-        transcript = await _process_audio_chunk_to_text(bytes(buffer))
+        transcript = await transcribe(bytes(buffer))
         if transcript:
             yield VoiceAgentEvent.stt_output(transcript)
 
 
-async def agent_stream(event_stream: AsyncIterator[VoiceAgentEvent], session_id: str) -> AsyncIterator[VoiceAgentEvent]:
+async def agent_stream(
+    event_stream: AsyncIterator[VoiceAgentEvent],
+    session_id: str,
+    metrics: Optional[VoiceSessionMetrics] = None,
+) -> AsyncIterator[VoiceAgentEvent]:
     """
     Transform stream: STT Events -> Agent Text Chunks
     """
@@ -89,6 +233,8 @@ async def agent_stream(event_stream: AsyncIterator[VoiceAgentEvent], session_id:
 
         if event.type == "stt_output" and event.transcript:
             print(f"[Agent] Received Transcript: {event.transcript}")
+            started = time.perf_counter()
+            first_token = True
             try:
                 # Stream agent response
                 stream = agent.astream_events(
@@ -102,12 +248,18 @@ async def agent_stream(event_stream: AsyncIterator[VoiceAgentEvent], session_id:
                     if agent_event["event"] == "on_chat_model_stream":
                         chunk = agent_event["data"]["chunk"]
                         if chunk.content:
+                            if first_token and metrics:
+                                metrics.first_agent_token.observe(_elapsed_ms(started))
+                            first_token = False
                             yield VoiceAgentEvent.agent_chunk(chunk.content)
             except Exception as e:
                print(f"[Agent Error] {e}")
 
 
-async def tts_stream(event_stream: AsyncIterator[VoiceAgentEvent]) -> AsyncIterator[VoiceAgentEvent]:
+async def tts_stream(
+    event_stream: AsyncIterator[VoiceAgentEvent],
+    metrics: Optional[VoiceSessionMetrics] = None,
+) -> AsyncIterator[VoiceAgentEvent]:
     """
     Transform stream: Agent Text Chunks -> TTS Audio (Bytes)
     OpenAI's TTS doesn't currently support streaming *websockets* for input text, 
@@ -120,8 +272,10 @@ async def tts_stream(event_stream: AsyncIterator[VoiceAgentEvent]) -> AsyncItera
         if not text_to_speak.strip():
             return
         print(f"[TTS] Synthesizing: {text_to_speak}")
+        started = time.perf_counter()
+        first_byte = True
         try:
-            response = await client.audio.speech.create(
+            response = await get_openai_client().audio.speech.create(
                 model="tts-1",
                 voice="alloy",
                 input=text_to_speak,
@@ -129,6 +283,9 @@ async def tts_stream(event_stream: AsyncIterator[VoiceAgentEvent]) -> AsyncItera
             )
             # OpenAI speech streams the bytes back
             async for audio_bytes in response.response.aiter_bytes():
+                if first_byte and metrics:
+                    metrics.first_tts_byte.observe(_elapsed_ms(started))
+                first_byte = False
                 yield VoiceAgentEvent.tts_chunk(audio_bytes)
         except Exception as e:
             print(f"[TTS Error] {e}")
@@ -0,0 +1,59 @@
+"""
+Asyncio helpers for the API process.
+
+- `run_blocking()` runs blocking work (disk I/O, file writes) on a bounded
+  thread pool so async handlers never stall the event loop that chat, voice
+  and SSE sessions share.
+- `monitor_loop_lag()` is a background task that measures how late the loop
+  wakes up and logs whenever something blocked it for more than
+  LOOP_LAG_WARN_MS.
+"""
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from jarvis.config import BLOCKING_IO_WORKERS, LOOP_LAG_CHECK_SECONDS, LOOP_LAG_WARN_MS
+
+_executor = ThreadPoolExecutor(max_workers=BLOCKING_IO_WORKERS, thread_name_prefix="jarvis-io")
+
+_lag_stats = {"checks": 0, "warnings": 0, "max_lag_ms": 0.0, "last_lag_ms": 0.0}
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking callable on the shared I/O thread pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def get_loop_lag_stats() -> dict:
+    """Snapshot of the event-loop lag measurements."""
+    return {**_lag_stats, "warn_ms": LOOP_LAG_WARN_MS}
+
+
+async def monitor_loop_lag(
+    warn_ms: int = LOOP_LAG_WARN_MS,
+    interval: float = LOOP_LAG_CHECK_SECONDS,
+    describe: Optional[Callable[[], str]] = None,
+):
+    """
+    Log whenever the event loop was blocked for longer than `warn_ms`.
+
+    Args:
+        warn_ms: Lag threshold in milliseconds.
+        interval: How often to sample, in seconds.
+        describe: Optional callable returning what was running (e.g. the
+            in-flight request paths), included in the warning.
+    """
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag_ms = (time.perf_counter() - started - interval) * 1000
+        _lag_stats["checks"] += 1
+        _lag_stats["last_lag_ms"] = round(lag_ms, 1)
+        _lag_stats["max_lag_ms"] = max(_lag_stats["max_lag_ms"], round(lag_ms, 1))
+        if lag_ms > warn_ms:
+            _lag_stats["warnings"] += 1
+            context = f" (in flight: {describe()})" if describe else ""
+            print(f"[LoopMonitor] Event loop blocked for {lag_ms:.0f} ms{context}")
@@ -0,0 +1,178 @@
+"""
+Client registry: one cached view of every client across the workspace.
+
+A client is any folder under workspace/datasets/ or email_archive/. For each
+one the registry combines:
+
+- CRM summary fields from datasets/<client>/crm.json
+- meeting transcript and email counts (workspace email_archive plus the
+  Calendar MCP's root email_archive)
+- the last activity timestamp (newest file mtime)
+
+The registry is rebuilt only when its filesystem signature changes: the mtimes
+of the client directories and their subfolders, plus the newest file mtime in
+each client's folders. Adding, removing or renaming a file changes its
+directory's mtime; editing one in place changes the newest file mtime, so
+`last_activity` follows appends to existing transcripts and notes too. The
+signature only stats files; the full rebuild (reading crm.json, counting) runs
+when it changes.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from jarvis.config import DATASETS_DIR, EMAIL_ARCHIVE_DIR
+from jarvis.utils.crm_store import primary_clients
+
+TRANSCRIPTS_SUBDIR = "meeting_transcripts"
+EMAILS_SUBDIR = "email_archive"
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _subdirs(root: Path) -> List[Path]:
+    if not root.exists():
+        return []
+    return sorted(
+        Path(entry.path)
+        for entry in os.scandir(root)
+        if entry.is_dir() and not entry.name.startswith('.')
+    )
+
+
+def _newest_mtime_ns(folder: Path) -> int:
+    """Newest mtime among the files under a folder (recursively), 0 if there are none."""
+    newest, pending = 0, [folder]
+    while pending:
+        try:
+            entries = list(os.scandir(pending.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                elif entry.is_file() and not entry.name.startswith('.'):
+                    newest = max(newest, entry.stat().st_mtime_ns)
+            except OSError:
+                continue  # removed while scanning
+    return newest
+
+
+def _scan_files(folder: Path, pattern: str = "*") -> Tuple[int, float]:
+    """Count files under a folder (recursively) and return the newest mtime."""
+    count, newest = 0, 0.0
+    if not folder.exists():
+        return count, newest
+    for path in folder.rglob(pattern):
+        if path.is_file() and not path.name.startswith('.'):
+            count += 1
+            newest = max(newest, path.stat().st_mtime)
+    return count, newest
+
+
+def _crm_summary(crm_path: Path) -> dict:
+    """Extract the summary fields shown in the client list from crm.json."""
+    try:
+        crm = json.loads(crm_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    primary = next(iter(primary_clients(crm)), {})
+    compliance = crm.get("compliance", {})
+    name = " ".join(p for p in (primary.get("first_name"), primary.get("last_name")) if p)
+    return {
+        "name": name or None,
+        "client_id": crm.get("client_id"),
+        "email": primary.get("contact", {}).get("email"),
+        "risk_profile": compliance.get("risk_profile"),
+        "service_status": compliance.get("service_status"),
+        "last_review_date": compliance.get("last_review_date"),
+        "next_review_date": compliance.get("next_review_date"),
+        "net_worth_gbp": crm.get("net_worth_gbp"),
+    }
+
+
+class ClientRegistry:
+    """Thread-safe cached client index, rebuilt when the filesystem signature changes."""
+
+    def __init__(self, datasets_dir: Path = DATASETS_DIR, email_archive_dir: Path = EMAIL_ARCHIVE_DIR):
+        self.datasets_dir = datasets_dir
+        self.email_archive_dir = email_archive_dir
+        self._lock = threading.Lock()
+        self._signature: Optional[tuple] = None
+        self._clients: Dict[str, dict] = {}
+
+    def _current_signature(self) -> tuple:
+        parts = [(str(self.datasets_dir), _mtime_ns(self.datasets_dir)),
+                 (str(self.email_archive_dir), _mtime_ns(self.email_archive_dir))]
+        for client_dir in _subdirs(self.datasets_dir):
+            parts.append((str(client_dir), _mtime_ns(client_dir)))
+            parts.append(("files", _newest_mtime_ns(client_dir)))
+            for sub in (TRANSCRIPTS_SUBDIR, EMAILS_SUBDIR):
+                parts.append((sub, _mtime_ns(client_dir / sub)))
+        for archive_dir in _subdirs(self.email_archive_dir):
+            parts.append((str(archive_dir), _mtime_ns(archive_dir)))
+            parts.append(("files", _newest_mtime_ns(archive_dir)))
+        return tuple(parts)
+
+    def _build(self) -> Dict[str, dict]:
+        folders = {d.name for d in _subdirs(self.datasets_dir)} | {d.name for d in _subdirs(self.email_archive_dir)}
+        clients = {}
+        for folder in sorted(folders):
+            client_dir = self.datasets_dir / folder
+            archive_dir = self.email_archive_dir / folder
+
+            file_count, newest = _scan_files(client_dir)
+            transcript_count, _ = _scan_files(client_dir / TRANSCRIPTS_SUBDIR, "*.txt")
+            workspace_emails, _ = _scan_files(client_dir / EMAILS_SUBDIR, "*.txt")
+            archive_emails, archive_newest = _scan_files(archive_dir, "*.txt")
+            newest = max(newest, archive_newest)
+
+            crm = _crm_summary(client_dir / "crm.json") if (client_dir / "crm.json").exists() else {}
+            clients[folder] = {
+                "folder": folder,
+                **crm,
+                "name": crm.get("name") or folder.replace('_', ' ').title(),
+                "has_crm": bool(crm),
+                "file_count": file_count,
+                "transcript_count": transcript_count,
+                "email_count": workspace_emails + archive_emails,
+                "archive_email_count": archive_emails,
+                "in_email_archive": archive_dir.is_dir(),
+                "last_activity": datetime.fromtimestamp(newest).isoformat() if newest else None,
+            }
+        return clients
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild the registry if the filesystem changed. Returns True if rebuilt."""
+        with self._lock:
+            signature = self._current_signature()
+            if not force and signature == self._signature:
+                return False
+            self._clients = self._build()
+            self._signature = signature
+            return True
+
+    def clients(self) -> List[dict]:
+        """All clients, sorted by folder name (refreshing first if needed)."""
+        self.refresh()
+        return [dict(c) for c in self._clients.values()]
+
+    def get(self, folder: str) -> Optional[dict]:
+        self.refresh()
+        client = self._clients.get(folder)
+        return dict(client) if client else None
+
+
+@lru_cache(maxsize=1)
+def get_client_registry() -> ClientRegistry:
+    return ClientRegistry()
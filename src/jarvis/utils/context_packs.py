@@ -0,0 +1,220 @@
+"""
+Per-client context packs.
+
+A context pack is a token-budgeted digest of everything Jarvis usually reads
+before working on a client: the CRM record, the most recent meeting
+transcripts and emails (workspace and Calendar MCP archives) and the
+advisor's memory notes about the client. Building one reads a handful of
+files; serving one from the cache is a dictionary lookup.
+
+Each pack remembers the (path, mtime) signature of its source files and is
+rebuilt only when that signature changes, so a new email for one client
+rebuilds that client's pack and nothing else. Memory notes come from the
+memory index, so a new daily memory file only rebuilds the packs of the
+clients it mentions. `maintain_context_packs()` keeps every pack warm in the
+background; `get_context_pack()` also checks freshness on access.
+"""
+import asyncio
+import json
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from jarvis.config import (
+    DATASETS_DIR,
+    EMAIL_ARCHIVE_DIR,
+    CONTEXT_PACK_TOKEN_BUDGET,
+    CONTEXT_PACK_REFRESH_SECONDS,
+)
+from jarvis.utils.aio import run_blocking
+from jarvis.utils.crm_store import primary_clients
+from jarvis.utils.memory_index import get_memory_index
+from jarvis.utils.tokens import estimate_tokens, truncate_to_tokens
+
+MAX_TRANSCRIPTS = 2
+MAX_EMAILS = 3
+
+# Share of the token budget each section may use, in priority order
+SECTION_SHARES = (
+    ("crm", 0.35),
+    ("memory", 0.15),
+    ("transcripts", 0.25),
+    ("emails", 0.25),
+)
+
+_DATE_PREFIX = re.compile(r"^(\d{4}-\d{2}-\d{2})")
+
+
+def _file_date(path: Path) -> str:
+    """Date of a dated file ('2026-02-01_subject.txt'), falling back to its mtime."""
+    match = _DATE_PREFIX.match(path.name)
+    if match:
+        return match.group(1)
+    return datetime.fromtimestamp(path.stat().st_mtime).strftime("%Y-%m-%d")
+
+
+def _txt_files(*folders: Path) -> List[Path]:
+    files = [p for folder in folders if folder.exists() for p in folder.glob("*.txt")]
+    return sorted(files, key=lambda p: (_file_date(p), p.name), reverse=True)
+
+
+def _client_sources(folder: str) -> Dict[str, List[Path]]:
+    client_dir = DATASETS_DIR / folder
+    crm = client_dir / "crm.json"
+    return {
+        "crm": [crm] if crm.exists() else [],
+        "transcripts": _txt_files(client_dir / "meeting_transcripts"),
+        "emails": _txt_files(client_dir / "email_archive", EMAIL_ARCHIVE_DIR / folder),
+    }
+
+
+def _signature(folder: str, sources: Dict[str, List[Path]]) -> Tuple:
+    files = tuple(
+        (str(p), p.stat().st_mtime_ns) for paths in sources.values() for p in paths if p.exists()
+    )
+    # Memory notes come from the index, so a new daily file only changes the
+    # signature of the clients it mentions
+    return files, get_memory_index().version(folder)
+
+
+def _client_name(folder: str, crm: dict) -> str:
+    primary = next(iter(primary_clients(crm)), {})
+    name = " ".join(p for p in (primary.get("first_name"), primary.get("last_name")) if p)
+    return name or folder.replace('_', ' ').title()
+
+
+def _memory_notes(folder: str) -> List[str]:
+    """The client's memory notes from the memory index, tagged with their date."""
+    notes = get_memory_index().notes_for([folder])[folder]
+    return [f"[{n['date']}] {n['text']}" for n in notes]
+
+
+def _documents_section(paths: List[Path], limit: int, budget: int) -> str:
+    """Newest `limit` documents, each given an equal share of the section budget."""
+    chosen = paths[:limit]
+    if not chosen:
+        return ""
+    per_doc = budget // len(chosen)
+    parts = []
+    for path in chosen:
+        text = path.read_text(encoding="utf-8", errors="replace").strip()
+        parts.append(f"### {path.name}\n{truncate_to_tokens(text, per_doc)}")
+    return "\n\n".join(parts)
+
+
+def build_context_pack(folder: str, token_budget: int = CONTEXT_PACK_TOKEN_BUDGET) -> dict:
+    """
+    Build a client's context pack from its source files (blocking).
+
+    Returns:
+        Dict with client, folder, built_at, tokens, sources and the rendered `text`.
+    """
+    sources = _client_sources(folder)
+    crm = json.loads(sources["crm"][0].read_text(encoding="utf-8")) if sources["crm"] else {}
+    client_name = _client_name(folder, crm)
+    budgets = {name: int(token_budget * share) for name, share in SECTION_SHARES}
+
+    sections = {
+        "crm": truncate_to_tokens(json.dumps(crm, separators=(",", ":")), budgets["crm"]) if crm else "",
+        "memory": truncate_to_tokens("\n".join(_memory_notes(folder)), budgets["memory"]),
+        "transcripts": _documents_section(sources["transcripts"], MAX_TRANSCRIPTS, budgets["transcripts"]),
+        "emails": _documents_section(sources["emails"], MAX_EMAILS, budgets["emails"]),
+    }
+    titles = {
+        "crm": "CRM record",
+        "memory": "Advisor memory notes",
+        "transcripts": "Recent meeting transcripts",
+        "emails": "Recent emails",
+    }
+    body = "\n\n".join(f"## {titles[name]}\n{text}" for name, text in sections.items() if text)
+    text = f"# Client context: {client_name} (datasets/{folder}/)\n\n{body}"
+
+    used = sources["crm"] + sources["transcripts"][:MAX_TRANSCRIPTS] + sources["emails"][:MAX_EMAILS]
+    return {
+        "client": client_name,
+        "folder": folder,
+        "built_at": datetime.now().isoformat(),
+        "tokens": estimate_tokens(text),
+        "sources": [str(p) for p in used],
+        "text": text,
+        "_signature": _signature(folder, sources),
+    }
+
+
+class ContextPackCache:
+    """Thread-safe cache of context packs, rebuilt per client when its sources change."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._packs: Dict[str, dict] = {}
+        self.stats = {"hits": 0, "builds": 0}
+
+    def get(self, folder: str) -> Optional[dict]:
+        if not (DATASETS_DIR / folder).is_dir() and not (EMAIL_ARCHIVE_DIR / folder).is_dir():
+            return None
+        signature = _signature(folder, _client_sources(folder))
+        with self._lock:
+            pack = self._packs.get(folder)
+            if pack and pack["_signature"] == signature:
+                self.stats["hits"] += 1
+                return pack
+        pack = build_context_pack(folder)
+        with self._lock:
+            self._packs[folder] = pack
+            self.stats["builds"] += 1
+        return pack
+
+    def refresh_all(self) -> int:
+        """Make sure every client's pack is current. Returns the number rebuilt."""
+        before = self.stats["builds"]
+        get_memory_index().refresh()  # once per pass; packs read cached note versions
+        for client_dir in sorted(DATASETS_DIR.iterdir()) if DATASETS_DIR.exists() else []:
+            if client_dir.is_dir() and not client_dir.name.startswith('.'):
+                try:
+                    self.get(client_dir.name)
+                except Exception as e:
+                    print(f"[ContextPacks] Failed to build pack for {client_dir.name}: {e}")
+        return self.stats["builds"] - before
+
+
+_cache = ContextPackCache()
+
+
+def resolve_client_folder(client: str) -> str:
+    """Map a client name ('David Chen', 'Rodney & Cassandra Trotter') or folder to a folder slug."""
+    slug = client.strip().lower().replace(" ", "_")
+    if (DATASETS_DIR / slug).is_dir():
+        return slug
+    words = set(client.lower().replace("&", " ").replace("_", " ").split())
+    if DATASETS_DIR.exists():
+        for client_dir in DATASETS_DIR.iterdir():
+            if client_dir.is_dir() and set(client_dir.name.split("_")) <= words:
+                return client_dir.name
+    return slug
+
+
+def get_context_pack(client: str) -> Optional[dict]:
+    """Current context pack for a client name or folder (None if the client is unknown)."""
+    get_memory_index().refresh()
+    pack = _cache.get(resolve_client_folder(client))
+    if pack is None:
+        return None
+    return {k: v for k, v in pack.items() if not k.startswith("_")}
+
+
+def get_context_pack_stats() -> dict:
+    return {"packs": len(_cache._packs), **_cache.stats}
+
+
+async def maintain_context_packs(interval: int = CONTEXT_PACK_REFRESH_SECONDS):
+    """Background task: keep every client's pack warm, rebuilding only changed ones."""
+    while True:
+        try:
+            rebuilt = await run_blocking(_cache.refresh_all)
+            if rebuilt:
+                print(f"[ContextPacks] Rebuilt {rebuilt} client context pack(s)")
+        except Exception as e:
+            print(f"[ContextPacks] Refresh failed: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,332 @@
+"""
+Queryable CRM book: every workspace/datasets/<client>/crm.json loaded into an
+in-memory SQLite database.
+
+Book-wide questions ("whose mortgage fix ends in the next 6 months?") become
+one SQL query instead of reading each client's CRM file through the
+filesystem tools. The database is rebuilt whenever a crm.json is added,
+removed or modified (mtime signature).
+
+Tables (one row per client / item; `folder` is the client folder slug):
+
+- clients: folder, client_id, full_name, first_name, last_name, date_of_birth,
+  age, occupation, employer, annual_income_gbp, email, mobile, partner_name,
+  partner_income_gbp, household_income_gbp, children_count, risk_profile,
+  service_status, last_review_date, next_review_date, net_worth_gbp
+- properties: folder, name, value_gbp, purchase_year, mortgage_balance_gbp,
+  mortgage_rate_percent, mortgage_fixed_until, mortgage_monthly_payment_gbp,
+  mortgage_term_remaining_years
+- pensions: folder, owner, name, type, provider, value_gbp,
+  accrued_income_gbp_per_year
+- goals: folder, goal, target_date, target_amount_gbp, status
+- vulnerabilities: folder, person, type, description
+- facts: folder, path, value_text, value_num -- every leaf value of every
+  crm.json, keyed by dotted path (e.g. 'financials.investments.isas.david'),
+  for anything the typed tables do not cover
+
+Dates are ISO strings (YYYY-MM-DD), so SQLite date functions and string
+comparison both work.
+"""
+import json
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from jarvis.config import DATASETS_DIR
+
+MAX_ROWS = 200
+QUERY_TIMEOUT_SECONDS = 2.0
+
+SCHEMA = """
+CREATE TABLE clients (
+    folder TEXT PRIMARY KEY, client_id TEXT, full_name TEXT, first_name TEXT, last_name TEXT,
+    date_of_birth TEXT, age INTEGER, occupation TEXT, employer TEXT, annual_income_gbp REAL,
+    email TEXT, mobile TEXT, partner_name TEXT, partner_income_gbp REAL, household_income_gbp REAL,
+    children_count INTEGER, risk_profile TEXT, service_status TEXT, last_review_date TEXT,
+    next_review_date TEXT, net_worth_gbp REAL
+);
+CREATE TABLE properties (
+    folder TEXT, name TEXT, value_gbp REAL, purchase_year INTEGER, mortgage_balance_gbp REAL,
+    mortgage_rate_percent REAL, mortgage_fixed_until TEXT, mortgage_monthly_payment_gbp REAL,
+    mortgage_term_remaining_years REAL
+);
+CREATE TABLE pensions (
+    folder TEXT, owner TEXT, name TEXT, type TEXT, provider TEXT, value_gbp REAL,
+    accrued_income_gbp_per_year REAL
+);
+CREATE TABLE goals (folder TEXT, goal TEXT, target_date TEXT, target_amount_gbp REAL, status TEXT);
+CREATE TABLE vulnerabilities (folder TEXT, person TEXT, type TEXT, description TEXT);
+CREATE TABLE facts (folder TEXT, path TEXT, value_text TEXT, value_num REAL);
+CREATE INDEX idx_facts_path ON facts (path);
+CREATE INDEX idx_properties_fixed ON properties (mortgage_fixed_until);
+"""
+
+# Statements a read-only query may perform
+_ALLOWED_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION}
+
+
+def _num(value: Any) -> Optional[float]:
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _leaves(value: Any, path: str = "") -> Iterator[Tuple[str, Any]]:
+    """Yield (dotted path, leaf value) for every scalar in a JSON document."""
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from _leaves(child, f"{path}.{key}" if path else key)
+    elif isinstance(value, list):
+        for i, child in enumerate(value):
+            yield from _leaves(child, f"{path}[{i}]")
+    else:
+        yield path, value
+
+
+def primary_clients(crm: dict) -> List[dict]:
+    """
+    The household's primary client(s) from a crm.json.
+
+    Most households have one `household.primary_client`; joint clients are
+    listed under `household.primary_clients` instead.
+    """
+    household = crm.get("household") or {}
+    clients = household.get("primary_clients")
+    if not isinstance(clients, list):
+        clients = [household.get("primary_client")]
+    return [c for c in clients if isinstance(c, dict)]
+
+
+def _income_per_year(crm: dict, person: dict, people: List[dict]) -> Optional[float]:
+    """
+    A person's annual income from `financials.income` (retired clients: pensions,
+    investment income as '<first name>_..._gbp_per_year' entries, or unprefixed
+    entries when the household has a single earner).
+    """
+    entries = {
+        key: value for key, value in ((crm.get("financials") or {}).get("income") or {}).items()
+        if key.endswith("_gbp_per_year") and _num(value) is not None
+    }
+    prefixes = {(p.get("first_name") or "").lower() + "_" for p in people if p.get("first_name")}
+    own = (person.get("first_name") or "").lower() + "_"
+    if any(key.startswith(prefix) for key in entries for prefix in prefixes):
+        values = [v for k, v in entries.items() if k.startswith(own)]
+    else:
+        values = list(entries.values()) if person is people[0] else []
+    return float(sum(values)) if values else None
+
+
+def _client_row(folder: str, crm: dict) -> dict:
+    household = crm.get("household", {})
+    # Joint primary clients: the first is the client, the second stands in for the partner
+    listed = primary_clients(crm) or [{}]
+    primary = listed[0]
+    partner = household.get("partner") or (listed[1] if len(listed) > 1 else {})
+    compliance = crm.get("compliance", {})
+    people = [primary, partner]
+    income = _num(primary.get("annual_income_gbp"))
+    if income is None:
+        income = _income_per_year(crm, primary, people)
+    partner_income = _num(partner.get("annual_income_gbp"))
+    if partner_income is None and partner:
+        partner_income = _income_per_year(crm, partner, people)
+    full_name = " ".join(p for p in (primary.get("first_name"), primary.get("last_name")) if p)
+    partner_name = " ".join(p for p in (partner.get("first_name"), partner.get("last_name")) if p)
+    return {
+        "folder": folder,
+        "client_id": crm.get("client_id"),
+        "full_name": full_name or None,
+        "first_name": primary.get("first_name"),
+        "last_name": primary.get("last_name"),
+        "date_of_birth": primary.get("date_of_birth"),
+        "age": primary.get("age"),
+        "occupation": primary.get("occupation"),
+        "employer": primary.get("employer"),
+        "annual_income_gbp": income,
+        "email": primary.get("contact", {}).get("email"),
+        "mobile": primary.get("contact", {}).get("mobile"),
+        "partner_name": partner_name or None,
+        "partner_income_gbp": partner_income,
+        "household_income_gbp": (income or 0) + (partner_income or 0) if income or partner_income else None,
+        "children_count": len(household.get("children") or []),
+        "risk_profile": compliance.get("risk_profile"),
+        "service_status": compliance.get("service_status"),
+        "last_review_date": compliance.get("last_review_date"),
+        "next_review_date": compliance.get("next_review_date"),
+        "net_worth_gbp": _num(crm.get("net_worth_gbp")),
+    }
+
+
+def _property_rows(folder: str, financials: dict) -> List[dict]:
+    rows = []
+    for name, prop in (financials.get("property") or {}).items():
+        if not isinstance(prop, dict) or not ("value_gbp" in prop or "mortgage" in prop
+                                               or "mortgage_balance_gbp" in prop):
+            continue
+        mortgage = prop.get("mortgage") if isinstance(prop.get("mortgage"), dict) else {}
+        rows.append({
+            "folder": folder,
+            "name": name,
+            "value_gbp": _num(prop.get("value_gbp")),
+            "purchase_year": prop.get("purchase_year"),
+            # Either a nested mortgage record or a flat balance on the property
+            "mortgage_balance_gbp": _num(mortgage.get("balance_gbp", prop.get("mortgage_balance_gbp"))),
+            "mortgage_rate_percent": _num(mortgage.get("interest_rate_percent")),
+            "mortgage_fixed_until": mortgage.get("fixed_until"),
+            "mortgage_monthly_payment_gbp": _num(mortgage.get("monthly_payment_gbp")),
+            "mortgage_term_remaining_years": _num(mortgage.get("term_remaining_years")),
+        })
+    return rows
+
+
+def _pension_rows(folder: str, financials: dict) -> List[dict]:
+    # Pensions are keyed by owner (list of schemes) or by scheme name (dict)
+    rows = []
+    for key, entry in (financials.get("pensions") or {}).items():
+        schemes = entry if isinstance(entry, list) else [entry]
+        for scheme in schemes:
+            if not isinstance(scheme, dict):
+                continue
+            rows.append({
+                "folder": folder,
+                "owner": key if isinstance(entry, list) else scheme.get("owner"),
+                "name": None if isinstance(entry, list) else key,
+                "type": scheme.get("type"),
+                "provider": scheme.get("provider"),
+                "value_gbp": _num(scheme.get("value_gbp")),
+                "accrued_income_gbp_per_year": _num(scheme.get("accrued_income_gbp_per_year")),
+            })
+    return rows
+
+
+def _insert(conn: sqlite3.Connection, table: str, rows: List[dict]):
+    if rows:
+        columns = list(rows[0])
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            [tuple(row[c] for c in columns) for row in rows],
+        )
+
+
+def _read_only_authorizer(action, *args):
+    return sqlite3.SQLITE_OK if action in _ALLOWED_ACTIONS else sqlite3.SQLITE_DENY
+
+
+class CRMStore:
+    """In-memory SQLite view of all crm.json files, rebuilt when they change."""
+
+    def __init__(self, datasets_dir: Path = DATASETS_DIR):
+        self.datasets_dir = datasets_dir
+        self._lock = threading.Lock()
+        self._signature: Optional[tuple] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._schema: Dict[str, List[str]] = {}
+
+    def _crm_files(self) -> List[Path]:
+        if not self.datasets_dir.exists():
+            return []
+        return sorted(self.datasets_dir.glob("*/crm.json"))
+
+    def _build(self, files: List[Path]) -> sqlite3.Connection:
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.executescript(SCHEMA)
+        for crm_path in files:
+            folder = crm_path.parent.name
+            try:
+                crm = json.loads(crm_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"[CRM] Skipping {crm_path}: {e}")
+                continue
+            financials = crm.get("financials") or {}
+            _insert(conn, "clients", [_client_row(folder, crm)])
+            _insert(conn, "properties", _property_rows(folder, financials))
+            _insert(conn, "pensions", _pension_rows(folder, financials))
+            _insert(conn, "goals", [
+                {"folder": folder, "goal": g.get("goal"), "target_date": g.get("target_date"),
+                 "target_amount_gbp": _num(g.get("target_amount_gbp")), "status": g.get("status")}
+                for g in crm.get("goals") or [] if isinstance(g, dict)
+            ])
+            _insert(conn, "vulnerabilities", [
+                {"folder": folder, "person": v.get("person"), "type": v.get("type"),
+                 "description": v.get("description")}
+                for v in crm.get("vulnerabilities") or [] if isinstance(v, dict)
+            ])
+            _insert(conn, "facts", [
+                {"folder": folder, "path": path, "value_num": _num(value),
+                 "value_text": None if value is None else str(value)}
+                for path, value in _leaves(crm)
+            ])
+        conn.commit()
+        self._schema = {
+            table: [col[1] for col in conn.execute(f"PRAGMA table_info({table})")]
+            for (table,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        conn.set_authorizer(_read_only_authorizer)
+        return conn
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild the database if any crm.json changed. Returns True if rebuilt."""
+        stamped = []
+        for f in self._crm_files():
+            try:
+                stamped.append((f, f.stat().st_mtime_ns))
+            except OSError:
+                continue  # deleted between the glob and the stat
+        files = [f for f, _ in stamped]
+        signature = tuple((str(f), mtime) for f, mtime in stamped)
+        with self._lock:
+            if not force and signature == self._signature and self._conn is not None:
+                return False
+            conn = self._build(files)
+            if self._conn is not None:
+                self._conn.close()
+            self._conn, self._signature = conn, signature
+            print(f"[CRM] Loaded {len(files)} client CRM files")
+            return True
+
+    @property
+    def signature(self) -> Optional[tuple]:
+        """(path, mtime) of the crm.json files loaded by the last refresh()."""
+        return self._signature
+
+    def query(self, sql: str, params: Tuple = (), max_rows: int = MAX_ROWS) -> Dict[str, Any]:
+        """
+        Run a read-only SQL query.
+
+        Returns:
+            {"columns": [...], "rows": [[...], ...], "row_count": n, "truncated": bool}
+
+        Raises:
+            ValueError: If the statement is not a read-only query or is invalid.
+        """
+        self.refresh()
+        max_rows = max(1, min(max_rows, MAX_ROWS))
+        deadline = time.monotonic() + QUERY_TIMEOUT_SECONDS
+        with self._lock:
+            # Abort runaway queries (e.g. accidental cross joins)
+            self._conn.set_progress_handler(lambda: time.monotonic() > deadline, 10_000)
+            try:
+                cur = self._conn.execute(sql, params)
+                rows = cur.fetchmany(max_rows + 1)
+            except sqlite3.Error as e:
+                raise ValueError(f"Invalid CRM query: {e}") from e
+            finally:
+                self._conn.set_progress_handler(None, 0)
+            columns = [d[0] for d in cur.description or []]
+        return {
+            "columns": columns,
+            "rows": [list(r) for r in rows[:max_rows]],
+            "row_count": min(len(rows), max_rows),
+            "truncated": len(rows) > max_rows,
+        }
+
+    def schema(self) -> Dict[str, List[str]]:
+        """Table name -> column names."""
+        self.refresh()
+        return dict(self._schema)
+
+
+@lru_cache(maxsize=1)
+def get_crm_store() -> CRMStore:
+    return CRMStore()
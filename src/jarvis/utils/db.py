@@ -0,0 +1,46 @@
+"""
+Shared SQLite helpers for Jarvis' local stores (scheduler run history,
+notifications, email drafts, caches).
+
+Each store owns its own database file under DATA_DIR so writers in different
+stores never contend for the same lock.
+"""
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """
+    Open a SQLite connection configured for concurrent use.
+
+    WAL mode lets readers proceed while a writer commits, and the busy timeout
+    makes competing writers (other threads or processes) wait instead of
+    failing immediately. Rows are returned as `sqlite3.Row` (dict-like).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=10000")
+    return conn
+
+
+@contextmanager
+def transaction(path: Path) -> Iterator[sqlite3.Connection]:
+    """
+    Short-lived connection for one unit of work: commits on success, rolls
+    back on error, and always closes the connection.
+
+    `with connect(path) as conn` only scopes the transaction; the connection
+    itself stays open until it is garbage collected.
+    """
+    conn = connect(path)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
@@ -0,0 +1,196 @@
+"""
+Durable store for email drafts awaiting advisor approval.
+
+Drafts live in a SQLite table (DATA_DIR/drafts.sqlite, WAL mode). Every row
+carries a `version` that is bumped on each change, and status changes are
+compare-and-set: `transition()` only succeeds if the row is still in the
+expected status (and version, if given). That makes "claim for sending" a
+single atomic step, so two concurrent approvals cannot both send the email.
+
+Status lifecycle:
+    pending -> sending -> approved
+    pending -> rejected
+    sending -> pending   (send failed, claim released)
+
+A claim records `claimed_at`. A sender that dies mid-send leaves the draft
+in `sending`; `stale_claims()` lists those so the caller can reconcile them
+against what was actually sent (the API checks the email archive).
+"""
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from jarvis.config import DRAFTS_DB_PATH
+from jarvis.utils.db import connect
+
+# Columns that may be changed alongside a status transition
+EDITABLE_FIELDS = ("to", "subject", "body")
+
+
+class DraftStore:
+    """Thread-safe SQLite draft store with optimistic, versioned status changes."""
+
+    def __init__(self, path: Path):
+        self._conn = connect(path)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS drafts (
+                    id          TEXT PRIMARY KEY,
+                    client_name TEXT NOT NULL,
+                    "to"        TEXT NOT NULL,
+                    subject     TEXT NOT NULL,
+                    body        TEXT NOT NULL,
+                    status      TEXT NOT NULL DEFAULT 'pending',
+                    version     INTEGER NOT NULL DEFAULT 1,
+                    created_at  TEXT NOT NULL,
+                    updated_at  TEXT NOT NULL,
+                    claimed_at  TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_drafts_status_created ON drafts (status, created_at);
+                """
+            )
+
+    def add(self, draft: dict) -> dict:
+        """Insert a new draft (ignored if a draft with the same id exists)."""
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR IGNORE INTO drafts (id, client_name, "to", subject, body, status, created_at, updated_at) '
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    draft["id"],
+                    draft["client_name"],
+                    draft["to"],
+                    draft["subject"],
+                    draft["body"],
+                    draft.get("status", "pending"),
+                    draft.get("created_at", now),
+                    now,
+                ),
+            )
+        return self.get(draft["id"])
+
+    def get(self, draft_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM drafts WHERE id = ?", (draft_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list(self, status: str = "pending", limit: int = 100) -> List[dict]:
+        """Drafts in a status, newest first (served by the (status, created_at) index)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM drafts WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                (status, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM drafts").fetchone()[0]
+
+    def transition(
+        self,
+        draft_id: str,
+        from_status: str,
+        to_status: str,
+        expected_version: Optional[int] = None,
+        **updates,
+    ) -> Optional[dict]:
+        """
+        Atomically move a draft from one status to another.
+
+        Args:
+            draft_id: Draft to update.
+            from_status: Status the draft must currently be in.
+            to_status: New status.
+            expected_version: If given, the draft's version must also match.
+            **updates: Optional new values for `to`, `subject` or `body`.
+
+        Returns:
+            The updated draft, or None if the draft does not exist or was
+            changed by someone else first.
+        """
+        unknown = set(updates) - set(EDITABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot update draft fields: {sorted(unknown)}")
+
+        now = datetime.now().isoformat()
+        assignments = ["status = ?", "version = version + 1", "updated_at = ?", "claimed_at = ?"]
+        params = [to_status, now, now if to_status == "sending" else None]
+        for field, value in updates.items():
+            if value is not None:
+                assignments.append(f'"{field}" = ?')
+                params.append(value)
+        where = "id = ? AND status = ?"
+        params += [draft_id, from_status]
+        if expected_version is not None:
+            where += " AND version = ?"
+            params.append(expected_version)
+
+        with self._lock, self._conn:
+            cur = self._conn.execute(f"UPDATE drafts SET {', '.join(assignments)} WHERE {where}", params)
+            if cur.rowcount != 1:
+                return None
+            row = self._conn.execute("SELECT * FROM drafts WHERE id = ?", (draft_id,)).fetchone()
+        return dict(row)
+
+    def transition_many(
+        self,
+        draft_ids: List[str],
+        from_status: str,
+        to_status: str,
+        all_or_nothing: bool = False,
+    ) -> Dict[str, Optional[dict]]:
+        """
+        Move several drafts from one status to another in a single transaction.
+
+        Returns:
+            Draft id -> updated draft, or None where the draft was missing or
+            not in `from_status`. With `all_or_nothing`, any miss rolls the
+            whole transaction back and every value is None.
+        """
+        now = datetime.now().isoformat()
+        results: Dict[str, Optional[dict]] = {}
+        with self._lock:
+            try:
+                with self._conn:
+                    for draft_id in draft_ids:
+                        cur = self._conn.execute(
+                            "UPDATE drafts SET status = ?, version = version + 1, updated_at = ?, claimed_at = ? "
+                            "WHERE id = ? AND status = ?",
+                            (to_status, now, now if to_status == "sending" else None, draft_id, from_status),
+                        )
+                        if cur.rowcount != 1:
+                            results[draft_id] = None
+                            if all_or_nothing:
+                                raise _BatchAborted()
+                            continue
+                        row = self._conn.execute("SELECT * FROM drafts WHERE id = ?", (draft_id,)).fetchone()
+                        results[draft_id] = dict(row)
+            except _BatchAborted:
+                return {draft_id: None for draft_id in draft_ids}
+        return results
+
+    def stale_claims(self, max_age_seconds: float) -> List[dict]:
+        """Drafts claimed for sending more than `max_age_seconds` ago, oldest claim first."""
+        cutoff = (datetime.now() - timedelta(seconds=max_age_seconds)).isoformat()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM drafts WHERE status = 'sending' AND (claimed_at IS NULL OR claimed_at < ?) "
+                "ORDER BY claimed_at",
+                (cutoff,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+class _BatchAborted(Exception):
+    """Raised inside transition_many() to roll back an all-or-nothing batch."""
+
+
+@lru_cache(maxsize=1)
+def get_draft_store() -> DraftStore:
+    return DraftStore(DRAFTS_DB_PATH)
@@ -0,0 +1,188 @@
+"""
+Event bus for delivering dashboard events (notifications, email drafts,
+newly added client files) to the API process.
+
+The API process is the hub: it registers topic handlers and runs `serve()` on
+its event loop. `publish()` can be called from any thread in any process:
+
+- In the hub process, the event is handed to the hub loop with
+  `call_soon_threadsafe` and dispatched to the handlers directly.
+- In any other process (standalone `jarvis_heartbeat`, `telegram_bot`), the
+  event is appended to a SQLite outbox (DATA_DIR/event_bus.sqlite) which the
+  hub drains every EVENT_BUS_POLL_SECONDS. Events published while the API is
+  down are delivered once it starts. A row is deleted only after its handlers
+  have finished, so a hub crash redelivers events rather than losing them;
+  rows whose handler failed stay queued and are retried when the hub restarts.
+
+This replaces the HTTP self-calls and `import jarvis.api` that tools used to
+reach the dashboard stores.
+"""
+import asyncio
+import inspect
+import json
+import threading
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from jarvis.config import EVENT_BUS_DB_PATH, EVENT_BUS_POLL_SECONDS
+from jarvis.utils.db import connect
+
+NOTIFICATION = "notification"
+EMAIL_DRAFT = "email_draft"
+FILES_ADDED = "files_added"
+
+DRAIN_BATCH_SIZE = 100
+
+Handler = Callable[[dict], Any]
+
+# Async handlers started by in-process publishes; referenced here until done
+# so they are not garbage-collected mid-run.
+_handler_tasks: set[asyncio.Task] = set()
+
+
+def _handler_done(topic: str, task: asyncio.Task):
+    _handler_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"[EventBus] Handler for '{topic}' failed: {task.exception()}")
+
+
+class EventBus:
+    """Topic-based publish/subscribe with a SQLite outbox for other processes."""
+
+    def __init__(self, outbox_path: Path):
+        self._outbox_path = outbox_path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._drained_seq = 0  # outbox rows up to here were handled this hub session
+
+    @property
+    def is_hub(self) -> bool:
+        return self._loop is not None and not self._loop.is_closed()
+
+    def subscribe(self, topic: str, handler: Handler):
+        """Register a handler (sync or async) for a topic. Handlers run on the hub loop."""
+        self._handlers[topic].append(handler)
+
+    def publish(self, topic: str, payload: dict):
+        """Deliver an event to the hub, in-process if possible, else via the outbox."""
+        if self.is_hub:
+            self._loop.call_soon_threadsafe(self._dispatch, topic, payload)
+        else:
+            self._enqueue(topic, payload)
+
+    # -- hub side -------------------------------------------------------------
+
+    async def serve(self, poll_seconds: float = EVENT_BUS_POLL_SECONDS):
+        """Make this process the hub and drain the outbox until cancelled."""
+        self._loop = asyncio.get_running_loop()
+        self._drained_seq = 0
+        print(f"[EventBus] Hub started (outbox: {self._outbox_path})")
+        try:
+            while True:
+                try:
+                    # Drain fully, then wait for the next poll
+                    while await self._drain_batch() == DRAIN_BATCH_SIZE:
+                        pass
+                except Exception as e:
+                    print(f"[EventBus] Error draining outbox: {e}")
+                await asyncio.sleep(poll_seconds)
+        finally:
+            self._loop = None
+
+    def _dispatch(self, topic: str, payload: dict):
+        """Run the handlers for an in-process event; async ones continue as tasks."""
+        handlers = self._handlers.get(topic)
+        if not handlers:
+            print(f"[EventBus] No handler for topic '{topic}', event dropped")
+            return
+        for handler in handlers:
+            try:
+                result = handler(payload)
+                if inspect.isawaitable(result):
+                    task = asyncio.ensure_future(result)
+                    _handler_tasks.add(task)
+                    task.add_done_callback(partial(_handler_done, topic))
+            except Exception as e:
+                print(f"[EventBus] Handler for '{topic}' failed: {e}")
+
+    async def _deliver(self, topic: str, payload: dict) -> bool:
+        """Run the handlers for an outbox event to completion. False if any failed."""
+        handlers = self._handlers.get(topic)
+        if not handlers:
+            print(f"[EventBus] No handler for topic '{topic}', event dropped")
+            return True
+        delivered = True
+        for handler in handlers:
+            try:
+                result = handler(payload)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"[EventBus] Handler for '{topic}' failed, keeping it in the outbox: {e}")
+                delivered = False
+        return delivered
+
+    async def _drain_batch(self) -> int:
+        rows = await asyncio.to_thread(self._read_outbox, self._drained_seq)
+        delivered: List[int] = []
+        try:
+            for row in rows:
+                if await self._deliver(row["topic"], json.loads(row["payload"])):
+                    delivered.append(row["seq"])
+                self._drained_seq = row["seq"]
+        finally:
+            # Also on cancellation, so events handled before shutdown are not replayed
+            if delivered:
+                await asyncio.to_thread(self._delete_delivered, delivered)
+        return len(rows)
+
+    def _read_outbox(self, after_seq: int):
+        with self._lock:
+            return self._connection().execute(
+                "SELECT seq, topic, payload FROM outbox WHERE seq > ? ORDER BY seq LIMIT ?",
+                (after_seq, DRAIN_BATCH_SIZE),
+            ).fetchall()
+
+    def _delete_delivered(self, seqs: List[int]):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany("DELETE FROM outbox WHERE seq = ?", [(seq,) for seq in seqs])
+
+    # -- outbox ---------------------------------------------------------------
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = connect(self._outbox_path)
+            with self._conn:
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS outbox (
+                        seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+                        topic      TEXT NOT NULL,
+                        payload    TEXT NOT NULL,
+                        created_at TEXT NOT NULL
+                    )
+                    """
+                )
+        return self._conn
+
+    def _enqueue(self, topic: str, payload: dict):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT INTO outbox (topic, payload, created_at) VALUES (?, ?, ?)",
+                    (topic, json.dumps(payload), datetime.now().isoformat()),
+                )
+        print(f"[EventBus] Queued '{topic}' event for the API")
+
+
+@lru_cache(maxsize=1)
+def get_event_bus() -> EventBus:
+    return EventBus(EVENT_BUS_DB_PATH)
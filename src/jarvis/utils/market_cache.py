@@ -0,0 +1,79 @@
+"""
+Persistent result cache for the Market Feed MCP server.
+
+Tavily results are stored in SQLite keyed by the normalized search parameters,
+so identical questions asked from heartbeats, chats and other processes share
+one copy. Entries never expire from the table; each caller decides how old a
+result may be (per-indicator TTLs live in the server), and stale rows can still
+be served while a fresh copy is fetched.
+"""
+import hashlib
+import json
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+from jarvis.config import MARKET_CACHE_DB_PATH
+from jarvis.utils.db import connect
+
+
+def cache_key(params: dict) -> str:
+    """
+    Stable key for a set of search parameters.
+
+    Strings are case-folded and whitespace-collapsed and dict order is ignored,
+    so 'UK  CPI inflation' and 'uk cpi inflation' share a cache entry.
+    """
+    normalized = {
+        k: " ".join(v.lower().split()) if isinstance(v, str) else v
+        for k, v in params.items()
+        if v is not None
+    }
+    blob = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+class MarketCache:
+    """SQLite-backed store of search results with their fetch time."""
+
+    def __init__(self, db_path: Path = MARKET_CACHE_DB_PATH):
+        self._lock = threading.Lock()
+        self._conn = connect(db_path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                params TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[dict, float]]:
+        """Cached payload and its age in seconds, or None if never fetched."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row["payload"]), max(0.0, time.time() - row["fetched_at"])
+
+    def put(self, key: str, params: dict, payload: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, params, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(params, sort_keys=True), json.dumps(payload), time.time()),
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+@lru_cache(maxsize=1)
+def get_market_cache() -> MarketCache:
+    return MarketCache()
@@ -0,0 +1,111 @@
+"""
+Versioned snapshot store for prefetched market data.
+
+The market prefetcher (a scheduler job in the API process) refreshes every
+macro indicator and each watchlisted asset on a schedule and writes the
+results here; the Market Feed MCP tools serve them instantly and only search
+live when a snapshot is older than its TTL.
+
+Snapshots are keyed by (kind, subject), e.g. ('indicator', 'interest_rate:UK')
+or ('asset', 'FTSE100:1M'). A refresh whose answer or set of results (URLs
+and titles) differs stores a new version; otherwise the current version is
+updated in place (relevance scores and snippets drift between identical
+searches). The last SNAPSHOT_HISTORY versions are kept.
+"""
+import json
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+from jarvis.config import MARKET_SNAPSHOTS_DB_PATH
+from jarvis.utils.db import connect
+
+SNAPSHOT_HISTORY = 5
+
+
+def _change_key(payload: dict) -> tuple:
+    """The parts of a search payload that make it a new version (no scores)."""
+    return (
+        payload.get("answer") or "",
+        [(r.get("url", ""), r.get("title", "")) for r in payload.get("results", [])],
+    )
+
+
+class MarketSnapshotStore:
+    """SQLite-backed, versioned store of market data snapshots."""
+
+    def __init__(self, db_path: Path = MARKET_SNAPSHOTS_DB_PATH):
+        self._lock = threading.Lock()
+        self._conn = connect(db_path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS snapshots (
+                kind TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (kind, subject, version)
+            )"""
+        )
+        self._conn.commit()
+
+    def put(self, kind: str, subject: str, payload: dict) -> int:
+        """Record a fresh fetch. Returns the snapshot version now current."""
+        blob = json.dumps(payload, sort_keys=True)
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                row = self._conn.execute(
+                    "SELECT version, payload FROM snapshots WHERE kind = ? AND subject = ? "
+                    "ORDER BY version DESC LIMIT 1",
+                    (kind, subject),
+                ).fetchone()
+                if row is not None and _change_key(json.loads(row["payload"])) == _change_key(payload):
+                    self._conn.execute(
+                        "UPDATE snapshots SET payload = ?, fetched_at = ? WHERE kind = ? AND subject = ? AND version = ?",
+                        (blob, now, kind, subject, row["version"]),
+                    )
+                    return row["version"]
+                version = row["version"] + 1 if row is not None else 1
+                self._conn.execute(
+                    "INSERT INTO snapshots (kind, subject, version, payload, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                    (kind, subject, version, blob, now),
+                )
+                self._conn.execute(
+                    "DELETE FROM snapshots WHERE kind = ? AND subject = ? AND version <= ?",
+                    (kind, subject, version - SNAPSHOT_HISTORY),
+                )
+                return version
+
+    def latest(self, kind: str, subject: str) -> Optional[dict]:
+        """Current snapshot as {payload, version, fetched_at, age_seconds}, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, payload, fetched_at FROM snapshots WHERE kind = ? AND subject = ? "
+                "ORDER BY version DESC LIMIT 1",
+                (kind, subject),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "payload": json.loads(row["payload"]),
+            "version": row["version"],
+            "fetched_at": row["fetched_at"],
+            "age_seconds": max(0.0, time.time() - row["fetched_at"]),
+        }
+
+    def summary(self) -> List[dict]:
+        """Current version and fetch time of every snapshot (no payloads)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, subject, MAX(version) AS version, MAX(fetched_at) AS fetched_at "
+                "FROM snapshots GROUP BY kind, subject ORDER BY kind, subject"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+@lru_cache(maxsize=1)
+def get_market_snapshot_store() -> MarketSnapshotStore:
+    return MarketSnapshotStore()
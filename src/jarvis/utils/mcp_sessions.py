@@ -0,0 +1,315 @@
+"""
+Long-lived MCP client sessions for the bundled stdio servers.
+
+`MultiServerMCPClient.get_tools()` returns tools that open a brand-new session
+for every call, which for stdio servers means spawning a Python subprocess,
+importing the server and initializing it on each tool call. Instead, each
+server here gets one background task that keeps a session open (an MCP
+session has to be entered and exited in the same task), pings it
+periodically and restarts it with backoff if the server crashes.
+
+The agent is given stable wrapper tools (same names, descriptions and
+schemas as the MCP tools) that delegate to whichever session is current, so
+a restart never invalidates tools already bound into an agent. Each call is
+timed per tool; `get_mcp_manager().stats()` reports latency and session
+health.
+
+With MCP_TRANSPORT=inprocess the bundled servers are not spawned at all:
+their FastMCP tools are imported and called directly (`InProcessServer`).
+"""
+import asyncio
+import importlib
+import inspect
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
+
+from langchain_core.tools import BaseTool, StructuredTool, ToolException
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp.types import CallToolResult, TextContent
+
+from jarvis.config import (
+    MCP_CALL_WAIT_SECONDS,
+    MCP_PING_SECONDS,
+    MCP_PING_TIMEOUT_SECONDS,
+    MCP_RESTART_MAX_BACKOFF_SECONDS,
+)
+from jarvis.utils.aio import run_blocking
+
+
+def _describe(exc: BaseException) -> str:
+    """Readable error; a crashed server surfaces as an ExceptionGroup around the real cause."""
+    while isinstance(exc, BaseExceptionGroup) and exc.exceptions:
+        exc = exc.exceptions[0]
+    return f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
+
+
+class _ToolCallStats:
+    """Per-tool call count, error count and latency."""
+
+    def __init__(self):
+        self._stats: Dict[str, dict] = {}
+
+    def _record(self, tool_name: str, elapsed_ms: float, failed: bool) -> None:
+        stats = self._stats.setdefault(tool_name, {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["calls"] += 1
+        stats["errors"] += failed
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def _tool_stats(self) -> dict:
+        return {
+            name: {
+                "calls": s["calls"],
+                "errors": s["errors"],
+                "avg_ms": round(s["total_ms"] / s["calls"], 1),
+                "max_ms": round(s["max_ms"], 1),
+            }
+            for name, s in self._stats.items()
+        }
+
+
+class MCPServerSession(_ToolCallStats):
+    """One MCP server kept connected by a supervisor task."""
+
+    def __init__(self, name: str, connection: dict):
+        super().__init__()
+        self.name = name
+        self.transport = connection.get("transport")
+        self._client = MultiServerMCPClient({name: connection})
+        self._tools: Dict[str, BaseTool] = {}  # tools bound to the live session
+        self._schemas: List[BaseTool] = []      # tool definitions from the first session
+        self._ready = asyncio.Event()
+        self._check_now = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.status = "stopped"  # starting | ready | restarting | stopped
+        self.restarts = 0
+        self.last_error: Optional[str] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self.status = "starting"
+            self._task = asyncio.create_task(self._supervise(), name=f"mcp-session-{self.name}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self.status = "stopped"
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> None:
+        await asyncio.wait_for(self._ready.wait(), timeout)
+
+    async def _supervise(self) -> None:
+        backoff = 1.0
+        while True:
+            started = time.perf_counter()
+            try:
+                async with self._client.session(self.name) as session:
+                    tools = await load_mcp_tools(session, server_name=self.name)
+                    self._tools = {t.name: t for t in tools}
+                    self._schemas = self._schemas or tools
+                    self.status = "ready"
+                    self._ready.set()
+                    backoff = 1.0
+                    print(f"[MCP] {self.name} session ready ({len(tools)} tools, "
+                          f"{(time.perf_counter() - started) * 1000:.0f} ms)")
+                    await self._health_check(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = _describe(e)
+            finally:
+                self._ready.clear()
+                self._tools = {}
+            self.restarts += 1
+            self.status = "restarting"
+            print(f"[MCP] {self.name} session lost ({self.last_error}); restarting in {backoff:.0f}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MCP_RESTART_MAX_BACKOFF_SECONDS)
+
+    async def _health_check(self, session) -> None:
+        """Ping periodically (or right away after a failed call) until the server stops answering."""
+        while True:
+            try:
+                await asyncio.wait_for(self._check_now.wait(), MCP_PING_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._check_now.clear()
+            await asyncio.wait_for(session.send_ping(), MCP_PING_TIMEOUT_SECONDS)
+
+    async def call(self, tool_name: str, arguments: dict):
+        """Run a tool on the current session, waiting briefly if it is restarting."""
+        started = time.perf_counter()
+        failed = True
+        try:
+            try:
+                await self.wait_ready(MCP_CALL_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                raise ToolException(f"MCP server '{self.name}' is unavailable: {self.last_error}")
+            result = await self._tools[tool_name].coroutine(**arguments)
+            failed = False
+            return result
+        except ToolException:
+            raise  # the tool itself reported an error; the session is fine
+        except Exception:
+            self._check_now.set()
+            raise
+        finally:
+            self._record(tool_name, (time.perf_counter() - started) * 1000, failed)
+
+    def langchain_tools(self) -> List[BaseTool]:
+        """Stable tools that delegate to the current session by name."""
+        def delegate(tool_name: str):
+            async def call(**arguments):
+                return await self.call(tool_name, arguments)
+            return call
+
+        return [
+            StructuredTool(
+                name=t.name,
+                description=t.description,
+                args_schema=t.args_schema,
+                coroutine=delegate(t.name),
+                response_format=t.response_format,
+                metadata=t.metadata,
+            )
+            for t in self._schemas
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "status": self.status,
+            "transport": self.transport,
+            "restarts": self.restarts,
+            "last_error": self.last_error,
+            "tools": self._tool_stats(),
+        }
+
+
+def _tool_message_content(content) -> Union[str, list]:
+    """Tool message content for FastMCP-converted output: one text block's text, else a list of blocks."""
+    if isinstance(content, CallToolResult):
+        content = content.content
+    elif isinstance(content, tuple):  # (unstructured, structured) for tools with an output schema
+        content = content[0]
+    blocks = [
+        {"type": "text", "text": block.text if isinstance(block, TextContent) else block.model_dump_json()}
+        for block in content
+    ]
+    return blocks[0]["text"] if len(blocks) == 1 else blocks
+
+
+class InProcessServer(_ToolCallStats):
+    """A bundled FastMCP server whose tools are called directly, without a transport.
+
+    Only the server's public API is used: `list_tools()` for the names,
+    descriptions and argument schemas, and `call_tool()`, which validates
+    the arguments and converts the result to content blocks exactly as over
+    a transport. Sync tools (plain functions in the server module) are
+    called on the blocking-I/O pool so they never stall the event loop.
+    """
+
+    def __init__(self, name: str, module: str):
+        super().__init__()
+        self.name = name
+        self.module = module
+        self.status = "stopped"
+        self._server = None
+        self._tools: list = []
+        self._blocking: set = set()
+
+    def start(self) -> None:
+        if self._server is None:
+            self.status = "starting"
+
+    async def stop(self) -> None:
+        self.status = "stopped"
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> None:
+        if self._server is not None:
+            return
+        # Importing the server module is blocking work; keep it off the loop
+        module = await run_blocking(importlib.import_module, self.module)
+        self._tools = await module.mcp.list_tools()
+        self._blocking = {
+            tool.name for tool in self._tools
+            if callable(getattr(module, tool.name, None))
+            and not inspect.iscoroutinefunction(getattr(module, tool.name))
+        }
+        self._server = module.mcp
+        self.status = "ready"
+
+    async def call(self, name: str, arguments: dict) -> Union[str, list]:
+        started = time.perf_counter()
+        failed = True
+        try:
+            if name in self._blocking:
+                content = await run_blocking(asyncio.run, self._server.call_tool(name, arguments))
+            else:
+                content = await self._server.call_tool(name, arguments)
+            failed = False
+        except Exception as e:
+            raise ToolException(str(e)) from e
+        finally:
+            self._record(name, (time.perf_counter() - started) * 1000, failed)
+        return _tool_message_content(content)
+
+    def langchain_tools(self) -> List[BaseTool]:
+        if self._server is None:
+            raise RuntimeError(f"MCP server '{self.name}' is not loaded; await wait_ready() first")
+
+        def delegate(name):
+            async def call(**arguments):
+                return await self.call(name, arguments)
+            return call
+
+        return [
+            StructuredTool(
+                name=tool.name,
+                description=tool.description or "",
+                args_schema=tool.inputSchema,
+                coroutine=delegate(tool.name),
+            )
+            for tool in self._tools
+        ]
+
+    def stats(self) -> dict:
+        return {"status": self.status, "transport": "inprocess", "tools": self._tool_stats()}
+
+
+class MCPSessionManager:
+    """Persistent sessions for every MCP server this process talks to."""
+
+    def __init__(self):
+        self._servers: Dict[str, MCPServerSession] = {}
+
+    async def get_tools(self, name: str, connection: dict, timeout: Optional[float] = None) -> List[BaseTool]:
+        """Start (or reuse) the server's session and return its delegating tools.
+
+        `connection` is a langchain-mcp-adapters connection (stdio,
+        streamable_http, ...) or {"transport": "inprocess", "module": ...}
+        for a bundled FastMCP server module exposing `mcp`.
+        """
+        server = self._servers.get(name)
+        if server is None:
+            if connection.get("transport") == "inprocess":
+                server = InProcessServer(name, connection["module"])
+            else:
+                server = MCPServerSession(name, connection)
+            self._servers[name] = server
+        server.start()
+        await server.wait_ready(timeout)
+        return server.langchain_tools()
+
+    def stats(self) -> dict:
+        return {name: server.stats() for name, server in self._servers.items()}
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(server.stop() for server in self._servers.values()))
+
+
+@lru_cache(maxsize=1)
+def get_mcp_manager() -> MCPSessionManager:
+    return MCPSessionManager()
@@ -0,0 +1,204 @@
+"""
+Index of the advisor's memory notes (workspace/memory/YYYY-MM-DD.md).
+
+Each daily file is a list of bullet notes. The index splits them into notes
+keyed by client folder and date, so agents can fetch just the notes about the
+clients in play instead of loading every memory file into the prompt.
+
+A note is attributed to a client when it mentions the client's full name or
+CRM id (e.g. 'Emma Thompson', 'C004'). Once a client has been named in a file,
+later bullets in the same file that only use a first name of someone in the
+household ('Hyacinth and Richard ...', 'Son Sheridan ...') are attributed
+to that client too. Notes naming no client are
+kept as general notes (advisor preferences, house rules).
+
+Files are re-parsed only when they are new or their mtime changed; deleted
+files drop out of the index. Client aliases are only re-read from the CRM
+when its files change.
+"""
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from jarvis.config import MEMORY_DIR
+
+_BULLET = re.compile(r"^\s*(?:[-*+]|\d+\.)\s+")
+
+
+@dataclass(frozen=True)
+class MemoryNote:
+    date: str           # YYYY-MM-DD (from the file name)
+    file: str           # memory file name
+    text: str
+    clients: Tuple[str, ...]  # client folders the note is about (empty = general)
+
+    def to_dict(self) -> dict:
+        return {"date": self.date, "file": self.file, "text": self.text, "clients": list(self.clients)}
+
+
+def _split_notes(text: str) -> List[str]:
+    """Split a memory file into notes: one per bullet (continuation lines joined)."""
+    notes: List[str] = []
+    for line in text.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if _BULLET.match(line) or not notes:
+            notes.append(_BULLET.sub("", line).strip())
+        else:
+            notes[-1] += " " + line.strip()
+    return notes
+
+
+def _client_aliases(store) -> Dict[str, dict]:
+    """Client folder -> {'strong': full names / CRM id, 'weak': first names} from the CRM."""
+    rows = store.query(
+        "SELECT folder, client_id, full_name, first_name, partner_name FROM clients",
+        max_rows=10_000,
+    )["rows"]
+    # Other household members (children, dependants, partners under 'relationships')
+    household = store.query(
+        "SELECT folder, value_text FROM facts WHERE path LIKE 'household.%.name'",
+        max_rows=10_000,
+    )["rows"]
+    aliases = {}
+    for folder, client_id, full_name, first_name, partner_name in rows:
+        strong = {folder.replace("_", " ")}
+        if full_name:
+            strong.add(full_name.lower())
+        if client_id:
+            strong.add(client_id.lower())
+        weak = {n.lower() for n in (first_name, (partner_name or "").split(" ")[0]) if n}
+        aliases[folder] = {"strong": strong, "weak": weak}
+    for folder, name in household:
+        if folder in aliases and name:
+            aliases[folder]["weak"].add(name.split(" ")[0].lower())
+    return aliases
+
+
+def _mentions(text: str, names: Iterable[str]) -> bool:
+    return any(re.search(rf"\b{re.escape(name)}\b", text) for name in names)
+
+
+def _parse_file(path: Path, aliases: Dict[str, dict]) -> List[MemoryNote]:
+    date = path.stem
+    try:
+        datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        date = datetime.fromtimestamp(path.stat().st_mtime).strftime("%Y-%m-%d")
+
+    notes = []
+    named_in_file: Set[str] = set()
+    for text in _split_notes(path.read_text(encoding="utf-8")):
+        lowered = text.lower()
+        clients = {folder for folder, a in aliases.items() if _mentions(lowered, a["strong"])}
+        named_in_file |= clients
+        if not clients:
+            clients = {f for f in named_in_file if _mentions(lowered, aliases[f]["weak"])}
+        notes.append(MemoryNote(date=date, file=path.name, text=text, clients=tuple(sorted(clients))))
+    return notes
+
+
+class MemoryIndex:
+    """Thread-safe, incrementally updated index of memory notes by client and date."""
+
+    def __init__(self, memory_dir: Path = MEMORY_DIR):
+        self.memory_dir = memory_dir
+        self._lock = threading.Lock()
+        self._files: Dict[str, Tuple[int, List[MemoryNote]]] = {}  # name -> (mtime_ns, notes)
+        self._aliases: Optional[Dict[str, dict]] = None
+        self._crm_signature = None
+        self._notes: List[MemoryNote] = []           # every note, oldest first
+        self._versions: Dict[str, Tuple] = {}        # client folder -> fingerprint of its notes
+        self._refreshed = False
+
+    def refresh(self) -> int:
+        """Parse new or changed memory files. Returns the number of files (re)parsed."""
+        from jarvis.utils.crm_store import get_crm_store
+
+        paths = sorted(self.memory_dir.glob("*.md")) if self.memory_dir.exists() else []
+        current = {p.name: p.stat().st_mtime_ns for p in paths}
+        store = get_crm_store()
+        store.refresh()
+        parsed = 0
+        with self._lock:
+            if store.signature != self._crm_signature:
+                aliases = _client_aliases(store)
+                self._crm_signature = store.signature
+                if aliases != self._aliases:
+                    # Client list changed: attribution may change for every file
+                    self._aliases, self._files = aliases, {}
+            removed = set(self._files) - set(current)
+            for name in removed:
+                del self._files[name]
+            for name, mtime in current.items():
+                cached = self._files.get(name)
+                if cached and cached[0] == mtime:
+                    continue
+                self._files[name] = (mtime, _parse_file(self.memory_dir / name, self._aliases))
+                parsed += 1
+            if parsed or removed or not self._refreshed:
+                self._rebuild()
+            self._refreshed = True
+        return parsed
+
+    def _rebuild(self) -> None:
+        """Recompute the sorted note list and per-client fingerprints (lock held)."""
+        self._notes = sorted(
+            (n for _, file_notes in self._files.values() for n in file_notes), key=lambda n: n.date
+        )
+        versions: Dict[str, list] = {}
+        for note in self._notes:
+            for client in note.clients:
+                versions.setdefault(client, []).append((note.date, note.text))
+        self._versions = {client: tuple(v) for client, v in versions.items()}
+
+    def _all_notes(self) -> List[MemoryNote]:
+        self.refresh()
+        with self._lock:
+            return list(self._notes)
+
+    def notes_for(
+        self,
+        clients: Iterable[str],
+        since: Optional[str] = None,
+        include_general: bool = False,
+    ) -> Dict[str, List[dict]]:
+        """
+        Notes about the given client folders, oldest first.
+
+        Args:
+            clients: Client folder slugs.
+            since: Only notes dated on/after this YYYY-MM-DD.
+            include_general: Also return notes that name no client under "general".
+        """
+        wanted = set(clients)
+        result: Dict[str, List[dict]] = {c: [] for c in wanted}
+        if include_general:
+            result["general"] = []
+        for note in self._all_notes():
+            if since and note.date < since:
+                continue
+            if not note.clients and include_general:
+                result["general"].append(note.to_dict())
+            for client in wanted.intersection(note.clients):
+                result[client].append(note.to_dict())
+        return result
+
+    def version(self, client: str) -> Tuple:
+        """
+        Fingerprint of a client's notes as of the last refresh() (no file or CRM
+        access; callers refresh once per pass, e.g. before rebuilding context packs).
+        """
+        if not self._refreshed:
+            self.refresh()
+        with self._lock:
+            return self._versions.get(client, ())
+
+
+@lru_cache(maxsize=1)
+def get_memory_index() -> MemoryIndex:
+    return MemoryIndex()
@@ -0,0 +1,181 @@
+"""
+Durable notification log for the advisor dashboard.
+
+Notifications are appended to a SQLite table (append-only apart from the
+read flag) and fetched newest-first with an integer cursor (`seq`). New
+notifications are also pushed to in-process subscribers (the SSE stream in
+the API), so the dashboard no longer has to poll. A subscriber that falls
+too far behind is closed rather than silently skipped, so it reconnects and
+replays from its cursor.
+"""
+import asyncio
+import threading
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from jarvis.config import NOTIFICATIONS_DB_PATH
+from jarvis.utils.db import connect
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class NotificationStore:
+    """Thread-safe SQLite-backed notification log with push subscribers."""
+
+    def __init__(self, path: Path):
+        self._conn = connect(path)
+        self._lock = threading.Lock()
+        self._subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+        with self._lock, self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS notifications (
+                    seq       INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id        TEXT NOT NULL UNIQUE,
+                    type      TEXT NOT NULL,
+                    title     TEXT NOT NULL,
+                    message   TEXT NOT NULL,
+                    client    TEXT,
+                    timestamp TEXT NOT NULL,
+                    read      INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS idx_notifications_timestamp ON notifications (timestamp);
+                CREATE INDEX IF NOT EXISTS idx_notifications_client ON notifications (client, seq);
+                """
+            )
+
+    @staticmethod
+    def _to_dict(row) -> dict:
+        n = dict(row)
+        n["read"] = bool(n["read"])
+        n["cursor"] = n.pop("seq")
+        return n
+
+    def add(self, notification_type: str, title: str, message: str, client: Optional[str] = None) -> dict:
+        """Append a notification and push it to subscribers."""
+        notification_id = str(uuid.uuid4())
+        timestamp = datetime.now().isoformat()
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO notifications (id, type, title, message, client, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (notification_id, notification_type, title, message, client, timestamp),
+            )
+            seq = cur.lastrowid
+        notification = {
+            "id": notification_id,
+            "type": notification_type,
+            "title": title,
+            "message": message,
+            "client": client,
+            "timestamp": timestamp,
+            "read": False,
+            "cursor": seq,
+        }
+        self._publish(notification)
+        return notification
+
+    def list(
+        self,
+        limit: int = 20,
+        before: Optional[int] = None,
+        after: Optional[int] = None,
+        client: Optional[str] = None,
+        unread_only: bool = False,
+    ) -> List[dict]:
+        """
+        Fetch notifications newest first.
+
+        Args:
+            limit: Maximum number of rows.
+            before: Only rows older than this cursor (next page).
+            after: Only rows newer than this cursor (catch-up after reconnect).
+            client: Only rows for this client.
+            unread_only: Skip notifications already marked as read.
+        """
+        clauses, params = [], []
+        if before is not None:
+            clauses.append("seq < ?")
+            params.append(before)
+        if after is not None:
+            clauses.append("seq > ?")
+            params.append(after)
+        if client:
+            clauses.append("client = ?")
+            params.append(client)
+        if unread_only:
+            clauses.append("read = 0")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM notifications {where} ORDER BY seq DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def list_after(self, after: int, limit: int = 100) -> List[dict]:
+        """
+        Fetch notifications newer than a cursor, oldest first (one page of a catch-up).
+
+        Page forward by passing the last returned cursor as `after` until fewer
+        than `limit` rows come back.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM notifications WHERE seq > ? ORDER BY seq ASC LIMIT ?",
+                (after, limit),
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def mark_read(self, notification_id: str) -> bool:
+        with self._lock, self._conn:
+            cur = self._conn.execute("UPDATE notifications SET read = 1 WHERE id = ?", (notification_id,))
+        return cur.rowcount > 0
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM notifications").fetchone()[0]
+
+    # -- push -----------------------------------------------------------------
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a subscriber on the running loop; new notifications arrive on the queue.
+
+        A `None` on the queue means the subscriber was closed because it fell
+        behind; it should stop reading and catch up with list_after(cursor).
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers = {(loop, q) for loop, q in self._subscribers if q is not queue}
+
+    def _publish(self, notification: dict):
+        # add() may be called from tool threads; hand off to each subscriber's loop
+        for loop, queue in list(self._subscribers):
+            if loop.is_closed():
+                self.unsubscribe(queue)
+                continue
+            loop.call_soon_threadsafe(self._offer, queue, notification)
+
+    def _offer(self, queue: asyncio.Queue, item: dict):
+        # Runs on the subscriber's loop. A full queue never blocks writers:
+        # the subscriber is dropped and told to close, and catches up on reconnect.
+        if not any(q is queue for _, q in self._subscribers):
+            return  # already closed; pushes scheduled before that are moot
+        if not queue.full():
+            queue.put_nowait(item)
+            return
+        self.unsubscribe(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+
+@lru_cache(maxsize=1)
+def get_notification_store() -> NotificationStore:
+    return NotificationStore(NOTIFICATIONS_DB_PATH)
@@ -0,0 +1,21 @@
+"""
+Cheap token estimates for budgeting prompt context.
+
+A character-based heuristic (about 4 characters per token for English text)
+is accurate enough to keep context within a budget and costs nothing to run.
+"""
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate number of tokens in `text`."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = "\n[... truncated]") -> str:
+    """Cut `text` to roughly `max_tokens`, appending `marker` if anything was dropped."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[:max(0, max_chars - len(marker))].rstrip() + marker
@@ -1,15 +1,12 @@
 import os
 import glob
-from typing import List
+import hashlib
+from typing import Dict, List
 from pathlib import Path
 
-from langchain_community.document_loaders import Docx2txtLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_chroma import Chroma
-from langchain_ibm import WatsonxEmbeddings
-# Fallback to OpenAI or HuggingFace if WatsonX fails/is missing
-from langchain_community.embeddings import FakeEmbeddings 
-
+# Chroma, the embedding providers and the document loaders are imported inside
+# the functions that use them: they are slow to import and most processes
+# that import this module never touch the vector store.
 from jarvis.config import (
     DATASETS_DIR, 
     RAW_DATASETS_DIR,
@@ -23,8 +20,12 @@ def get_embeddings():
     """
     Returns WatsonxEmbeddings if credentials exist, else FakeEmbeddings for testing.
     """
+    # Fallback to OpenAI or HuggingFace if WatsonX fails/is missing
+    from langchain_community.embeddings import FakeEmbeddings
+
     if WATSONX_API_KEY and WATSONX_URL and WATSONX_PROJECT_ID:
         try:
+            from langchain_ibm import WatsonxEmbeddings
             return WatsonxEmbeddings(
                 model_id="intfloat/multilingual-e5-large",
                 url=WATSONX_URL,
@@ -38,6 +39,25 @@ def get_embeddings():
     print("Using FakeEmbeddings (Placeholder).")
     return FakeEmbeddings(size=1024)
 
+def _replace_documents(vector_store, splits) -> None:
+    """
+    Add chunks so that re-indexing a file replaces its chunks instead of duplicating them.
+
+    Earlier chunks of each file are deleted first (a re-upload may produce
+    fewer chunks), and ids are derived from the file path and chunk index.
+    """
+    by_source: Dict[str, list] = {}
+    for doc in splits:
+        by_source.setdefault(doc.metadata["source_path"], []).append(doc)
+    ids, documents = [], []
+    for source_path, docs in by_source.items():
+        vector_store.delete(where={"source_path": source_path})
+        for i, doc in enumerate(docs):
+            ids.append(hashlib.sha1(f"{source_path}#{i}".encode("utf-8")).hexdigest())
+            documents.append(doc)
+    vector_store.add_documents(documents=documents, ids=ids)
+
+
 def ingest_documents():
     """
     Ingests all .docx files from raw_datasets/ into the Vector Store.
@@ -46,6 +66,10 @@ def ingest_documents():
     raw_datasets/
         *.docx (client documents)
     """
+    from langchain_chroma import Chroma
+    from langchain_community.document_loaders import Docx2txtLoader
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
     embeddings = get_embeddings()
     vector_store = Chroma(
         collection_name="client_data",
@@ -88,16 +112,60 @@ def ingest_documents():
     if all_splits:
         print(f"\n{'='*60}")
         print(f"Adding {len(all_splits)} total chunks to vector store...")
-        vector_store.add_documents(documents=all_splits)
+        _replace_documents(vector_store, all_splits)
         print(f"✓ Successfully ingested into ChromaDB at: {VECTOR_STORE_PATH}")
         print(f"{'='*60}")
     else:
         print("\n⚠ No documents were successfully processed.")
 
+def index_text_files(paths: List[Path]) -> int:
+    """
+    Index plain-text client files (uploaded emails, transcripts) into the
+    Vector Store in a single batch.
+
+    Files are expected under datasets/<client_folder>/...; the client folder
+    is recorded as the `client` metadata.
+
+    Returns:
+        Number of chunks added.
+    """
+    from langchain_chroma import Chroma
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200, add_start_index=True)
+    all_splits = []
+
+    for file_path in map(Path, paths):
+        try:
+            text = file_path.read_text(encoding="utf-8", errors="replace")
+            relative = file_path.relative_to(DATASETS_DIR)
+            metadata = {
+                "client": relative.parts[0],
+                "source_file": file_path.name,
+                "source_path": str(file_path.relative_to(DATASETS_DIR.parent)),
+            }
+            all_splits.extend(text_splitter.create_documents([text], metadatas=[metadata]))
+        except Exception as e:
+            print(f"  ✗ Failed to process {file_path.name}: {e}")
+
+    if not all_splits:
+        return 0
+
+    vector_store = Chroma(
+        collection_name="client_data",
+        embedding_function=get_embeddings(),
+        persist_directory=str(VECTOR_STORE_PATH)
+    )
+    _replace_documents(vector_store, all_splits)
+    print(f"✓ Indexed {len(paths)} files ({len(all_splits)} chunks) into ChromaDB")
+    return len(all_splits)
+
 def query_vector_store(query: str, k: int = 4):
     """
     Queries the vector store for relevant documents.
     """
+    from langchain_chroma import Chroma
+
     embeddings = get_embeddings()
     vector_store = Chroma(
         collection_name="client_data",
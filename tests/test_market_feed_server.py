@@ -0,0 +1,59 @@
+"""Shaping of Tavily results that carry explicit nulls (no network, no cache)."""
+
+import asyncio
+
+import pytest
+
+from jarvis.tools import market_feed_server as feed
+
+
+class NullFieldsClient:
+    """Canned Tavily response with the null fields Tavily sends for sparse articles."""
+
+    def search(self, **kwargs):
+        return {
+            "answer": None,
+            "results": [
+                {"title": "Base rate held", "url": "https://example.com/a", "published_date": None,
+                 "content": None, "score": None},
+                {"title": None, "url": None, "published_date": "2026-10-01",
+                 "content": "Inflation eased to 2.1%.", "score": 0.7},
+            ],
+        }
+
+
+@pytest.fixture
+def null_client():
+    feed.set_search_client(NullFieldsClient())
+    yield
+    feed.set_search_client(None)
+
+
+def test_fetch_coerces_null_fields(null_client):
+    result = asyncio.run(feed._fetch({"query": "uk base rate"}))
+
+    assert "error" not in result
+    assert result["answer"] == ""
+    first = result["results"][0]
+    assert first["published_date"] == "" and first["content"] == "" and first["score"] == 0
+    assert result["results"][1]["title"] == "" and result["results"][1]["url"] == ""
+
+
+@pytest.mark.parametrize("detail", feed.DETAIL_LEVELS)
+def test_shape_handles_null_fields(null_client, detail):
+    shaped = feed._shape(asyncio.run(feed._fetch({"query": "uk base rate"})), detail)
+
+    listed = shaped["citations"] if detail == "answer" else shaped["results"]
+    assert len(listed) == 2
+    assert "tokens" in shaped
+
+
+@pytest.mark.parametrize("detail", feed.DETAIL_LEVELS)
+def test_shape_tolerates_nulls_in_cached_results(detail):
+    # Results cached before null coercion still hold None values
+    cached = {"answer": None, "results": [{"title": None, "url": None, "published_date": None,
+                                           "content": None, "score": None}]}
+
+    shaped = feed._shape(cached, detail)
+
+    assert "tokens" in shaped